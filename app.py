@@ -1,16 +1,17 @@
 import streamlit as st
 import os
-from datetime import datetime, timedelta
-import sys
-
-# Ajouter le répertoire calcule_Heure au path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'calcule_Heure'))
-
-from graphique import generer_graphiques
-from add_data import ajouter_donnees
-from colcul import calculer_moyennes
-from open_csv import lire_horaires
-from config import charger_config, mettre_a_jour_config, reinitialiser_config, get_duree_travail
+from datetime import time
+from pathlib import Path
+
+# Imports par le paquet uniquement: un module chargé aussi sous son nom
+# court aurait ses propres caches (configuration, données), vidés
+# séparément de ceux utilisés par le reste du paquet
+from calcule_Heure.graphique import rendre_graphiques, specs_vega_lite
+from calcule_Heure.add_data import ajouter_donnees
+from calcule_Heure.data_cache import charger_horaires, charger_moyennes, memoriser
+from calcule_Heure.timecodec import format_time
+from calcule_Heure.constants import CSV_HEADERS, DATETIME_FORMAT
+from calcule_Heure.config import charger_config, mettre_a_jour_config, reinitialiser_config, get_duree_travail
 
 # Configuration de la page
 st.set_page_config(
@@ -25,6 +26,41 @@ st.markdown("---")
 
 fichier_csv = 'calcule_Heure/horaires.csv'
 
+# Périodes proposées dans l'onglet d'analyse (nombre de jours, None = tout)
+PERIODES = {
+    "Tout l'historique": None,
+    "30 derniers jours": 30,
+    "90 derniers jours": 90,
+    "12 derniers mois": 365,
+}
+
+# Rendu des graphiques: Vega-Lite dans le navigateur (par défaut, presque
+# rien côté serveur) ou images matplotlib rendues par le serveur (en cache)
+RENDUS = ["Navigateur (interactif)", "Images (matplotlib)"]
+
+
+def _colonne_hhmm(minutes):
+    """Formate une colonne de minutes depuis minuit en HH:MM."""
+    return (
+        minutes.floordiv(60).astype(str).str.zfill(2)
+        + ":"
+        + minutes.mod(60).astype(str).str.zfill(2)
+    )
+
+
+def tableau_horaires(frame):
+    """Construit le tableau affiché à partir des lignes valides d'un ScheduleFrame."""
+    import pandas as pd
+    frame = frame.valid()
+    return pd.DataFrame({
+        CSV_HEADERS[0]: pd.to_datetime(frame.horodatage, unit="s").strftime(DATETIME_FORMAT),
+        CSV_HEADERS[1]: _colonne_hhmm(pd.Series(frame.debut)),
+        CSV_HEADERS[2]: _colonne_hhmm(pd.Series(frame.debut_pause)),
+        CSV_HEADERS[3]: _colonne_hhmm(pd.Series(frame.fin_pause)),
+        CSV_HEADERS[4]: _colonne_hhmm(pd.Series(frame.depart)),
+    })
+
+
 # Création d'onglets
 tab1, tab2, tab3 = st.tabs(["📝 Ajouter une Saisie", "📊 Analyser les Données", "⚙️ Configuration"])
 
@@ -40,28 +76,28 @@ with tab1:
         with col1:
             heure_debut = st.time_input(
                 "Heure de début de travail",
-                value=datetime.strptime("08:00", "%H:%M").time()
+                value=time(8, 0)
             )
 
         with col2:
             heure_pause_debut = st.time_input(
                 "Heure de début de pause",
-                value=datetime.strptime("12:00", "%H:%M").time()
+                value=time(12, 0)
             )
 
         with col3:
             heure_pause_fin = st.time_input(
                 "Heure de fin de pause",
-                value=datetime.strptime("12:45", "%H:%M").time()
+                value=time(12, 45)
             )
 
         submitted = st.form_submit_button("💾 Enregistrer et Calculer")
 
         if submitted:
             # Conversion en format string HH:MM
-            debut_str = heure_debut.strftime("%H:%M")
-            pause_debut_str = heure_pause_debut.strftime("%H:%M")
-            pause_fin_str = heure_pause_fin.strftime("%H:%M")
+            debut_str = format_time(heure_debut.hour * 60 + heure_debut.minute)
+            pause_debut_str = format_time(heure_pause_debut.hour * 60 + heure_pause_debut.minute)
+            pause_fin_str = format_time(heure_pause_fin.hour * 60 + heure_pause_fin.minute)
 
             try:
                 # Calcul de l'heure de départ
@@ -93,18 +129,23 @@ with tab2:
     if not os.path.exists(fichier_csv):
         st.warning("⚠️ Aucune donnée disponible. Ajoutez d'abord une saisie dans l'onglet 'Ajouter une Saisie'.")
     else:
+        periode = st.selectbox("Période", list(PERIODES))
+        jours = PERIODES[periode]
+
         try:
-            # Lecture des données
-            horaires = lire_horaires(fichier_csv)
+            # Lecture des données en colonnes (heures déjà converties en minutes),
+            # en cache tant que le CSV n'a pas changé; pour une période, seules
+            # ses lignes sont lues (index des dates)
+            horaires = charger_horaires(Path(fichier_csv), jours)
 
-            if len(horaires) == 0:
+            if horaires.nombre_valides == 0:
                 st.warning("⚠️ Le fichier est vide. Ajoutez des données d'abord.")
             else:
                 # Affichage du nombre d'entrées
-                st.metric("Nombre total d'entrées", len(horaires))
+                st.metric("Nombre total d'entrées", horaires.nombre_valides)
 
                 # Calcul des moyennes
-                depart_moy, pause_moy, arrivee_moy = calculer_moyennes(horaires)
+                depart_moy, pause_moy, arrivee_moy = charger_moyennes(Path(fichier_csv), jours)
 
                 if depart_moy and pause_moy and arrivee_moy:
                     # Affichage des moyennes
@@ -123,22 +164,33 @@ with tab2:
                     # Génération des graphiques
                     st.subheader("📊 Graphiques d'évolution")
 
-                    fig1, fig2, fig3 = generer_graphiques(horaires, depart_moy, arrivee_moy)
-
-                    if fig1 and fig2 and fig3:
-                        st.pyplot(fig1)
-                        st.pyplot(fig2)
-                        st.pyplot(fig3)
+                    rendu = st.radio("Rendu", RENDUS, horizontal=True)
+                    if rendu == RENDUS[0]:
+                        # Spécifications JSON (données en colonnes), construites une
+                        # fois par état des fichiers; le navigateur fait le rendu
+                        graphiques = memoriser(
+                            "specs",
+                            lambda: specs_vega_lite(horaires, depart_moy, arrivee_moy),
+                            Path(fichier_csv), jours, config=True
+                        )
+                        for spec in graphiques or []:
+                            st.vega_lite_chart(spec, use_container_width=True)
                     else:
+                        # Images rendues une fois puis servies par le cache disque,
+                        # avec pour clé les données affichées et le seuil de pause
+                        graphiques = rendre_graphiques(horaires, depart_moy, arrivee_moy)
+                        for image in graphiques or []:
+                            st.image(str(image), use_column_width=True)
+
+                    if not graphiques:
                         st.error("❌ Impossible de générer les graphiques.")
                 else:
                     st.error("❌ Erreur lors du calcul des moyennes.")
 
                 # Affichage du tableau de données
                 st.subheader("📋 Tableau des données")
-                import pandas as pd
-                df = pd.DataFrame(horaires)
-                st.dataframe(df, use_container_width=True)
+                tableau = memoriser("tableau", lambda: tableau_horaires(horaires), Path(fichier_csv), jours)
+                st.dataframe(tableau, use_container_width=True)
 
         except FileNotFoundError:
             st.error(f"❌ Le fichier '{fichier_csv}' est introuvable.")
@@ -6,8 +6,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from ..database import get_db
-from ..models.config import Config
 from ..schemas.config import ConfigUpdate, ConfigResponse
+from ..services import config_service
 
 router = APIRouter(prefix="/config", tags=["config"])
 
@@ -23,7 +23,7 @@ def get_config(db: Session = Depends(get_db)):
     Returns:
         Configuration actuelle
     """
-    config = db.query(Config).filter(Config.id == 1).first()
+    config = config_service.get_config(db)
 
     if not config:
         raise HTTPException(
@@ -49,7 +49,9 @@ def update_config(
     Returns:
         Configuration mise à jour
     """
-    config = db.query(Config).filter(Config.id == 1).first()
+    # Mettre à jour les champs fournis
+    update_data = config_update.model_dump(exclude_unset=True)
+    config = config_service.update_config(db, update_data)
 
     if not config:
         raise HTTPException(
@@ -57,15 +59,6 @@ def update_config(
             detail="Configuration non trouvée"
         )
 
-    # Mettre à jour les champs fournis
-    update_data = config_update.model_dump(exclude_unset=True)
-
-    for field, value in update_data.items():
-        setattr(config, field, value)
-
-    db.commit()
-    db.refresh(config)
-
     return config
 
 
@@ -80,7 +73,12 @@ def reset_config(db: Session = Depends(get_db)):
     Returns:
         Configuration réinitialisée
     """
-    config = db.query(Config).filter(Config.id == 1).first()
+    # Réinitialiser aux valeurs par défaut
+    config = config_service.update_config(db, {
+        "duree_travail_heures": 7,
+        "duree_travail_minutes": 10,
+        "seuil_pause_minutes": 45
+    })
 
     if not config:
         raise HTTPException(
@@ -88,12 +86,4 @@ def reset_config(db: Session = Depends(get_db)):
             detail="Configuration non trouvée"
         )
 
-    # Réinitialiser aux valeurs par défaut
-    config.duree_travail_heures = 7
-    config.duree_travail_minutes = 10
-    config.seuil_pause_minutes = 45
-
-    db.commit()
-    db.refresh(config)
-
     return config
@@ -2,38 +2,123 @@
 Routes API pour la gestion des horaires.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import csv
+import io
+import json
+from datetime import date
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from ..database import get_db
-from ..schemas.schedule import ScheduleCreate, ScheduleUpdate, ScheduleResponse
-from ..services import schedule_service
+from ..schemas.schedule import (
+    ScheduleBulkResponse,
+    ScheduleCreate,
+    ScheduleImportResponse,
+    ScheduleUpdate,
+    ScheduleResponse,
+)
+from ..services import export_service, import_service, schedule_service
 
 router = APIRouter(prefix="/schedules", tags=["schedules"])
 
+# En-tête portant le curseur de la page suivante
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 @router.get("/", response_model=List[ScheduleResponse])
 def list_schedules(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
+    fast: bool = False,
     db: Session = Depends(get_db)
 ):
     """
     Récupère la liste de tous les horaires.
 
+    Avec after, la page est lue par clé à partir du curseur fourni et skip
+    est ignoré. Le curseur de la page suivante est renvoyé dans l'en-tête
+    X-Next-Cursor lorsque la page est pleine.
+
+    Avec fast, les colonnes sont lues en tuples et encodées directement par
+    orjson, sans objets ORM ni validation ScheduleResponse ligne par ligne.
+
     Args:
+        response: Réponse HTTP (pour l'en-tête de pagination)
         skip: Nombre d'éléments à ignorer
         limit: Nombre maximum d'éléments à retourner
+        after: Curseur de la page précédente
+        fast: Active le chemin de sérialisation rapide
         db: Session de base de données
 
     Returns:
         Liste des horaires
+
+    Raises:
+        HTTPException: Si le curseur est invalide
     """
-    schedules = schedule_service.get_schedules(db, skip=skip, limit=limit)
+    try:
+        if fast:
+            schedules = schedule_service.get_schedule_rows(db, skip=skip, limit=limit, after=after)
+        elif after is not None:
+            schedules = schedule_service.get_schedules_after(db, after, limit=limit)
+        else:
+            schedules = schedule_service.get_schedules(db, skip=skip, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    headers = {}
+    if schedules and len(schedules) == limit:
+        headers[NEXT_CURSOR_HEADER] = schedule_service.encode_cursor(schedules[-1])
+
+    if fast:
+        # Lignes lues en base, conformes à ScheduleResponse : pas de revalidation
+        return ORJSONResponse([row._asdict() for row in schedules], headers=headers)
+
+    response.headers.update(headers)
     return schedules
 
 
+@router.get("/export")
+def export_schedules(
+    fmt: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db)
+):
+    """
+    Exporte l'historique des horaires en flux.
+
+    Le CSV reprend les colonnes du fichier horaires.csv historique.
+
+    Args:
+        fmt: Format de sortie (paramètre format : csv ou ndjson)
+        date_from: Première date de saisie incluse (paramètre from)
+        date_to: Dernière date de saisie incluse (paramètre to)
+        db: Session de base de données (fournit le moteur du flux)
+
+    Returns:
+        Réponse en flux
+    """
+    content = export_service.iter_export(db.get_bind(), fmt, date_from, date_to)
+
+    if fmt == "csv":
+        return StreamingResponse(
+            content,
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="horaires.csv"'}
+        )
+
+    return StreamingResponse(content, media_type="application/x-ndjson")
+
+
 @router.get("/{schedule_id}", response_model=ScheduleResponse)
 def get_schedule(
     schedule_id: int,
@@ -81,6 +166,124 @@ def create_schedule(
     return schedule_service.create_schedule(db, schedule)
 
 
+def _parse_bulk_body(
+    body: bytes,
+    content_type: str
+) -> Tuple[List[Tuple[int, Any]], List[Dict[str, Any]]]:
+    """
+    Décode le corps d'une requête /bulk.
+
+    Args:
+        body: Corps brut de la requête
+        content_type: En-tête Content-Type
+
+    Returns:
+        Tuple (objets indexés par ligne, erreurs de décodage par ligne)
+
+    Raises:
+        HTTPException: Si le corps n'est pas un tableau JSON ou du NDJSON
+    """
+    items = []
+    errors = []
+
+    if "ndjson" in content_type:
+        for index, line in enumerate(body.splitlines()):
+            if not line.strip():
+                continue
+            try:
+                items.append((index, json.loads(line)))
+            except ValueError as e:
+                errors.append({"index": index, "detail": f"JSON invalide: {e}"})
+    else:
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"JSON invalide: {e}"
+            )
+        if not isinstance(payload, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Le corps doit être un tableau JSON ou du NDJSON"
+            )
+        items = list(enumerate(payload))
+
+    return items, errors
+
+
+def _create_schedules_bulk(db: Session, body: bytes, content_type: str) -> Dict[str, Any]:
+    """Décode le corps puis insère les horaires (exécuté dans le threadpool)."""
+    items, errors = _parse_bulk_body(body, content_type)
+    result = schedule_service.create_schedules_bulk(db, items)
+    result["errors"] = sorted(errors + result["errors"], key=lambda error: error["index"])
+    return result
+
+
+@router.post("/bulk", response_model=ScheduleBulkResponse)
+async def create_schedules_bulk(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Crée des horaires en masse dans une seule transaction.
+
+    Le corps est soit un tableau JSON, soit du NDJSON (un objet par ligne,
+    Content-Type: application/x-ndjson). Chaque objet suit ScheduleCreate,
+    avec en option la date_saisie d'origine. Seule la lecture du corps se
+    fait sur la boucle d'événements : le décodage JSON et l'insertion
+    s'exécutent dans le threadpool.
+
+    Args:
+        request: Requête HTTP (corps lu directement)
+        db: Session de base de données
+
+    Returns:
+        Nombre d'horaires insérés et erreurs par ligne
+
+    Raises:
+        HTTPException: Si le corps n'est pas un tableau JSON ou du NDJSON
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    return await run_in_threadpool(_create_schedules_bulk, db, body, content_type)
+
+
+@router.post("/import", response_model=ScheduleImportResponse)
+def import_legacy_csv(
+    file: UploadFile = File(..., description="Fichier horaires.csv historique"),
+    db: Session = Depends(get_db)
+):
+    """
+    Importe un fichier horaires.csv de l'application historique.
+
+    Le fichier est lu en flux et inséré par tranches ; les horaires déjà
+    présents (même date de saisie) sont ignorés et un import interrompu
+    reprend après la dernière tranche validée.
+
+    Args:
+        file: Fichier CSV envoyé en multipart/form-data
+        db: Session de base de données
+
+    Returns:
+        Rapport d'import
+
+    Raises:
+        HTTPException: Si le fichier n'est pas un CSV UTF-8 lisible
+    """
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        return import_service.import_legacy_csv(db, stream, file.filename or "upload.csv")
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Fichier CSV illisible: {e}"
+        )
+    finally:
+        stream.detach()
+
+
 @router.put("/{schedule_id}", response_model=ScheduleResponse)
 def update_schedule(
     schedule_id: int,
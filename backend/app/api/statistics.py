@@ -2,8 +2,9 @@
 Routes API pour les statistiques.
 """
 
-from typing import Dict, Any
-from fastapi import APIRouter, Depends
+from typing import Dict, Any, Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from ..database import get_db
@@ -27,14 +28,37 @@ def get_statistics(db: Session = Depends(get_db)):
 
 
 @router.get("/charts", response_model=Dict[str, Any])
-def get_charts_data(db: Session = Depends(get_db)):
+def get_charts_data(
+    granularity: Optional[Literal["day", "week", "month"]] = None,
+    max_points: Optional[int] = Query(None, ge=3),
+    fast: bool = False,
+    db: Session = Depends(get_db)
+):
     """
     Récupère les données pour générer les graphiques.
 
+    Sans paramètre, renvoie un point par horaire. Avec granularity et/ou
+    max_points, les données sont regroupées par période et réduites.
+
     Args:
+        granularity: Regroupement par jour, semaine ou mois
+        max_points: Nombre maximum de points par série
+        fast: Encode la réponse directement avec orjson, sans validation
         db: Session de base de données
 
     Returns:
         Dictionnaire contenant les données pour les graphiques
     """
-    return statistics_service.get_charts_data(db)
+    if granularity is None and max_points is None:
+        data = statistics_service.get_charts_data(db)
+    else:
+        data = statistics_service.get_bucketed_charts_data(
+            db,
+            granularity=granularity or "day",
+            max_points=max_points
+        )
+
+    if fast:
+        return ORJSONResponse(data)
+
+    return data
@@ -0,0 +1,95 @@
+"""
+Commandes d'administration du backend.
+
+Usage (depuis le répertoire backend/):
+    python -m app.cli rebuild-daily-stats
+    python -m app.cli import-csv ../calcule_Heure/horaires.csv
+"""
+
+import argparse
+from pathlib import Path
+
+from .database import SessionLocal, init_db
+from .services import daily_stats_service, import_service
+
+
+def rebuild_daily_stats(args: argparse.Namespace) -> None:
+    """
+    Reconstruit la table daily_stats à partir des horaires existants.
+
+    La base est d'abord mise à jour (init_db) : sur une base antérieure
+    aux colonnes en minutes, celles-ci sont ajoutées et calculées avant
+    l'agrégation.
+
+    Args:
+        args: Arguments de la ligne de commande
+    """
+    init_db()
+
+    db = SessionLocal()
+    try:
+        jours = daily_stats_service.rebuild(db)
+    finally:
+        db.close()
+
+    print(f"daily_stats reconstruite : {jours} journée(s) agrégée(s)")
+
+
+def import_csv(args: argparse.Namespace) -> None:
+    """
+    Importe un fichier horaires.csv historique dans la base.
+
+    Args:
+        args: Arguments de la ligne de commande
+    """
+    init_db()
+    path = Path(args.fichier)
+
+    db = SessionLocal()
+    try:
+        with open(path, mode="r", encoding="utf-8", newline="") as f:
+            report = import_service.import_legacy_csv(
+                db, f, str(path.resolve()), chunk_size=args.chunk_size
+            )
+    finally:
+        db.close()
+
+    if report["resumed"]:
+        print(f"Reprise après {report['resumed']} ligne(s) déjà importée(s)")
+    print(f"{report['inserted']} horaire(s) importé(s), {report['duplicates']} doublon(s) ignoré(s)")
+    for error in report["errors"]:
+        print(f"  ligne {error['ligne']}: {error['detail']}")
+    if report["error_count"] > len(report["errors"]):
+        print(f"  ... {report['error_count'] - len(report['errors'])} autre(s) erreur(s)")
+
+
+def main() -> None:
+    """Point d'entrée de la ligne de commande."""
+    parser = argparse.ArgumentParser(description="Commandes d'administration Calcule Heure")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_parser = subparsers.add_parser(
+        "rebuild-daily-stats",
+        help="Reconstruit les agrégats journaliers depuis la table schedules"
+    )
+    rebuild_parser.set_defaults(func=rebuild_daily_stats)
+
+    import_parser = subparsers.add_parser(
+        "import-csv",
+        help="Importe un fichier horaires.csv de l'application historique"
+    )
+    import_parser.add_argument("fichier", help="Chemin du fichier CSV")
+    import_parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=import_service.IMPORT_CHUNK_SIZE,
+        help="Nombre de lignes validées par tranche"
+    )
+    import_parser.set_defaults(func=import_csv)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,13 @@ class Settings(BaseSettings):
     # Base de données
     DATABASE_URL: str = "sqlite:///./horaires.db"
 
+    # Cache de configuration : délai (secondes) entre deux vérifications de version.
+    # 0 (défaut) vérifie à chaque lecture (sous SQLite par PRAGMA data_version, sans
+    # lire la table config) : une modification faite par un autre worker est vue dès
+    # la lecture suivante. Au-delà, un worker peut servir une configuration périmée
+    # pendant au plus ce délai.
+    CONFIG_CACHE_TTL_SECONDS: float = 0.0
+
     # API
     API_V1_PREFIX: str = "/api"
 
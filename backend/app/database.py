@@ -2,7 +2,7 @@
 Configuration de la base de données SQLAlchemy.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
@@ -31,17 +31,63 @@ def get_db():
         db.close()
 
 
+def _add_missing_columns():
+    """
+    Ajoute aux tables existantes les colonnes déclarées dans les modèles
+    mais absentes de la base (create_all ne modifie pas les tables existantes).
+
+    Returns:
+        Liste des colonnes ajoutées, au format "table.colonne"
+    """
+    inspector = inspect(engine)
+    added = []
+
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+            if column.server_default is not None:
+                ddl += f" NOT NULL DEFAULT {column.server_default.arg}"
+
+            with engine.begin() as conn:
+                conn.execute(text(ddl))
+            added.append(f"{table.name}.{column.name}")
+
+    return added
+
+
 def init_db():
     """
     Initialise la base de données (création des tables).
     """
-    from .models import Schedule, Config
+    from .models import Schedule, Config, DailyStats
+    from .services import daily_stats_service, schedule_service
 
     Base.metadata.create_all(bind=engine)
+    added_columns = _add_missing_columns()
+
+    # create_all ne crée les index que pour les nouvelles tables
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
     # Créer la configuration par défaut si elle n'existe pas
     db = SessionLocal()
     try:
+        # Colonnes en minutes ajoutées à une base existante : les calculer
+        if any(column.startswith("schedules.") for column in added_columns):
+            schedule_service.backfill_minute_columns(db)
+
+        # Base existante antérieure à daily_stats : construire les agrégats
+        if not db.query(DailyStats).first() and db.query(Schedule).first():
+            daily_stats_service.rebuild(db)
+
         config = db.query(Config).filter(Config.id == 1).first()
         if not config:
             config = Config(
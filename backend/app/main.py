@@ -24,6 +24,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[schedules.NEXT_CURSOR_HEADER],
 )
 
 # Inclusion des routes
@@ -4,5 +4,7 @@ Modèles SQLAlchemy pour la base de données.
 
 from .schedule import Schedule
 from .config import Config
+from .daily_stats import DailyStats
+from .import_checkpoint import ImportCheckpoint
 
-__all__ = ["Schedule", "Config"]
+__all__ = ["Schedule", "Config", "DailyStats", "ImportCheckpoint"]
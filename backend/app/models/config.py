@@ -18,6 +18,8 @@ class Config(Base):
     duree_travail_heures = Column(Integer, nullable=False, default=7)
     duree_travail_minutes = Column(Integer, nullable=False, default=10)
     seuil_pause_minutes = Column(Integer, nullable=False, default=45)
+    # Incrémenté à chaque modification, pour invalider les caches des autres workers
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     __table_args__ = (
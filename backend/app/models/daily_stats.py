@@ -0,0 +1,23 @@
+"""
+Modèle SQLAlchemy pour la table des agrégats journaliers.
+"""
+
+from sqlalchemy import Column, Integer, Date
+from ..database import Base
+
+
+class DailyStats(Base):
+    """
+    Modèle représentant les agrégats d'une journée de saisie.
+    Maintenu à chaque écriture d'horaire pour éviter de parcourir la table schedules.
+    """
+    __tablename__ = "daily_stats"
+
+    jour = Column(Date, primary_key=True)
+    nombre_entrees = Column(Integer, nullable=False, default=0)
+    somme_arrivee_minutes = Column(Integer, nullable=False, default=0)
+    somme_depart_minutes = Column(Integer, nullable=False, default=0)
+    somme_pause_minutes = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DailyStats(jour={self.jour}, nombre_entrees={self.nombre_entrees})>"
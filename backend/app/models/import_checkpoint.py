@@ -0,0 +1,22 @@
+"""
+Modèle SQLAlchemy pour les points de reprise des imports CSV.
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
+from ..database import Base
+
+
+class ImportCheckpoint(Base):
+    """
+    Modèle représentant l'avancement d'un import de fichier CSV historique.
+    Permet de reprendre un import interrompu après la dernière tranche validée.
+    """
+    __tablename__ = "import_checkpoints"
+
+    source = Column(String, primary_key=True)
+    lignes_traitees = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ImportCheckpoint(source={self.source}, lignes_traitees={self.lignes_traitees})>"
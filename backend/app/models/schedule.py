@@ -3,7 +3,7 @@ Modèle SQLAlchemy pour la table des horaires.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, Time, DateTime
+from sqlalchemy import Column, Integer, Time, DateTime, Index
 from ..database import Base
 
 
@@ -19,8 +19,18 @@ class Schedule(Base):
     heure_debut_pause = Column(Time, nullable=False)
     heure_fin_pause = Column(Time, nullable=False)
     heure_depart_calculee = Column(Time, nullable=False)
+    # Valeurs dérivées des heures, stockées pour l'agrégation SQL et la sérialisation
+    debut_minutes = Column(Integer, nullable=False, server_default="0")
+    debut_pause_minutes = Column(Integer, nullable=False, server_default="0")
+    fin_pause_minutes = Column(Integer, nullable=False, server_default="0")
+    depart_minutes = Column(Integer, nullable=False, server_default="0")
+    duree_pause_minutes = Column(Integer, nullable=False, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index("ix_schedules_date_saisie_id", "date_saisie", "id"),
+    )
+
     def __repr__(self):
         return f"<Schedule(id={self.id}, date_saisie={self.date_saisie}, heure_debut={self.heure_debut})>"
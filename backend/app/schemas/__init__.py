@@ -5,6 +5,11 @@ Schémas Pydantic pour la validation des données.
 from .schedule import (
     ScheduleBase,
     ScheduleCreate,
+    ScheduleBulkItem,
+    ScheduleBulkError,
+    ScheduleBulkResponse,
+    ScheduleImportError,
+    ScheduleImportResponse,
     ScheduleUpdate,
     ScheduleResponse,
 )
@@ -13,6 +18,11 @@ from .config import ConfigBase, ConfigUpdate, ConfigResponse
 __all__ = [
     "ScheduleBase",
     "ScheduleCreate",
+    "ScheduleBulkItem",
+    "ScheduleBulkError",
+    "ScheduleBulkResponse",
+    "ScheduleImportError",
+    "ScheduleImportResponse",
     "ScheduleUpdate",
     "ScheduleResponse",
     "ConfigBase",
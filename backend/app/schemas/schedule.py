@@ -2,9 +2,9 @@
 Schémas Pydantic pour les horaires.
 """
 
-from datetime import datetime, time, timedelta
-from typing import Optional
-from pydantic import BaseModel, Field, computed_field
+from datetime import datetime, time
+from typing import List, Optional
+from pydantic import BaseModel, Field
 
 
 class ScheduleBase(BaseModel):
@@ -21,6 +21,38 @@ class ScheduleCreate(BaseModel):
     heure_fin_pause: time = Field(..., description="Heure de fin de pause")
 
 
+class ScheduleBulkItem(ScheduleCreate):
+    """Schéma d'un horaire dans une création en masse."""
+    date_saisie: Optional[datetime] = Field(None, description="Date de saisie d'origine (par défaut: maintenant)")
+
+
+class ScheduleBulkError(BaseModel):
+    """Erreur sur une ligne d'une création en masse."""
+    index: int = Field(..., description="Position de la ligne dans la requête (à partir de 0)")
+    detail: str = Field(..., description="Description de l'erreur")
+
+
+class ScheduleBulkResponse(BaseModel):
+    """Schéma pour la réponse d'une création en masse."""
+    inserted: int = Field(..., description="Nombre d'horaires insérés")
+    errors: List[ScheduleBulkError] = Field(default_factory=list, description="Lignes rejetées")
+
+
+class ScheduleImportError(BaseModel):
+    """Erreur sur une ligne d'un import CSV."""
+    ligne: int = Field(..., description="Numéro de ligne dans le fichier (en-tête = 1)")
+    detail: str = Field(..., description="Description de l'erreur")
+
+
+class ScheduleImportResponse(BaseModel):
+    """Schéma pour la réponse d'un import CSV historique."""
+    inserted: int = Field(..., description="Nombre d'horaires insérés")
+    duplicates: int = Field(..., description="Horaires ignorés car déjà présents (même date de saisie)")
+    resumed: int = Field(..., description="Lignes ignorées car déjà traitées lors d'un import précédent")
+    error_count: int = Field(..., description="Nombre de lignes invalides")
+    errors: List[ScheduleImportError] = Field(default_factory=list, description="Premières lignes invalides")
+
+
 class ScheduleUpdate(BaseModel):
     """Schéma pour la mise à jour d'un horaire."""
     heure_debut: Optional[time] = Field(None, description="Heure de début de travail")
@@ -38,15 +70,7 @@ class ScheduleResponse(BaseModel):
     heure_depart_calculee: time
     created_at: datetime
     updated_at: datetime
-
-    @computed_field
-    @property
-    def duree_pause_minutes(self) -> int:
-        """Calcule la durée de la pause en minutes."""
-        debut = timedelta(hours=self.heure_debut_pause.hour, minutes=self.heure_debut_pause.minute)
-        fin = timedelta(hours=self.heure_fin_pause.hour, minutes=self.heure_fin_pause.minute)
-        duree = fin - debut
-        return int(duree.total_seconds() / 60)
+    duree_pause_minutes: int = Field(..., description="Durée de la pause en minutes")
 
     class Config:
         from_attributes = True
@@ -0,0 +1,152 @@
+"""
+Service métier pour la configuration, avec cache local au processus.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from ..config import settings
+from ..models.config import Config
+from ..schemas.config import ConfigResponse
+
+# Cache par base de données : url -> (version, configuration, instant de vérification)
+_cache: Dict[str, Tuple[int, ConfigResponse, float]] = {}
+_lock = threading.Lock()
+
+# Clé, dans les infos de chaque connexion SQLite, du couple
+# (PRAGMA data_version, version de la configuration) à la dernière vérification
+_DATA_VERSION_KEY = "config_data_version"
+
+
+def _cache_key(db: Session) -> str:
+    """Identifie la base de données de la session."""
+    return str(db.get_bind().url)
+
+
+def invalidate(db: Session) -> None:
+    """
+    Vide le cache de configuration de la base de la session.
+
+    Args:
+        db: Session de base de données
+    """
+    with _lock:
+        _cache.pop(_cache_key(db), None)
+
+
+@event.listens_for(Config, "after_update")
+def _mark_modified(mapper, connection, target: Config) -> None:
+    """Note qu'une session de ce processus modifie la configuration."""
+    session = object_session(target)
+    if session is not None:
+        session.info["config_modifiee"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(db: Session) -> None:
+    """Vide le cache après la validation d'une modification de la configuration."""
+    if db.info.pop("config_modifiee", False):
+        invalidate(db)
+
+
+def _data_version(db: Session) -> Optional[Tuple[dict, int]]:
+    """
+    Compteur SQLite des validations faites par les autres connexions.
+
+    PRAGMA data_version change dès qu'une autre connexion (autre worker,
+    autre session) valide une écriture sur la base ; il ne lit aucune table.
+
+    Args:
+        db: Session de base de données
+
+    Returns:
+        Tuple (infos de la connexion, data_version), ou None hors SQLite
+    """
+    connection = db.connection()
+    if connection.dialect.name != "sqlite":
+        return None
+    return connection.connection.info, connection.exec_driver_sql("PRAGMA data_version").scalar()
+
+
+def get_config(db: Session) -> Optional[ConfigResponse]:
+    """
+    Récupère la configuration, depuis le cache si elle n'a pas changé.
+
+    Sous SQLite, PRAGMA data_version indique si une autre connexion a écrit
+    dans la base depuis la dernière vérification faite sur cette connexion :
+    sinon, le cache est servi sans requête sur la table config. Sinon (ou
+    avec une autre base), seule la colonne version est relue : la ligne
+    complète n'est rechargée que si un autre processus l'a modifiée. Les
+    modifications de ce processus vident le cache à leur validation.
+
+    Avec CONFIG_CACHE_TTL_SECONDS > 0, aucune vérification n'a lieu avant ce
+    délai : une modification faite par un autre processus peut alors rester
+    invisible pendant au plus CONFIG_CACHE_TTL_SECONDS secondes (celles de ce
+    processus sont visibles immédiatement).
+
+    Args:
+        db: Session de base de données
+
+    Returns:
+        Configuration actuelle ou None si elle n'existe pas
+    """
+    key = _cache_key(db)
+    now = time.monotonic()
+
+    with _lock:
+        cached = _cache.get(key)
+
+    if cached and now - cached[2] < settings.CONFIG_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    marker = _data_version(db)
+    if cached and marker and marker[0].get(_DATA_VERSION_KEY) == (marker[1], cached[0]):
+        return cached[1]
+
+    version = db.query(Config.version).filter(Config.id == 1).scalar()
+    if version is None:
+        invalidate(db)
+        return None
+
+    if cached and cached[0] == version:
+        snapshot = cached[1]
+    else:
+        config = db.query(Config).filter(Config.id == 1).first()
+        version, snapshot = config.version, ConfigResponse.model_validate(config)
+
+    with _lock:
+        _cache[key] = (version, snapshot, now)
+    if marker:
+        marker[0][_DATA_VERSION_KEY] = (marker[1], version)
+
+    return snapshot
+
+
+def update_config(db: Session, values: Dict[str, int]) -> Optional[Config]:
+    """
+    Met à jour la configuration, incrémente sa version et invalide le cache.
+
+    Args:
+        db: Session de base de données
+        values: Champs à modifier
+
+    Returns:
+        Configuration mise à jour ou None si elle n'existe pas
+    """
+    config = db.query(Config).filter(Config.id == 1).first()
+
+    if not config:
+        return None
+
+    for field, value in values.items():
+        setattr(config, field, value)
+    config.version = Config.version + 1
+
+    db.commit()
+    db.refresh(config)
+    invalidate(db)
+
+    return config
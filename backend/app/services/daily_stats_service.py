@@ -0,0 +1,132 @@
+"""
+Service métier pour la maintenance des agrégats journaliers.
+"""
+
+from datetime import date
+from typing import Tuple
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..models.schedule import Schedule
+from ..models.daily_stats import DailyStats
+
+
+def contribution(schedule: Schedule) -> Tuple[int, int, int]:
+    """
+    Calcule la contribution d'un horaire aux sommes journalières.
+
+    Args:
+        schedule: Horaire
+
+    Returns:
+        Tuple (minutes d'arrivée, minutes de départ, minutes de pause)
+    """
+    return (
+        schedule.debut_minutes,
+        schedule.depart_minutes,
+        schedule.duree_pause_minutes,
+    )
+
+
+def apply_delta(
+    db: Session,
+    jour: date,
+    nombre: int,
+    arrivee: int,
+    depart: int,
+    pause: int
+) -> None:
+    """
+    Ajoute un delta aux agrégats d'une journée, sans valider la transaction.
+
+    Args:
+        db: Session de base de données
+        jour: Journée concernée
+        nombre: Variation du nombre d'entrées
+        arrivee: Variation de la somme des minutes d'arrivée
+        depart: Variation de la somme des minutes de départ
+        pause: Variation de la somme des minutes de pause
+    """
+    result = db.execute(
+        update(DailyStats)
+        .where(DailyStats.jour == jour)
+        .values(
+            nombre_entrees=DailyStats.nombre_entrees + nombre,
+            somme_arrivee_minutes=DailyStats.somme_arrivee_minutes + arrivee,
+            somme_depart_minutes=DailyStats.somme_depart_minutes + depart,
+            somme_pause_minutes=DailyStats.somme_pause_minutes + pause,
+        )
+    )
+
+    if result.rowcount == 0:
+        db.execute(
+            insert(DailyStats).values(
+                jour=jour,
+                nombre_entrees=nombre,
+                somme_arrivee_minutes=arrivee,
+                somme_depart_minutes=depart,
+                somme_pause_minutes=pause,
+            )
+        )
+    elif nombre < 0:
+        db.execute(
+            delete(DailyStats).where(DailyStats.jour == jour, DailyStats.nombre_entrees <= 0)
+        )
+
+
+def add_schedule(db: Session, schedule: Schedule) -> None:
+    """
+    Ajoute un horaire aux agrégats de sa journée.
+
+    Args:
+        db: Session de base de données
+        schedule: Horaire ajouté
+    """
+    apply_delta(db, schedule.date_saisie.date(), 1, *contribution(schedule))
+
+
+def remove_schedule(db: Session, schedule: Schedule) -> None:
+    """
+    Retire un horaire des agrégats de sa journée.
+
+    Args:
+        db: Session de base de données
+        schedule: Horaire retiré
+    """
+    arrivee, depart, pause = contribution(schedule)
+    apply_delta(db, schedule.date_saisie.date(), -1, -arrivee, -depart, -pause)
+
+
+def rebuild(db: Session) -> int:
+    """
+    Reconstruit entièrement la table daily_stats depuis la table schedules.
+
+    Args:
+        db: Session de base de données
+
+    Returns:
+        Nombre de journées agrégées
+    """
+    jour = func.date(Schedule.date_saisie)
+    db.execute(delete(DailyStats))
+    db.execute(
+        insert(DailyStats).from_select(
+            [
+                DailyStats.jour,
+                DailyStats.nombre_entrees,
+                DailyStats.somme_arrivee_minutes,
+                DailyStats.somme_depart_minutes,
+                DailyStats.somme_pause_minutes,
+            ],
+            select(
+                jour,
+                func.count(Schedule.id),
+                func.sum(Schedule.debut_minutes),
+                func.sum(Schedule.depart_minutes),
+                func.sum(Schedule.duree_pause_minutes),
+            ).group_by(jour)
+        )
+    )
+    db.commit()
+
+    return db.query(func.count(DailyStats.jour)).scalar()
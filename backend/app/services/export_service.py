@@ -0,0 +1,97 @@
+"""
+Service métier pour l'export en flux des horaires.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, Optional
+from sqlalchemy import select
+from sqlalchemy.engine import Connectable
+from sqlalchemy.orm import Session
+
+from ..models.schedule import Schedule
+from .legacy_csv import CSV_HEADERS, DATETIME_FORMAT, TIME_FORMAT
+
+# Nombre de lignes lues par aller-retour du curseur et émises par morceau
+EXPORT_CHUNK_SIZE = 1000
+
+
+def iter_export(
+    bind: Connectable,
+    fmt: str = "csv",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Produit l'export des horaires morceau par morceau.
+
+    Les lignes sont lues par lots de chunk_size (yield_per) dans une session
+    dédiée, ouverte pour la durée du flux : la mémoire reste constante
+    quelle que soit la taille de la table.
+
+    Args:
+        bind: Moteur de base de données
+        fmt: Format de sortie ("csv" au format historique, ou "ndjson")
+        date_from: Première date de saisie incluse
+        date_to: Dernière date de saisie incluse
+        chunk_size: Nombre de lignes par morceau
+
+    Yields:
+        Morceaux de texte de l'export
+    """
+    stmt = select(
+        Schedule.id,
+        Schedule.date_saisie,
+        Schedule.heure_debut,
+        Schedule.heure_debut_pause,
+        Schedule.heure_fin_pause,
+        Schedule.heure_depart_calculee,
+    ).order_by(Schedule.date_saisie, Schedule.id)
+
+    if date_from is not None:
+        stmt = stmt.where(Schedule.date_saisie >= datetime.combine(date_from, time.min))
+    if date_to is not None:
+        stmt = stmt.where(Schedule.date_saisie < datetime.combine(date_to + timedelta(days=1), time.min))
+
+    db = Session(bind=bind)
+    try:
+        result = db.execute(stmt.execution_options(yield_per=chunk_size))
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(CSV_HEADERS)
+            yield buffer.getvalue()
+
+            for partition in result.partitions():
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(
+                    (
+                        row.date_saisie.strftime(DATETIME_FORMAT),
+                        row.heure_debut.strftime(TIME_FORMAT),
+                        row.heure_debut_pause.strftime(TIME_FORMAT),
+                        row.heure_fin_pause.strftime(TIME_FORMAT),
+                        row.heure_depart_calculee.strftime(TIME_FORMAT),
+                    )
+                    for row in partition
+                )
+                yield buffer.getvalue()
+        else:
+            for partition in result.partitions():
+                yield "".join(
+                    json.dumps({
+                        "id": row.id,
+                        "date_saisie": row.date_saisie.isoformat(),
+                        "heure_debut": row.heure_debut.isoformat(),
+                        "heure_debut_pause": row.heure_debut_pause.isoformat(),
+                        "heure_fin_pause": row.heure_fin_pause.isoformat(),
+                        "heure_depart_calculee": row.heure_depart_calculee.isoformat(),
+                    }) + "\n"
+                    for row in partition
+                )
+    finally:
+        db.close()
@@ -0,0 +1,124 @@
+"""
+Service métier pour l'import du CSV historique (calcule_Heure/horaires.csv).
+"""
+
+import csv
+import hashlib
+from typing import Any, Dict, List, TextIO
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.import_checkpoint import ImportCheckpoint
+from ..models.schedule import Schedule
+from . import schedule_service
+from .legacy_csv import parse_row
+
+# Nombre de lignes insérées (et validées) par tranche
+IMPORT_CHUNK_SIZE = 1000
+
+# Nombre maximum d'erreurs détaillées dans le rapport
+MAX_REPORTED_ERRORS = 100
+
+
+def _checkpoint_key(name: str, first_row: Dict[str, str]) -> str:
+    """
+    Identifie un fichier importé par son nom et sa première ligne de données,
+    qui ne change pas lorsque des lignes sont ajoutées en fin de fichier.
+    """
+    empreinte = hashlib.sha256(",".join(first_row.values()).encode()).hexdigest()[:16]
+    return f"{name}:{empreinte}"
+
+
+def _flush_chunk(
+    db: Session,
+    chunk: List[Dict[str, Any]],
+    checkpoint: ImportCheckpoint,
+    lignes: int,
+    report: Dict[str, Any]
+) -> None:
+    """
+    Insère une tranche sans les doublons et enregistre le point de reprise
+    dans la même transaction.
+    """
+    dates = {row["date_saisie"] for row in chunk}
+    existing = set(db.execute(
+        select(Schedule.date_saisie).where(Schedule.date_saisie.in_(dates))
+    ).scalars())
+
+    rows = []
+    for row in chunk:
+        if row["date_saisie"] in existing:
+            report["duplicates"] += 1
+            continue
+        existing.add(row["date_saisie"])
+        rows.append(row)
+
+    schedule_service.insert_schedules(db, rows)
+    checkpoint.lignes_traitees = lignes
+    db.commit()
+
+    report["inserted"] += len(rows)
+
+
+def import_legacy_csv(
+    db: Session,
+    stream: TextIO,
+    name: str,
+    chunk_size: int = IMPORT_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Importe un CSV historique en flux, par tranches validées séparément.
+
+    Le fichier est lu ligne à ligne avec csv.DictReader, comme CSVHandler.read.
+    Chaque tranche est validée avec son point de reprise : un import
+    interrompu repart de la dernière tranche validée. Les horaires dont la
+    date de saisie existe déjà en base sont ignorés.
+
+    Args:
+        db: Session de base de données
+        stream: Fichier texte (UTF-8) ouvert avec newline=''
+        name: Nom du fichier, utilisé pour le point de reprise
+        chunk_size: Nombre de lignes par tranche
+
+    Returns:
+        Rapport d'import (insérés, doublons, lignes reprises, erreurs)
+    """
+    report = {"inserted": 0, "duplicates": 0, "resumed": 0, "errors": [], "error_count": 0}
+    reader = csv.DictReader(stream)
+
+    first_row = next(reader, None)
+    if first_row is None:
+        return report
+
+    key = _checkpoint_key(name, first_row)
+    checkpoint = db.get(ImportCheckpoint, key)
+    if checkpoint is None:
+        checkpoint = ImportCheckpoint(source=key, lignes_traitees=0)
+        db.add(checkpoint)
+    report["resumed"] = checkpoint.lignes_traitees
+
+    def rows():
+        yield first_row
+        yield from reader
+
+    chunk = []
+    lignes = 0
+    for lignes, row in enumerate(rows(), start=1):
+        if lignes <= report["resumed"]:
+            continue
+
+        try:
+            chunk.append(parse_row(row))
+        except ValueError as e:
+            report["error_count"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                # +1 pour la ligne d'en-tête
+                report["errors"].append({"ligne": lignes + 1, "detail": str(e)})
+
+        if len(chunk) >= chunk_size:
+            _flush_chunk(db, chunk, checkpoint, lignes, report)
+            chunk = []
+
+    _flush_chunk(db, chunk, checkpoint, max(lignes, report["resumed"]), report)
+
+    return report
@@ -0,0 +1,77 @@
+"""
+Format CSV de l'application historique (calcule_Heure/horaires.csv).
+
+Le backend est déployé sans le package calcule_Heure : les en-têtes et
+formats sont donc repris ici à l'identique de calcule_Heure/constants.py.
+"""
+
+from datetime import datetime, time
+from typing import Any, Dict, List
+
+# Identique à calcule_Heure.constants.CSV_HEADERS
+CSV_HEADERS: List[str] = [
+    "Date de saisie",
+    "Heure début",
+    "Heure début pause",
+    "Heure fin pause",
+    "Heure départ calculée"
+]
+
+# Identiques à calcule_Heure.constants.DATETIME_FORMAT et TIME_FORMAT
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+TIME_FORMAT = "%H:%M"
+
+
+def _parse_datetime(value: str) -> datetime:
+    """
+    Lit une date de saisie au format DATETIME_FORMAT, sous sa seule forme
+    canonique (AAAA-MM-JJ HH:MM:SS), comme calcule_Heure.timecodec.
+    """
+    if (
+        len(value) != 19 or not value.isascii()
+        or value[4] != "-" or value[7] != "-" or value[10] != " "
+        or value[13] != ":" or value[16] != ":"
+    ):
+        raise ValueError(f"Date invalide {value!r}")
+    # La forme étant fixée, fromisoformat valide chiffres et plages bien plus vite que strptime
+    return datetime.fromisoformat(value)
+
+
+def _parse_time(value: str) -> time:
+    """
+    Lit une heure au format TIME_FORMAT. Comme strptime (et l'application
+    historique), les heures et minutes sur un chiffre sont acceptées ("8:05").
+    """
+    if len(value) == 5 and value[2] == ":" and value.isascii():
+        return time.fromisoformat(value)
+    return datetime.strptime(value, TIME_FORMAT).time()
+
+
+def parse_row(row: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Convertit une ligne lue par csv.DictReader en colonnes de la table schedules.
+
+    Args:
+        row: Ligne du CSV historique, indexée par CSV_HEADERS
+
+    Returns:
+        Dictionnaire des colonnes de l'horaire
+
+    Raises:
+        ValueError: Si une colonne est absente ou mal formée
+    """
+    # Mêmes règles que l'application historique : fromisoformat seul
+    # accepterait aussi "2024-01-01T08:00", "2024-01-01" ou "08:00:00"
+    try:
+        return {
+            "date_saisie": _parse_datetime(row["Date de saisie"]),
+            "heure_debut": _parse_time(row["Heure début"]),
+            "heure_debut_pause": _parse_time(row["Heure début pause"]),
+            "heure_fin_pause": _parse_time(row["Heure fin pause"]),
+            "heure_depart_calculee": _parse_time(row["Heure départ calculée"]),
+        }
+    except KeyError as e:
+        raise ValueError(f"Colonne manquante: {e}")
+    except TypeError:
+        # csv.DictReader renvoie None pour les colonnes absentes d'une ligne courte
+        raise ValueError("Ligne incomplète")
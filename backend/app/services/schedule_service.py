@@ -2,13 +2,19 @@
 Service métier pour la gestion des horaires.
 """
 
+import base64
+from collections import defaultdict
 from datetime import datetime, time, timedelta
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
 from ..models.schedule import Schedule
-from ..models.config import Config
-from ..schemas.schedule import ScheduleCreate, ScheduleUpdate
+from ..schemas.schedule import ScheduleBulkItem, ScheduleCreate, ScheduleUpdate
+from . import config_service, daily_stats_service
+from .statistics_service import minutes_expr
 
 
 def calculer_heure_depart(
@@ -49,6 +55,35 @@ def calculer_heure_depart(
     return dt_depart.time()
 
 
+def minute_columns(
+    heure_debut: time,
+    heure_debut_pause: time,
+    heure_fin_pause: time,
+    heure_depart_calculee: time
+) -> Dict[str, int]:
+    """
+    Calcule les colonnes en minutes stockées avec un horaire.
+
+    Args:
+        heure_debut: Heure de début de travail
+        heure_debut_pause: Heure de début de pause
+        heure_fin_pause: Heure de fin de pause
+        heure_depart_calculee: Heure de départ calculée
+
+    Returns:
+        Dictionnaire des colonnes *_minutes de la table schedules
+    """
+    debut_pause = heure_debut_pause.hour * 60 + heure_debut_pause.minute
+    fin_pause = heure_fin_pause.hour * 60 + heure_fin_pause.minute
+    return {
+        "debut_minutes": heure_debut.hour * 60 + heure_debut.minute,
+        "debut_pause_minutes": debut_pause,
+        "fin_pause_minutes": fin_pause,
+        "depart_minutes": heure_depart_calculee.hour * 60 + heure_depart_calculee.minute,
+        "duree_pause_minutes": fin_pause - debut_pause,
+    }
+
+
 def get_schedules(db: Session, skip: int = 0, limit: int = 100) -> List[Schedule]:
     """
     Récupère la liste des horaires.
@@ -61,7 +96,125 @@ def get_schedules(db: Session, skip: int = 0, limit: int = 100) -> List[Schedule
     Returns:
         Liste des horaires
     """
-    return db.query(Schedule).order_by(Schedule.date_saisie.desc()).offset(skip).limit(limit).all()
+    return (
+        db.query(Schedule)
+        .order_by(Schedule.date_saisie.desc(), Schedule.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def encode_cursor(schedule: Schedule) -> str:
+    """
+    Encode la position d'un horaire en curseur de pagination opaque.
+
+    Args:
+        schedule: Dernier horaire de la page
+
+    Returns:
+        Curseur encodé en base64 (URL-safe)
+    """
+    raw = f"{schedule.date_saisie.isoformat()}|{schedule.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Décode un curseur de pagination.
+
+    Args:
+        cursor: Curseur produit par encode_cursor
+
+    Returns:
+        Tuple (date_saisie, id) du dernier horaire vu
+
+    Raises:
+        ValueError: Si le curseur est invalide
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        date_saisie, schedule_id = raw.split("|")
+        return datetime.fromisoformat(date_saisie), int(schedule_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Curseur invalide: {cursor}") from e
+
+
+def get_schedules_after(db: Session, cursor: str, limit: int = 100) -> List[Schedule]:
+    """
+    Récupère la page d'horaires suivant un curseur (pagination par clé).
+
+    La comparaison sur (date_saisie, id) utilise l'index composite, le coût
+    d'une page ne dépend donc pas de sa profondeur.
+
+    Args:
+        db: Session de base de données
+        cursor: Curseur du dernier horaire de la page précédente
+        limit: Nombre maximum d'éléments à retourner
+
+    Returns:
+        Liste des horaires
+
+    Raises:
+        ValueError: Si le curseur est invalide
+    """
+    date_saisie, schedule_id = decode_cursor(cursor)
+
+    return (
+        db.query(Schedule)
+        .filter(tuple_(Schedule.date_saisie, Schedule.id) < tuple_(date_saisie, schedule_id))
+        .order_by(Schedule.date_saisie.desc(), Schedule.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+# Colonnes de ScheduleResponse, lues directement par le chemin rapide
+RESPONSE_COLUMNS = (
+    Schedule.id,
+    Schedule.date_saisie,
+    Schedule.heure_debut,
+    Schedule.heure_debut_pause,
+    Schedule.heure_fin_pause,
+    Schedule.heure_depart_calculee,
+    Schedule.created_at,
+    Schedule.updated_at,
+    Schedule.duree_pause_minutes,
+)
+
+
+def get_schedule_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None
+) -> List[Row]:
+    """
+    Récupère une page d'horaires sous forme de tuples de colonnes (SQLAlchemy Core),
+    sans construire d'objets ORM. Même ordre et même pagination que
+    get_schedules et get_schedules_after.
+
+    Args:
+        db: Session de base de données
+        skip: Nombre d'éléments à ignorer (ignoré si after est fourni)
+        limit: Nombre maximum d'éléments à retourner
+        after: Curseur de la page précédente
+
+    Returns:
+        Lignes contenant les champs de ScheduleResponse
+
+    Raises:
+        ValueError: Si le curseur est invalide
+    """
+    stmt = select(*RESPONSE_COLUMNS).order_by(Schedule.date_saisie.desc(), Schedule.id.desc())
+
+    if after is not None:
+        date_saisie, schedule_id = decode_cursor(after)
+        stmt = stmt.where(tuple_(Schedule.date_saisie, Schedule.id) < tuple_(date_saisie, schedule_id))
+    else:
+        stmt = stmt.offset(skip)
+
+    return db.execute(stmt.limit(limit)).all()
 
 
 def get_schedule(db: Session, schedule_id: int) -> Optional[Schedule]:
@@ -89,8 +242,8 @@ def create_schedule(db: Session, schedule: ScheduleCreate) -> Schedule:
     Returns:
         Horaire créé
     """
-    # Récupérer la configuration pour calculer l'heure de départ
-    config = db.query(Config).filter(Config.id == 1).first()
+    # Récupérer la configuration (mise en cache) pour calculer l'heure de départ
+    config = config_service.get_config(db)
 
     # Calculer l'heure de départ
     heure_depart = calculer_heure_depart(
@@ -103,19 +256,119 @@ def create_schedule(db: Session, schedule: ScheduleCreate) -> Schedule:
 
     # Créer l'horaire
     db_schedule = Schedule(
+        date_saisie=datetime.utcnow(),
         heure_debut=schedule.heure_debut,
         heure_debut_pause=schedule.heure_debut_pause,
         heure_fin_pause=schedule.heure_fin_pause,
-        heure_depart_calculee=heure_depart
+        heure_depart_calculee=heure_depart,
+        **minute_columns(
+            schedule.heure_debut,
+            schedule.heure_debut_pause,
+            schedule.heure_fin_pause,
+            heure_depart
+        )
     )
 
     db.add(db_schedule)
+    daily_stats_service.add_schedule(db, db_schedule)
     db.commit()
     db.refresh(db_schedule)
 
     return db_schedule
 
 
+def insert_schedules(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insère des horaires en une seule instruction (executemany) et met à jour
+    les agrégats journaliers, sans valider la transaction.
+
+    Les colonnes en minutes sont calculées ici à partir des heures.
+
+    Args:
+        db: Session de base de données
+        rows: Horaires à insérer (colonnes de la table schedules)
+    """
+    if not rows:
+        return
+
+    deltas = defaultdict(lambda: [0, 0, 0, 0])
+    for row in rows:
+        row.update(minute_columns(
+            row["heure_debut"],
+            row["heure_debut_pause"],
+            row["heure_fin_pause"],
+            row["heure_depart_calculee"]
+        ))
+        delta = deltas[row["date_saisie"].date()]
+        delta[0] += 1
+        delta[1] += row["debut_minutes"]
+        delta[2] += row["depart_minutes"]
+        delta[3] += row["duree_pause_minutes"]
+
+    db.execute(insert(Schedule), rows)
+
+    for jour, (nombre, arrivee, depart, pause) in deltas.items():
+        daily_stats_service.apply_delta(db, jour, nombre, arrivee, depart, pause)
+
+
+def create_schedules_bulk(db: Session, items: Iterable[Tuple[int, Any]]) -> Dict[str, Any]:
+    """
+    Crée des horaires en masse dans une seule transaction.
+
+    La configuration est lue une seule fois et toutes les heures de départ
+    sont calculées en une passe avant une insertion groupée. Les lignes
+    invalides sont ignorées et signalées individuellement.
+
+    Args:
+        db: Session de base de données
+        items: Couples (position dans la requête, données brutes de l'horaire)
+
+    Returns:
+        Dictionnaire {"inserted": nombre inséré, "errors": erreurs par ligne}
+    """
+    config = config_service.get_config(db)
+    duree_travail = config.duree_travail_heures * 60 + config.duree_travail_minutes
+    now = datetime.utcnow()
+
+    rows = []
+    errors = []
+
+    for index, raw in items:
+        try:
+            item = ScheduleBulkItem.model_validate(raw)
+        except ValidationError as e:
+            errors.append({
+                "index": index,
+                "detail": "; ".join(
+                    f"{'.'.join(str(loc) for loc in err['loc']) or 'ligne'}: {err['msg']}"
+                    for err in e.errors()
+                )
+            })
+            continue
+
+        debut = item.heure_debut.hour * 60 + item.heure_debut.minute
+        pause = (
+            item.heure_fin_pause.hour * 60 + item.heure_fin_pause.minute
+            - item.heure_debut_pause.hour * 60 - item.heure_debut_pause.minute
+        )
+        depart = (debut + duree_travail + pause) % (24 * 60)
+
+        rows.append({
+            "date_saisie": item.date_saisie or now,
+            "heure_debut": item.heure_debut,
+            "heure_debut_pause": item.heure_debut_pause,
+            "heure_fin_pause": item.heure_fin_pause,
+            "heure_depart_calculee": time(depart // 60, depart % 60),
+            "created_at": now,
+            "updated_at": now,
+        })
+
+    insert_schedules(db, rows)
+    db.commit()
+
+    return {"inserted": len(rows), "errors": errors}
+
+
 def update_schedule(db: Session, schedule_id: int, schedule: ScheduleUpdate) -> Optional[Schedule]:
     """
     Met à jour un horaire.
@@ -135,13 +388,19 @@ def update_schedule(db: Session, schedule_id: int, schedule: ScheduleUpdate) ->
 
     # Mettre à jour les champs fournis
     update_data = schedule.model_dump(exclude_unset=True)
+    horaires_modifies = any(
+        field in update_data for field in ["heure_debut", "heure_debut_pause", "heure_fin_pause"]
+    )
+
+    if horaires_modifies:
+        daily_stats_service.remove_schedule(db, db_schedule)
 
     for field, value in update_data.items():
         setattr(db_schedule, field, value)
 
     # Recalculer l'heure de départ si nécessaire
-    if any(field in update_data for field in ["heure_debut", "heure_debut_pause", "heure_fin_pause"]):
-        config = db.query(Config).filter(Config.id == 1).first()
+    if horaires_modifies:
+        config = config_service.get_config(db)
         heure_depart = calculer_heure_depart(
             db_schedule.heure_debut,
             db_schedule.heure_debut_pause,
@@ -151,6 +410,16 @@ def update_schedule(db: Session, schedule_id: int, schedule: ScheduleUpdate) ->
         )
         db_schedule.heure_depart_calculee = heure_depart
 
+        for field, value in minute_columns(
+            db_schedule.heure_debut,
+            db_schedule.heure_debut_pause,
+            db_schedule.heure_fin_pause,
+            heure_depart
+        ).items():
+            setattr(db_schedule, field, value)
+
+        daily_stats_service.add_schedule(db, db_schedule)
+
     db.commit()
     db.refresh(db_schedule)
 
@@ -173,7 +442,30 @@ def delete_schedule(db: Session, schedule_id: int) -> bool:
     if not db_schedule:
         return False
 
+    daily_stats_service.remove_schedule(db, db_schedule)
     db.delete(db_schedule)
     db.commit()
 
     return True
+
+
+def backfill_minute_columns(db: Session) -> None:
+    """
+    Recalcule en SQL les colonnes en minutes de tous les horaires, pour les
+    bases créées avant leur ajout. updated_at est conservé : ce calcul
+    n'est pas une modification de l'horaire.
+
+    Args:
+        db: Session de base de données
+    """
+    db.execute(
+        update(Schedule).values(
+            debut_minutes=minutes_expr(Schedule.heure_debut),
+            debut_pause_minutes=minutes_expr(Schedule.heure_debut_pause),
+            fin_pause_minutes=minutes_expr(Schedule.heure_fin_pause),
+            depart_minutes=minutes_expr(Schedule.heure_depart_calculee),
+            duree_pause_minutes=minutes_expr(Schedule.heure_fin_pause) - minutes_expr(Schedule.heure_debut_pause),
+            updated_at=Schedule.updated_at,
+        )
+    )
+    db.commit()
@@ -2,12 +2,13 @@
 Service métier pour les statistiques.
 """
 
-from datetime import time
-from typing import Dict, Any
+from datetime import date, time
+from typing import Dict, Any, List, Optional, Sequence
+from sqlalchemy import extract, func
 from sqlalchemy.orm import Session
 
 from ..models.schedule import Schedule
-from ..models.config import Config
+from ..models.daily_stats import DailyStats
 
 
 def time_to_minutes(t: time) -> int:
@@ -38,6 +39,19 @@ def minutes_to_time(minutes: int) -> time:
     return time(hour=hours, minute=mins)
 
 
+def format_minutes(minutes: int) -> str:
+    """
+    Formate des minutes depuis minuit en chaîne HH:MM.
+
+    Args:
+        minutes: Nombre de minutes depuis minuit
+
+    Returns:
+        Chaîne au format HH:MM
+    """
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
 def calculer_duree_pause(heure_debut_pause: time, heure_fin_pause: time) -> int:
     """
     Calcule la durée de pause en minutes.
@@ -54,19 +68,40 @@ def calculer_duree_pause(heure_debut_pause: time, heure_fin_pause: time) -> int:
     return fin_minutes - debut_minutes
 
 
+def minutes_expr(column):
+    """
+    Construit l'expression SQL convertissant une colonne Time en minutes depuis minuit.
+
+    Args:
+        column: Colonne SQLAlchemy de type Time
+
+    Returns:
+        Expression SQL entière (heures * 60 + minutes)
+    """
+    return extract("hour", column) * 60 + extract("minute", column)
+
+
 def get_statistics(db: Session) -> Dict[str, Any]:
     """
     Calcule les statistiques sur les horaires.
 
+    Les sommes sont lues dans la table daily_stats par une seule requête
+    d'agrégation : le coût dépend du nombre de jours, pas du nombre d'horaires.
+
     Args:
         db: Session de base de données
 
     Returns:
         Dictionnaire contenant les statistiques
     """
-    schedules = db.query(Schedule).all()
-
-    if not schedules:
+    count, total_arrivee, total_depart, total_pause = db.query(
+        func.sum(DailyStats.nombre_entrees),
+        func.sum(DailyStats.somme_arrivee_minutes),
+        func.sum(DailyStats.somme_depart_minutes),
+        func.sum(DailyStats.somme_pause_minutes),
+    ).one()
+
+    if not count:
         return {
             "total_entrees": 0,
             "moyenne_arrivee": "00:00",
@@ -74,23 +109,11 @@ def get_statistics(db: Session) -> Dict[str, Any]:
             "moyenne_pause_minutes": 0
         }
 
-    # Calculer les moyennes
-    total_arrivee = 0
-    total_depart = 0
-    total_pause = 0
-
-    for schedule in schedules:
-        total_arrivee += time_to_minutes(schedule.heure_debut)
-        total_depart += time_to_minutes(schedule.heure_depart_calculee)
-        total_pause += calculer_duree_pause(schedule.heure_debut_pause, schedule.heure_fin_pause)
-
-    count = len(schedules)
-
     return {
         "total_entrees": count,
-        "moyenne_arrivee": minutes_to_time(total_arrivee // count).strftime("%H:%M"),
-        "moyenne_depart": minutes_to_time(total_depart // count).strftime("%H:%M"),
-        "moyenne_pause_minutes": total_pause // count
+        "moyenne_arrivee": minutes_to_time(int(total_arrivee) // count).strftime("%H:%M"),
+        "moyenne_depart": minutes_to_time(int(total_depart) // count).strftime("%H:%M"),
+        "moyenne_pause_minutes": int(total_pause) // count
     }
 
 
@@ -104,8 +127,16 @@ def get_charts_data(db: Session) -> Dict[str, Any]:
     Returns:
         Dictionnaire contenant les données pour les graphiques
     """
-    schedules = db.query(Schedule).order_by(Schedule.date_saisie).all()
-    config = db.query(Config).filter(Config.id == 1).first()
+    schedules = (
+        db.query(
+            Schedule.date_saisie,
+            Schedule.debut_minutes,
+            Schedule.depart_minutes,
+            Schedule.duree_pause_minutes,
+        )
+        .order_by(Schedule.date_saisie)
+        .all()
+    )
 
     if not schedules:
         return {
@@ -119,30 +150,30 @@ def get_charts_data(db: Session) -> Dict[str, Any]:
     pause_data = []
 
     # Calculate averages for reference lines
-    total_arrivee = sum(time_to_minutes(s.heure_debut) for s in schedules)
-    total_depart = sum(time_to_minutes(s.heure_depart_calculee) for s in schedules)
+    total_arrivee = sum(s.debut_minutes for s in schedules)
+    total_depart = sum(s.depart_minutes for s in schedules)
     count = len(schedules)
-    moyenne_arrivee = minutes_to_time(total_arrivee // count).strftime("%H:%M")
-    moyenne_depart = minutes_to_time(total_depart // count).strftime("%H:%M")
+    moyenne_arrivee = format_minutes(total_arrivee // count)
+    moyenne_depart = format_minutes(total_depart // count)
 
     for schedule in schedules:
         date_str = schedule.date_saisie.strftime("%Y-%m-%d")
 
         arrivee_data.append({
             "date": date_str,
-            "heure_debut": schedule.heure_debut.strftime("%H:%M"),
+            "heure_debut": format_minutes(schedule.debut_minutes),
             "moyenne": moyenne_arrivee
         })
 
         depart_data.append({
             "date": date_str,
-            "heure_depart": schedule.heure_depart_calculee.strftime("%H:%M"),
+            "heure_depart": format_minutes(schedule.depart_minutes),
             "moyenne": moyenne_depart
         })
 
         pause_data.append({
             "date": date_str,
-            "duree_pause": calculer_duree_pause(schedule.heure_debut_pause, schedule.heure_fin_pause)
+            "duree_pause": schedule.duree_pause_minutes
         })
 
     return {
@@ -150,3 +181,183 @@ def get_charts_data(db: Session) -> Dict[str, Any]:
         "depart": depart_data,
         "pause": pause_data
     }
+
+
+def bucket_expr(column, granularity: str):
+    """
+    Construit l'expression SQL du début de période contenant une date.
+
+    Les fonctions de date utilisées sont celles de SQLite (base par défaut).
+
+    Args:
+        column: Colonne SQLAlchemy de type Date ou DateTime
+        granularity: Granularité ("day", "week" ou "month")
+
+    Returns:
+        Expression SQL renvoyant la date de début de période (YYYY-MM-DD)
+    """
+    if granularity == "week":
+        # Lundi de la semaine : dimanche suivant (ou même jour) moins 6 jours
+        return func.date(column, "weekday 0", "-6 days")
+    if granularity == "month":
+        return func.strftime("%Y-%m-01", column)
+    return func.date(column)
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """
+    Sélectionne les points à conserver avec l'algorithme LTTB
+    (Largest-Triangle-Three-Buckets), qui préserve les pics de la série.
+
+    Args:
+        xs: Abscisses (croissantes)
+        ys: Ordonnées
+        threshold: Nombre maximum de points à conserver (>= 3)
+
+    Returns:
+        Indices des points conservés, dans l'ordre
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    indices = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Moyenne du bucket suivant (troisième sommet du triangle)
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        # Point du bucket courant formant le plus grand triangle
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs(
+                (xs[a] - avg_x) * (ys[j] - ys[a])
+                - (xs[a] - xs[j]) * (avg_y - ys[a])
+            )
+            if area > best_area:
+                best, best_area = j, area
+
+        indices.append(best)
+        a = best
+
+    indices.append(n - 1)
+    return indices
+
+
+def _downsample(points: List[Dict[str, Any]], ys: List[int], max_points: Optional[int]) -> List[Dict[str, Any]]:
+    """
+    Réduit une série de points à max_points en conservant les pics.
+
+    Args:
+        points: Points de la série
+        ys: Valeurs numériques associées aux points
+        max_points: Nombre maximum de points (None pour ne pas réduire)
+
+    Returns:
+        Points conservés
+    """
+    if not max_points or len(points) <= max_points:
+        return points
+
+    xs = [date.fromisoformat(p["date"]).toordinal() for p in points]
+    return [points[i] for i in lttb_indices(xs, ys, max_points)]
+
+
+def get_bucketed_charts_data(
+    db: Session,
+    granularity: str = "day",
+    max_points: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Récupère les données de graphiques regroupées par période.
+
+    Le regroupement est effectué en SQL sur la table daily_stats (un agrégat
+    par date de saisie), puis chaque série est réduite à max_points par LTTB, ce qui borne la taille
+    de la réponse quel que soit le volume de la table.
+
+    Args:
+        db: Session de base de données
+        granularity: Granularité ("day", "week" ou "month")
+        max_points: Nombre maximum de points par série
+
+    Returns:
+        Dictionnaire contenant les moyennes globales et les séries par période
+    """
+    bucket = bucket_expr(DailyStats.jour, granularity).label("bucket")
+    rows = (
+        db.query(
+            bucket,
+            func.sum(DailyStats.nombre_entrees),
+            func.sum(DailyStats.somme_arrivee_minutes),
+            func.sum(DailyStats.somme_depart_minutes),
+            func.sum(DailyStats.somme_pause_minutes),
+        )
+        .group_by(bucket)
+        .order_by(bucket)
+        .all()
+    )
+
+    result = {
+        "granularite": granularity,
+        "moyennes": {
+            "arrivee": "00:00",
+            "depart": "00:00",
+            "pause_minutes": 0
+        },
+        "arrivee": [],
+        "depart": [],
+        "pause": []
+    }
+
+    if not rows:
+        return result
+
+    arrivee_data, depart_data, pause_data = [], [], []
+    arrivees, departs, pauses = [], [], []
+    total_count = total_arrivee = total_depart = total_pause = 0
+
+    for jour, count, somme_arrivee, somme_depart, somme_pause in rows:
+        somme_arrivee, somme_depart, somme_pause = int(somme_arrivee), int(somme_depart), int(somme_pause)
+        total_count += count
+        total_arrivee += somme_arrivee
+        total_depart += somme_depart
+        total_pause += somme_pause
+
+        arrivees.append(somme_arrivee // count)
+        departs.append(somme_depart // count)
+        pauses.append(somme_pause // count)
+
+        arrivee_data.append({
+            "date": jour,
+            "heure_debut": format_minutes(arrivees[-1]),
+            "nombre": count
+        })
+        depart_data.append({
+            "date": jour,
+            "heure_depart": format_minutes(departs[-1]),
+            "nombre": count
+        })
+        pause_data.append({
+            "date": jour,
+            "duree_pause": pauses[-1],
+            "nombre": count
+        })
+
+    result["moyennes"] = {
+        "arrivee": minutes_to_time(total_arrivee // total_count).strftime("%H:%M"),
+        "depart": minutes_to_time(total_depart // total_count).strftime("%H:%M"),
+        "pause_minutes": total_pause // total_count
+    }
+    result["arrivee"] = _downsample(arrivee_data, arrivees, max_points)
+    result["depart"] = _downsample(depart_data, departs, max_points)
+    result["pause"] = _downsample(pause_data, pauses, max_points)
+
+    return result
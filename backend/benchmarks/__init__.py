@@ -0,0 +1,3 @@
+"""
+Benchmarks de performance pour le backend.
+"""
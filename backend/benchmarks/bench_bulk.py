@@ -0,0 +1,76 @@
+"""
+Benchmark de l'ingestion en masse : POST /schedules/bulk contre des POST unitaires.
+
+Usage (depuis le répertoire backend/):
+    python -m benchmarks.bench_bulk
+    python -m benchmarks.bench_bulk --rows 100000 --single-rows 1000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.main import app
+from app.models.config import Config
+from benchmarks.payloads import schedule_payloads
+
+
+def _client(path: str) -> TestClient:
+    """Crée un client de test sur une base SQLite dédiée."""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = session_factory()
+    db.add(Config(id=1, duree_travail_heures=7, duree_travail_minutes=10, seuil_pause_minutes=45))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--single-rows", type=int, default=1_000,
+                        help="Nombre de POST unitaires mesurés (extrapolé à --rows)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        client = _client(os.path.join(tmpdir, "single.db"))
+        t0 = time.perf_counter()
+        for item in schedule_payloads(args.single_rows):
+            client.post("/api/schedules/", json=item)
+        single = time.perf_counter() - t0
+        print(f"POST unitaires : {args.single_rows} lignes en {single:.2f} s "
+              f"(~{single / args.single_rows * args.rows:.0f} s pour {args.rows})")
+
+        client = _client(os.path.join(tmpdir, "bulk.db"))
+        body = "\n".join(json.dumps(item) for item in schedule_payloads(args.rows))
+        t0 = time.perf_counter()
+        response = client.post(
+            "/api/schedules/bulk",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        bulk = time.perf_counter() - t0
+        print(f"POST /bulk     : {response.json()['inserted']} lignes en {bulk:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
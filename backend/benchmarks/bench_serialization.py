@@ -0,0 +1,83 @@
+"""
+Benchmark de sérialisation : chemin validé (ScheduleResponse) contre chemin
+rapide (?fast=true, tuples Core + orjson) pour /schedules et /statistics/charts.
+
+Usage (depuis le répertoire backend/):
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --rows 50000 --limit 1000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.main import app
+from app.models.config import Config
+from app.services import schedule_service
+from benchmarks.payloads import schedule_payloads
+
+
+def _median_ms(client: TestClient, url: str, params: dict, repeat: int) -> float:
+    """Latence médiane d'une requête GET, en millisecondes."""
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        response = client.get(url, params=params)
+        timings.append((time.perf_counter() - t0) * 1000)
+        assert response.status_code == 200
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmpdir, 'bench.db')}",
+            connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        db = session_factory()
+        db.add(Config(id=1, duree_travail_heures=7, duree_travail_minutes=10, seuil_pause_minutes=45))
+        db.commit()
+        schedule_service.create_schedules_bulk(db, enumerate(schedule_payloads(args.rows)))
+        db.close()
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+
+        cases = [
+            (f"GET /schedules?limit={args.limit}", "/api/schedules/", {"limit": args.limit}),
+            (f"GET /statistics/charts ({args.rows} points)", "/api/statistics/charts", {}),
+        ]
+
+        print(f"{'requête':<40} | {'validé (ms)':>11} | {'rapide (ms)':>11} | {'gain':>5}")
+        print("-" * 76)
+        for label, url, params in cases:
+            normal = _median_ms(client, url, params, args.repeat)
+            fast = _median_ms(client, url, {**params, "fast": True}, args.repeat)
+            print(f"{label:<40} | {normal:>11.1f} | {fast:>11.1f} | {normal / fast:>4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark de GET /statistics : latence et mémoire selon la taille de la table.
+
+Usage (depuis le répertoire backend/):
+    python -m benchmarks.bench_statistics
+    python -m benchmarks.bench_statistics --sizes 1000 100000 --compare
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, time as dtime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.schedule import Schedule
+from app.services import daily_stats_service, schedule_service, statistics_service
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+CHUNK_SIZE = 50_000
+
+
+def _generate_rows(count: int):
+    """Génère des horaires aléatoires mais réalistes."""
+    rng = random.Random(42)
+    start = datetime(2015, 1, 1, 8, 0, 0)
+    for i in range(count):
+        debut = rng.randint(7 * 60, 9 * 60)
+        pause_debut = rng.randint(11 * 60 + 30, 12 * 60 + 30)
+        pause_fin = pause_debut + rng.randint(30, 75)
+        depart = debut + 7 * 60 + 10 + (pause_fin - pause_debut)
+        row = {
+            "date_saisie": start + timedelta(minutes=i * 10),
+            "heure_debut": dtime(debut // 60, debut % 60),
+            "heure_debut_pause": dtime(pause_debut // 60, pause_debut % 60),
+            "heure_fin_pause": dtime(pause_fin // 60, pause_fin % 60),
+            "heure_depart_calculee": dtime(depart // 60, depart % 60),
+        }
+        row.update(schedule_service.minute_columns(
+            row["heure_debut"], row["heure_debut_pause"], row["heure_fin_pause"], row["heure_depart_calculee"]
+        ))
+        yield row
+
+
+def _populate(engine, count: int) -> None:
+    """Remplit la table schedules par lots puis construit daily_stats."""
+    chunk = []
+    with engine.begin() as conn:
+        for row in _generate_rows(count):
+            chunk.append(row)
+            if len(chunk) >= CHUNK_SIZE:
+                conn.execute(insert(Schedule), chunk)
+                chunk = []
+        if chunk:
+            conn.execute(insert(Schedule), chunk)
+
+    db = sessionmaker(bind=engine)()
+    try:
+        daily_stats_service.rebuild(db)
+    finally:
+        db.close()
+
+
+def _legacy_statistics(db):
+    """Ancienne implémentation : chargement de toutes les lignes ORM."""
+    schedules = db.query(Schedule).all()
+    total = 0
+    for schedule in schedules:
+        total += statistics_service.time_to_minutes(schedule.heure_debut)
+    return total
+
+
+def _measure(func, session_factory, repeat: int):
+    """Retourne (latence médiane en ms, pic mémoire en Ko)."""
+    timings = []
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            t0 = time.perf_counter()
+            func(db)
+            timings.append((time.perf_counter() - t0) * 1000)
+        finally:
+            db.close()
+
+    db = session_factory()
+    try:
+        tracemalloc.start()
+        func(db)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        db.close()
+
+    return statistics.median(timings), peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--compare", action="store_true",
+                        help="Mesure aussi l'ancienne implémentation (lente au-delà de 100k)")
+    args = parser.parse_args()
+
+    print(f"{'lignes':>10} | {'impl':>8} | {'latence (ms)':>12} | {'pic mémoire (Ko)':>16}")
+    print("-" * 56)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in args.sizes:
+            engine = create_engine(f"sqlite:///{os.path.join(tmpdir, f'bench_{size}.db')}")
+            Base.metadata.create_all(bind=engine)
+            _populate(engine, size)
+            session_factory = sessionmaker(bind=engine)
+
+            latency, peak = _measure(statistics_service.get_statistics, session_factory, args.repeat)
+            print(f"{size:>10} | {'sql':>8} | {latency:>12.1f} | {peak:>16.1f}")
+
+            if args.compare:
+                latency, peak = _measure(_legacy_statistics, session_factory, 1)
+                print(f"{size:>10} | {'legacy':>8} | {latency:>12.1f} | {peak:>16.1f}")
+
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
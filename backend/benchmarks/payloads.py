@@ -0,0 +1,27 @@
+"""
+Données partagées par les benchmarks du backend.
+"""
+
+import random
+
+
+def schedule_payloads(count: int):
+    """
+    Génère des horaires aléatoires (reproductibles) au format de l'API.
+
+    Args:
+        count: Nombre d'horaires à générer
+
+    Yields:
+        Dict avec heure_debut, heure_debut_pause et heure_fin_pause (HH:MM)
+    """
+    rng = random.Random(42)
+    for _ in range(count):
+        debut = rng.randint(7 * 60, 9 * 60)
+        pause_debut = rng.randint(11 * 60 + 30, 12 * 60 + 30)
+        pause_fin = pause_debut + rng.randint(30, 75)
+        yield {
+            "heure_debut": f"{debut // 60:02d}:{debut % 60:02d}",
+            "heure_debut_pause": f"{pause_debut // 60:02d}:{pause_debut % 60:02d}",
+            "heure_fin_pause": f"{pause_fin // 60:02d}:{pause_fin % 60:02d}",
+        }
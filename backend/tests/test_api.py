@@ -15,7 +15,8 @@ SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Créer les tables de test
+# Créer les tables de test (repartir d'un schéma vierge à chaque session)
+Base.metadata.drop_all(bind=engine)
 Base.metadata.create_all(bind=engine)
 
 
@@ -104,3 +105,444 @@ def test_get_config():
     data = response.json()
     assert "duree_travail_heures" in data
     assert "duree_travail_minutes" in data
+
+
+def test_get_statistics_matches_rows():
+    """Test que l'agrégation SQL donne les mêmes moyennes qu'un calcul ligne à ligne."""
+    from datetime import time
+    from app.models.schedule import Schedule
+    from app.schemas.schedule import ScheduleCreate
+    from app.services import schedule_service
+    from app.services.statistics_service import time_to_minutes, calculer_duree_pause
+
+    db = TestingSessionLocal()
+    schedule_service.create_schedule(db, ScheduleCreate(
+        heure_debut=time(8, 10),
+        heure_debut_pause=time(12, 0),
+        heure_fin_pause=time(12, 50)
+    ))
+    schedules = db.query(Schedule).all()
+    db.close()
+
+    count = len(schedules)
+    total_arrivee = sum(time_to_minutes(s.heure_debut) for s in schedules)
+    total_pause = sum(calculer_duree_pause(s.heure_debut_pause, s.heure_fin_pause) for s in schedules)
+
+    response = client.get("/api/statistics/")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_entrees"] == count
+    assert data["moyenne_arrivee"] == f"{total_arrivee // count // 60:02d}:{total_arrivee // count % 60:02d}"
+    assert data["moyenne_pause_minutes"] == total_pause // count
+
+
+def test_get_charts_data_bucketed():
+    """Test du regroupement par période et de la limite de points."""
+    response = client.get("/api/statistics/charts", params={"granularity": "month", "max_points": 3})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["granularite"] == "month"
+    assert "moyennes" in data
+    assert len(data["arrivee"]) <= 3
+    for point in data["arrivee"]:
+        assert point["date"].endswith("-01")
+        assert "moyenne" not in point
+
+
+def test_get_charts_data_invalid_granularity():
+    """Test du rejet d'une granularité inconnue."""
+    response = client.get("/api/statistics/charts", params={"granularity": "year"})
+    assert response.status_code == 422
+
+
+def test_lttb_keeps_peaks():
+    """Test que la réduction LTTB conserve les extrémités et les pics."""
+    from app.services.statistics_service import lttb_indices
+
+    xs = list(range(100))
+    ys = [0] * 100
+    ys[37] = 500
+    indices = lttb_indices(xs, ys, 10)
+    assert len(indices) == 10
+    assert indices[0] == 0 and indices[-1] == 99
+    assert 37 in indices
+
+
+def test_daily_stats_follow_schedule_writes():
+    """Test que daily_stats reste cohérente après création, modification et suppression."""
+    from app.models.daily_stats import DailyStats
+    from app.services import daily_stats_service
+
+    def snapshot():
+        db = TestingSessionLocal()
+        rows = {
+            (d.jour, d.nombre_entrees, d.somme_arrivee_minutes, d.somme_depart_minutes, d.somme_pause_minutes)
+            for d in db.query(DailyStats).all()
+        }
+        db.close()
+        return rows
+
+    created = client.post(
+        "/api/schedules/",
+        json={"heure_debut": "07:30:00", "heure_debut_pause": "12:00:00", "heure_fin_pause": "13:00:00"}
+    ).json()
+    client.put(f"/api/schedules/{created['id']}", json={"heure_fin_pause": "12:30:00"})
+    other = client.post(
+        "/api/schedules/",
+        json={"heure_debut": "09:00:00", "heure_debut_pause": "12:15:00", "heure_fin_pause": "12:45:00"}
+    ).json()
+    client.delete(f"/api/schedules/{other['id']}")
+
+    incremental = snapshot()
+    db = TestingSessionLocal()
+    daily_stats_service.rebuild(db)
+    db.close()
+
+    assert incremental == snapshot()
+
+
+def test_list_schedules_keyset_pagination():
+    """Test que la pagination par curseur parcourt les mêmes horaires que skip/limit."""
+    for debut in ("07:00:00", "07:15:00", "07:45:00"):
+        client.post(
+            "/api/schedules/",
+            json={"heure_debut": debut, "heure_debut_pause": "12:00:00", "heure_fin_pause": "12:45:00"}
+        )
+
+    expected = [s["id"] for s in client.get("/api/schedules/", params={"limit": 1000}).json()]
+
+    response = client.get("/api/schedules/", params={"limit": 2})
+    seen = [s["id"] for s in response.json()]
+    while "x-next-cursor" in response.headers:
+        response = client.get(
+            "/api/schedules/",
+            params={"limit": 2, "after": response.headers["x-next-cursor"]}
+        )
+        assert response.status_code == 200
+        seen.extend(s["id"] for s in response.json())
+
+    assert seen == expected
+
+
+def test_list_schedules_invalid_cursor():
+    """Test du rejet d'un curseur invalide."""
+    response = client.get("/api/schedules/", params={"after": "pas-un-curseur"})
+    assert response.status_code == 400
+
+
+def test_create_schedules_bulk_json():
+    """Test de la création en masse depuis un tableau JSON avec erreurs par ligne."""
+    response = client.post(
+        "/api/schedules/bulk",
+        json=[
+            {"heure_debut": "08:00", "heure_debut_pause": "12:00", "heure_fin_pause": "12:45",
+             "date_saisie": "2023-03-01T08:01:00"},
+            {"heure_debut": "25:00", "heure_debut_pause": "12:00", "heure_fin_pause": "12:45"},
+            {"heure_debut": "08:30", "heure_debut_pause": "12:00", "heure_fin_pause": "13:00",
+             "date_saisie": "2023-03-01T08:31:00"},
+        ]
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["inserted"] == 2
+    assert [error["index"] for error in data["errors"]] == [1]
+
+    charts = client.get("/api/statistics/charts", params={"granularity": "day"}).json()
+    jour = next(point for point in charts["depart"] if point["date"] == "2023-03-01")
+    assert jour["nombre"] == 2
+    # (15:55 + 16:40) / 2
+    assert jour["heure_depart"] == "16:17"
+
+
+def test_create_schedules_bulk_ndjson():
+    """Test de la création en masse depuis du NDJSON."""
+    body = "\n".join([
+        '{"heure_debut": "08:00", "heure_debut_pause": "12:00", "heure_fin_pause": "12:45"}',
+        "pas du json",
+        "",
+        '{"heure_debut": "09:00", "heure_debut_pause": "12:30", "heure_fin_pause": "13:00"}',
+    ])
+    response = client.post(
+        "/api/schedules/bulk",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["inserted"] == 2
+    assert [error["index"] for error in data["errors"]] == [1]
+
+
+def test_create_schedules_bulk_invalid_body():
+    """Test du rejet d'un corps qui n'est ni un tableau JSON ni du NDJSON."""
+    response = client.post("/api/schedules/bulk", content="{pas du json", headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
+    response = client.post("/api/schedules/bulk", json={"heure_debut": "08:00"})
+    assert response.status_code == 400
+
+
+def _update_config_from_other_worker(**values):
+    """Simule un autre worker : modification directe en base, sur ses propres connexions."""
+    other_engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    with other_engine.begin() as conn:
+        conn.execute(Config.__table__.update().values(**values, version=Config.version + 1))
+    other_engine.dispose()
+
+
+def test_config_cache_invalidated_by_update():
+    """Test que la mise à jour de la configuration invalide le cache local."""
+    client.post("/api/config/reset")
+    created = client.post(
+        "/api/schedules/",
+        json={"heure_debut": "08:00:00", "heure_debut_pause": "12:00:00", "heure_fin_pause": "12:45:00"}
+    ).json()
+    assert created["heure_depart_calculee"] == "15:55:00"
+
+    client.put("/api/config/", json={"duree_travail_heures": 8, "duree_travail_minutes": 0})
+    created = client.post(
+        "/api/schedules/",
+        json={"heure_debut": "08:00:00", "heure_debut_pause": "12:00:00", "heure_fin_pause": "12:45:00"}
+    ).json()
+    assert created["heure_depart_calculee"] == "16:45:00"
+
+    response = client.post("/api/config/reset")
+    assert response.json()["duree_travail_heures"] == 7
+
+
+def test_config_cache_sees_other_worker_changes():
+    """Test qu'une modification faite par un autre processus est vue dès la lecture suivante."""
+    assert client.get("/api/config/").json()["seuil_pause_minutes"] == 45
+    _update_config_from_other_worker(seuil_pause_minutes=30)
+
+    assert client.get("/api/config/").json()["seuil_pause_minutes"] == 30
+    client.post("/api/config/reset")
+
+
+def test_config_cache_no_query_on_write():
+    """Test qu'une création d'horaire servie par le cache ne lit pas la table config."""
+    from sqlalchemy import event
+
+    payload = {"heure_debut": "08:00:00", "heure_debut_pause": "12:00:00", "heure_fin_pause": "12:45:00"}
+    assert client.post("/api/schedules/", json=payload).status_code == 201
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert client.post("/api/schedules/", json=payload).status_code == 201
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert statements
+    assert not [s for s in statements if "config" in s.lower()]
+
+    # Une modification par un autre worker est vue sans délai
+    _update_config_from_other_worker(duree_travail_heures=8, duree_travail_minutes=0)
+    assert client.post("/api/schedules/", json=payload).json()["heure_depart_calculee"] == "16:45:00"
+    client.post("/api/config/reset")
+
+
+def test_config_cache_ttl_staleness_window(monkeypatch):
+    """Test qu'avec un délai de cache, seules les modifications des autres processus attendent."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "CONFIG_CACHE_TTL_SECONDS", 3600)
+    client.post("/api/config/reset")
+    assert client.get("/api/config/").json()["seuil_pause_minutes"] == 45
+
+    # Modification par l'API de ce processus : visible à la lecture suivante
+    client.put("/api/config/", json={"seuil_pause_minutes": 50})
+    assert client.get("/api/config/").json()["seuil_pause_minutes"] == 50
+
+    # Modification par un autre worker : invisible tant que le délai n'est pas écoulé
+    _update_config_from_other_worker(seuil_pause_minutes=30)
+    assert client.get("/api/config/").json()["seuil_pause_minutes"] == 50
+
+    monkeypatch.setattr(settings, "CONFIG_CACHE_TTL_SECONDS", 0)
+    assert client.get("/api/config/").json()["seuil_pause_minutes"] == 30
+    client.post("/api/config/reset")
+
+
+def test_export_schedules_csv():
+    """Test de l'export CSV au format historique, filtré par date."""
+    client.post(
+        "/api/schedules/bulk",
+        json=[
+            {"heure_debut": "08:00", "heure_debut_pause": "12:00", "heure_fin_pause": "12:45",
+             "date_saisie": "2022-06-01T08:30:15"},
+            {"heure_debut": "08:15", "heure_debut_pause": "12:15", "heure_fin_pause": "13:00",
+             "date_saisie": "2022-06-02T08:31:22"},
+        ]
+    )
+
+    response = client.get("/api/schedules/export", params={"format": "csv", "from": "2022-06-02", "to": "2022-06-02"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.splitlines()
+    assert lines == [
+        "Date de saisie,Heure début,Heure début pause,Heure fin pause,Heure départ calculée",
+        "2022-06-02 08:31:22,08:15,12:15,13:00,16:10",
+    ]
+
+
+def test_export_schedules_ndjson():
+    """Test de l'export NDJSON complet."""
+    import json
+
+    response = client.get("/api/schedules/export", params={"format": "ndjson"})
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    total = client.get("/api/statistics/").json()["total_entrees"]
+    assert len(rows) == total
+    assert {"date_saisie", "heure_debut", "heure_depart_calculee"} <= rows[0].keys()
+
+
+def test_import_legacy_csv():
+    """Test de l'import du CSV historique : doublons ignorés et reprise."""
+    contenu = (
+        "Date de saisie,Heure début,Heure début pause,Heure fin pause,Heure départ calculée\r\n"
+        "2021-11-01 08:30:15,08:00,12:00,12:45,15:55\r\n"
+        "2021-11-02 08:31:22,08:15,12:15,13:00,16:10\r\n"
+        "2021-11-03 pas une date,07:45,12:00,12:50,15:45\r\n"
+    )
+
+    response = client.post(
+        "/api/schedules/import",
+        files={"file": ("horaires.csv", contenu.encode("utf-8"), "text/csv")}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["inserted"] == 2
+    assert data["error_count"] == 1
+    assert data["errors"][0]["ligne"] == 4
+
+    # Le fichier a grandi : seules les nouvelles lignes sont traitées
+    contenu += "2021-11-04 08:30:10,08:30,12:30,13:15,16:25\r\n"
+    response = client.post(
+        "/api/schedules/import",
+        files={"file": ("horaires.csv", contenu.encode("utf-8"), "text/csv")}
+    )
+    data = response.json()
+    assert data["resumed"] == 3
+    assert data["inserted"] == 1
+
+    # Un autre fichier contenant les mêmes horaires : doublons ignorés
+    response = client.post(
+        "/api/schedules/import",
+        files={"file": ("copie.csv", contenu.encode("utf-8"), "text/csv")}
+    )
+    data = response.json()
+    assert data["inserted"] == 0
+    assert data["duplicates"] == 3
+
+
+def test_legacy_csv_strict_formats():
+    """Test que l'import applique les formats stricts de l'application historique."""
+    import pytest
+    from app.services.legacy_csv import parse_row
+
+    ligne = {
+        "Date de saisie": "2021-11-01 08:30:15",
+        "Heure début": "8:05",
+        "Heure début pause": "12:00",
+        "Heure fin pause": "12:45",
+        "Heure départ calculée": "15:55",
+    }
+    assert parse_row(ligne)["heure_debut"].strftime("%H:%M") == "08:05"
+
+    for colonne, valeur in [
+        ("Date de saisie", "2021-11-01T08:30:15"),
+        ("Date de saisie", "2021-11-01"),
+        ("Date de saisie", "2021-11-01 08:30"),
+        ("Heure début", "08:00:00"),
+        ("Heure début", "24:00"),
+    ]:
+        with pytest.raises(ValueError):
+            parse_row({**ligne, colonne: valeur})
+
+
+def test_stored_minute_columns_follow_updates():
+    """Test que la durée de pause stockée suit la modification d'un horaire."""
+    created = client.post(
+        "/api/schedules/",
+        json={"heure_debut": "08:00:00", "heure_debut_pause": "12:00:00", "heure_fin_pause": "12:45:00"}
+    ).json()
+    assert created["duree_pause_minutes"] == 45
+
+    updated = client.put(f"/api/schedules/{created['id']}", json={"heure_fin_pause": "13:10:00"}).json()
+    assert updated["duree_pause_minutes"] == 70
+
+    from app.models.schedule import Schedule
+    db = TestingSessionLocal()
+    schedule = db.query(Schedule).filter(Schedule.id == created["id"]).first()
+    assert schedule.fin_pause_minutes == 13 * 60 + 10
+    assert schedule.depart_minutes == 8 * 60 + 7 * 60 + 10 + 70
+    db.close()
+
+
+def test_rebuild_daily_stats_old_schema(tmp_path, monkeypatch):
+    """Test de rebuild-daily-stats sur une base antérieure aux colonnes en minutes."""
+    import argparse
+    from sqlalchemy import text
+    from app import cli, database
+    from app.models.daily_stats import DailyStats
+    from app.models.schedule import Schedule
+
+    old_engine = create_engine(f"sqlite:///{tmp_path / 'ancienne.db'}", connect_args={"check_same_thread": False})
+    OldSession = sessionmaker(autocommit=False, autoflush=False, bind=old_engine)
+    with old_engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE schedules (id INTEGER PRIMARY KEY, date_saisie DATETIME NOT NULL, "
+            "heure_debut TIME NOT NULL, heure_debut_pause TIME NOT NULL, heure_fin_pause TIME NOT NULL, "
+            "heure_depart_calculee TIME NOT NULL, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+        ))
+        for jour, debut, fin_pause, depart in [(1, "08:00", "12:45", "15:55"), (1, "09:00", "12:30", "16:40"), (2, "08:30", "13:00", "16:40")]:
+            conn.execute(text(
+                "INSERT INTO schedules (date_saisie, heure_debut, heure_debut_pause, heure_fin_pause, "
+                "heure_depart_calculee, created_at, updated_at) VALUES "
+                f"('2021-11-0{jour} 08:30:00.000000', '{debut}:00.000000', '12:00:00.000000', "
+                f"'{fin_pause}:00.000000', '{depart}:00.000000', '2021-11-01 00:00:00.000000', "
+                "'2021-11-01 00:00:00.000000')"
+            ))
+
+    monkeypatch.setattr(database, "engine", old_engine)
+    monkeypatch.setattr(database, "SessionLocal", OldSession)
+    monkeypatch.setattr(cli, "SessionLocal", OldSession)
+    cli.rebuild_daily_stats(argparse.Namespace())
+
+    db = OldSession()
+    stats = {s.jour.day: s for s in db.query(DailyStats).all()}
+    assert {jour: s.nombre_entrees for jour, s in stats.items()} == {1: 2, 2: 1}
+    assert stats[1].somme_arrivee_minutes == 8 * 60 + 9 * 60
+    assert stats[1].somme_pause_minutes == 45 + 30
+    assert stats[2].somme_depart_minutes == 16 * 60 + 40
+
+    schedules = db.query(Schedule).order_by(Schedule.id).all()
+    assert [s.duree_pause_minutes for s in schedules] == [45, 30, 60]
+    assert {s.updated_at.isoformat() for s in schedules} == {"2021-11-01T00:00:00"}
+    db.close()
+
+
+def test_list_schedules_fast_path_matches():
+    """Test que le chemin rapide renvoie le même contenu que le chemin validé."""
+    params = {"limit": 3}
+    normal = client.get("/api/schedules/", params=params)
+    fast = client.get("/api/schedules/", params={**params, "fast": True})
+    assert fast.status_code == 200
+    assert fast.json() == normal.json()
+    assert fast.headers.get("x-next-cursor") == normal.headers.get("x-next-cursor")
+
+    after = {"limit": 3, "after": normal.headers["x-next-cursor"]}
+    assert client.get("/api/schedules/", params={**after, "fast": True}).json() == \
+        client.get("/api/schedules/", params=after).json()
+
+
+def test_get_charts_data_fast_path_matches():
+    """Test que le chemin rapide des graphiques renvoie le même contenu."""
+    for params in ({}, {"granularity": "week", "max_points": 5}):
+        normal = client.get("/api/statistics/charts", params=params).json()
+        fast = client.get("/api/statistics/charts", params={**params, "fast": True}).json()
+        assert fast == normal
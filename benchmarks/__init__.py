@@ -0,0 +1 @@
+"""Benchmarks du package calcule_Heure (scripts, hors suite de tests)."""
@@ -0,0 +1,52 @@
+"""
+Benchmark du stockage binaire: chargement et moyennes depuis horaires.csv
+(ScheduleFrame.from_csv) contre le fichier binaire projeté en mémoire
+(BinaryStore.load_frame), avec la taille des deux fichiers.
+
+Usage (depuis la racine du dépôt):
+    python -m benchmarks.bench_binary_store
+    python -m benchmarks.bench_binary_store --rows 5000000
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from calcule_Heure.binary_store import BinaryStore, convertir_binaire_en_csv, convertir_csv_en_binaire
+from calcule_Heure.frame import ScheduleFrame
+from benchmarks.bench_frame import chrono
+from benchmarks.bench_records import generer_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "horaires.csv"
+        binary_path = Path(tmp) / "horaires.bin"
+        generer_csv(csv_path, args.rows)
+        print(f"{args.rows} entrées")
+
+        chrono("conversion CSV -> binaire", lambda: convertir_csv_en_binaire(csv_path, binary_path))
+        print(f"    CSV     {csv_path.stat().st_size / 2**20:8.1f} Mo")
+        print(f"    binaire {binary_path.stat().st_size / 2**20:8.1f} Mo")
+
+        depuis_csv = chrono(
+            "CSV: from_csv() + moyennes",
+            lambda: ScheduleFrame.from_csv(csv_path).moyennes(),
+        )
+        depuis_binaire = chrono(
+            "binaire: load_frame() + moyennes",
+            lambda: BinaryStore(binary_path).load_frame().moyennes(),
+        )
+        assert depuis_csv == depuis_binaire
+
+        chrono(
+            "conversion binaire -> CSV",
+            lambda: convertir_binaire_en_csv(binary_path, Path(tmp) / "export.csv"),
+        )
+
+
+if __name__ == "__main__":
+    main()
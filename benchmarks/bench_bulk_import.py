@@ -0,0 +1,63 @@
+"""
+Benchmark d'import: saisies ajoutées une à une (add_schedule) contre import
+groupé (add_schedules -> CSVHandler.write_many).
+
+Usage (depuis la racine du dépôt):
+    python -m benchmarks.bench_bulk_import
+    python -m benchmarks.bench_bulk_import --rows 20000
+"""
+import argparse
+import random
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from calcule_Heure.add_data import ScheduleManager
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.timecodec import format_time
+from benchmarks.bench_frame import chrono
+
+
+def saisies(rows: int):
+    """Une année d'équipe synthétique: (début, début pause, fin pause, date)."""
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1, 8, 30)
+    result = []
+    for i in range(rows):
+        pause = rng.randint(11 * 60 + 30, 13 * 60)
+        result.append((
+            format_time(rng.randint(7 * 60, 9 * 60)),
+            format_time(pause),
+            format_time(pause + rng.randint(30, 75)),
+            start + timedelta(minutes=i),
+        ))
+    return result
+
+
+def manager_sur(path: Path) -> ScheduleManager:
+    """ScheduleManager écrivant dans `path` plutôt que dans horaires.csv."""
+    manager = ScheduleManager()
+    manager.csv_handler = CSVHandler(path)
+    return manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20 * 250)
+    args = parser.parse_args()
+    data = saisies(args.rows)
+    print(f"{args.rows} saisies")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        unitaire = manager_sur(Path(tmp) / "unitaire.csv")
+        chrono(
+            "add_schedule() ligne à ligne",
+            lambda: [unitaire.add_schedule(*row[:3]) for row in data],
+        )
+        groupe = manager_sur(Path(tmp) / "groupe.csv")
+        resultat = chrono("add_schedules() groupé", lambda: groupe.add_schedules(data))
+        assert resultat["inserted"] == args.rows and not resultat["errors"]
+
+
+if __name__ == "__main__":
+    main()
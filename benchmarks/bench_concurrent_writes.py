@@ -0,0 +1,86 @@
+"""
+Benchmark d'écritures concurrentes durables: un fsync par ligne contre
+validation groupée (CSVHandler(group_commit=True)).
+
+Usage (depuis la racine du dépôt):
+    python -m benchmarks.bench_concurrent_writes
+    python -m benchmarks.bench_concurrent_writes --threads 32 --writes 50
+"""
+import argparse
+import csv
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from calcule_Heure.constants import CSV_HEADERS
+from calcule_Heure.csv_handler import CSVHandler
+from benchmarks.bench_frame import chrono
+
+
+class _FsyncParLigne(CSVHandler):
+    """Référence: chaque écriture est synchronisée individuellement."""
+
+    def _append(self, lignes, sync):
+        super()._append(lignes, sync=True)
+
+
+def en_parallele(handler: CSVHandler, threads: int, writes: int) -> None:
+    """`threads` écrivains appelant chacun `writes` fois handler.write()."""
+    def ecrivain():
+        for _ in range(writes):
+            handler.write("08:00", "12:00", "13:00", "17:00")
+
+    workers = [threading.Thread(target=ecrivain) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def compter_fsync(fn) -> int:
+    """Exécute fn en comptant les appels à os.fsync."""
+    calls = [0]
+    original = os.fsync
+
+    def fsync(fd):
+        calls[0] += 1
+        original(fd)
+
+    os.fsync = fsync
+    try:
+        fn()
+    finally:
+        os.fsync = original
+    return calls[0]
+
+
+def verifier(path: Path, expected: int) -> None:
+    """Un seul en-tête et aucune ligne entrelacée."""
+    rows = list(csv.reader(path.open(newline="", encoding="utf-8")))
+    assert rows[0] == CSV_HEADERS and rows.count(CSV_HEADERS) == 1
+    assert len(rows) == expected + 1 and all(row[1:] == ["08:00", "12:00", "13:00", "17:00"] for row in rows[1:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=25)
+    args = parser.parse_args()
+    total = args.threads * args.writes
+    print(f"{args.threads} threads x {args.writes} écritures")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, handler in (
+            ("fsync par ligne", _FsyncParLigne(Path(tmp) / "unitaire.csv")),
+            ("validation groupée", CSVHandler(Path(tmp) / "groupe.csv", group_commit=True)),
+        ):
+            fsyncs = compter_fsync(
+                lambda: chrono(label, lambda: en_parallele(handler, args.threads, args.writes))
+            )
+            verifier(handler.file_path, total)
+            print(f"    {fsyncs} fsync pour {total} écritures")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark du cache de données de l'interface: coût d'une réexécution de
+l'onglet d'analyse (horaires, moyennes, tableau) sans cache, puis avec
+cache à données inchangées.
+
+Usage (depuis la racine du dépôt):
+    python -m benchmarks.bench_data_cache
+    python -m benchmarks.bench_data_cache --rows 200000
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from calcule_Heure.colcul import calculer_moyennes
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.data_cache import charger_horaires, charger_moyennes, memoriser
+from benchmarks.bench_frame import chrono
+from benchmarks.bench_records import generer_csv
+
+
+def tableau(frame):
+    """Tableau affiché par app.py (même construction pandas)."""
+    frame = frame.valid()
+    return pd.DataFrame({
+        "horodatage": pd.to_datetime(frame.horodatage, unit="s"),
+        "debut": frame.debut,
+        "depart": frame.depart,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "horaires.csv"
+        generer_csv(path, args.rows)
+        print(f"{args.rows} entrées")
+        # Même état de départ pour les deux variantes: mois terminés archivés,
+        # fichier annexe des statistiques créé
+        CSVHandler(path).rotate_segments()
+        calculer_moyennes(path)
+
+        def sans_cache():
+            frame = CSVHandler(path).load_frame()
+            return calculer_moyennes(path), tableau(frame)
+
+        def avec_cache():
+            frame = charger_horaires(path)
+            return charger_moyennes(path), memoriser("tableau", lambda: tableau(frame), path)
+
+        chrono("réexécution sans cache", sans_cache)
+        chrono("première exécution avec cache", avec_cache)
+        for _ in range(3):
+            chrono("réexécution avec cache", avec_cache)
+
+
+if __name__ == "__main__":
+    main()
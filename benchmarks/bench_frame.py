@@ -0,0 +1,51 @@
+"""
+Benchmark du ScheduleFrame: chargement en colonnes NumPy et moyennes
+vectorisées, comparés au calcul ligne à ligne sur iter_records().
+
+Usage (depuis la racine du dépôt):
+    python -m benchmarks.bench_frame
+    python -m benchmarks.bench_frame --rows 2000000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from calcule_Heure.colcul import StatisticsCalculator
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.frame import ScheduleFrame
+from benchmarks.bench_records import generer_csv
+
+
+def chrono(label: str, fn):
+    """Exécute fn, affiche sa durée et retourne son résultat."""
+    t0 = time.perf_counter()
+    result = fn()
+    print(f"{label:<40} {(time.perf_counter() - t0) * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "horaires.csv"
+        generer_csv(path, args.rows)
+        print(f"{args.rows} entrées")
+
+        frame = chrono("ScheduleFrame.from_csv()", lambda: ScheduleFrame.from_csv(path))
+        vectorise = chrono(
+            "moyennes vectorisées (frame)",
+            lambda: StatisticsCalculator.calculate_averages(frame),
+        )
+        ligne = chrono(
+            "moyennes ligne à ligne (iter_records)",
+            lambda: StatisticsCalculator.calculate_averages(CSVHandler(path).iter_records()),
+        )
+        assert vectorise == ligne
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark du rendu des graphiques: figures pyplot rastérisées à chaque
+affichage (ancien chemin de st.pyplot), rendu parallèle sans interface,
+puis affichage répété servi par le cache des rendus, et construction des
+spécifications Vega-Lite rendues par le navigateur. Grâce à la réduction
+des séries (GRAPH_MAX_POINTS), les durées de rendu varient peu avec --rows.
+
+Usage (depuis la racine du dépôt):
+    python -m benchmarks.bench_graphiques
+    python -m benchmarks.bench_graphiques --rows 200000
+"""
+import argparse
+import io
+import json
+import tempfile
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+
+from calcule_Heure.colcul import calculer_moyennes
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.graphique import generer_graphiques, rendre_graphiques, specs_vega_lite
+from benchmarks.bench_frame import chrono
+from benchmarks.bench_records import generer_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "horaires.csv"
+        generer_csv(path, args.rows)
+        frame = CSVHandler(path, rotation=False).load_frame()
+        depart_moy, _, arrivee_moy = calculer_moyennes(frame)
+        print(f"{args.rows} entrées")
+
+        def pyplot():
+            for fig in generer_graphiques(frame, depart_moy, arrivee_moy):
+                fig.savefig(io.BytesIO(), format="png")
+                plt.close(fig)
+
+        chrono("pyplot + rastérisation (par affichage)", pyplot)
+        # Le premier rendu démarre les processus du pool (une fois par processus)
+        chrono("premier rendu (démarrage du pool)",
+               lambda: rendre_graphiques(frame, depart_moy, arrivee_moy, dossier=Path(tmp) / "amorce"))
+        cache = Path(tmp) / "cache"
+        chrono("rendu parallèle (cache vide)", lambda: rendre_graphiques(frame, depart_moy, arrivee_moy, dossier=cache))
+        for _ in range(3):
+            chrono("affichage répété (cache)", lambda: rendre_graphiques(frame, depart_moy, arrivee_moy, dossier=cache))
+
+        specs = chrono("spécifications Vega-Lite (par affichage)",
+                       lambda: [json.dumps(spec) for spec in specs_vega_lite(frame, depart_moy, arrivee_moy)])
+        print(f"taille des spécifications: {sum(map(len, specs)) / 1024:.1f} Ko")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark du temps d'import: package, saisie en ligne de commande, main.py
+et graphique, chacun dans un interpréteur neuf, avec les modules lourds
+(numpy, matplotlib, pandas) effectivement chargés.
+
+Usage (depuis la racine du dépôt):
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --repeat 10
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+RACINE = Path(__file__).resolve().parent.parent
+LOURDS = ("numpy", "matplotlib", "pandas")
+
+CIBLES = [
+    ("interpréteur seul", "pass"),
+    ("import calcule_Heure", "import calcule_Heure"),
+    ("saisie (add_data)", "import calcule_Heure.add_data"),
+    ("main.py (avant le menu)", "import main"),
+    ("graphique", "import calcule_Heure.graphique"),
+    ("pile de tracé (pyplot)", "import matplotlib.pyplot"),
+]
+
+MESURE = """
+import json, sys, time
+t0 = time.perf_counter()
+{instruction}
+duree = time.perf_counter() - t0
+print(json.dumps([duree, [m for m in {lourds!r} if m in sys.modules]]))
+"""
+
+
+def mesurer(instruction: str) -> tuple:
+    """Importe dans un interpréteur neuf; retourne (durée, modules lourds chargés)."""
+    sortie = subprocess.run(
+        [sys.executable, "-c", MESURE.format(instruction=instruction, lourds=LOURDS)],
+        cwd=RACINE, capture_output=True, text=True, check=True,
+    ).stdout
+    duree, lourds = json.loads(sortie.splitlines()[-1])
+    return duree, lourds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, instruction in CIBLES:
+        mesures = [mesurer(instruction) for _ in range(args.repeat)]
+        duree = min(d for d, _ in mesures)
+        lourds = ", ".join(mesures[0][1]) or "-"
+        print(f"{label:<40} {duree * 1000:9.1f} ms   lourds: {lourds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark de lecture par période: CSVHandler.read_range() (index des dates
++ mmap) contre un filtrage de iter_records(), pour les 30 derniers jours
+d'historiques de tailles croissantes (une entrée par heure).
+
+Usage (depuis la racine du dépôt):
+    python -m benchmarks.bench_read_range
+    python -m benchmarks.bench_read_range --years 1 10 50
+"""
+import argparse
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.date_index import DateIndex
+from benchmarks.bench_frame import chrono
+from benchmarks.bench_records import generer_csv
+
+
+def moyenne_ms(fn, repeat: int = 20) -> float:
+    """Durée moyenne d'un appel en millisecondes."""
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=float, nargs="+", default=[1 / 12, 1, 10])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for years in args.years:
+            rows = int(years * 365 * 24)
+            path = Path(tmp) / f"horaires_{rows}.csv"
+            generer_csv(path, rows)
+            handler = CSVHandler(path)
+            end = max(r.date_saisie for r in handler.iter_records()) + timedelta(seconds=1)
+            start = end - timedelta(days=30)
+            print(f"{rows} entrées ({years:g} an(s))")
+
+            chrono("    construction de l'index", lambda: DateIndex(path).update())
+            attendu = [r for r in handler.iter_records() if start <= r.date_saisie < end]
+            assert handler.read_range(start, end) == attendu
+
+            complet = moyenne_ms(
+                lambda: [r for r in handler.iter_records() if start <= r.date_saisie < end],
+                repeat=3,
+            )
+            indexe = moyenne_ms(lambda: handler.read_range(start, end))
+            print(f"    {'iter_records() filtré':<36} {complet:9.1f} ms")
+            print(f"    {'read_range() 30 jours':<36} {indexe:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
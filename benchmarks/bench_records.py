@@ -0,0 +1,76 @@
+"""
+Benchmark de lecture : CSVHandler.read() (dictionnaires DictReader, heures
+re-parsées par chaque consommateur) contre CSVHandler.iter_records().
+
+Usage (depuis la racine du dépôt):
+    python -m benchmarks.bench_records
+    python -m benchmarks.bench_records --rows 500000
+"""
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from calcule_Heure.colcul import StatisticsCalculator
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.timecodec import format_datetime, format_time, to_timestamp
+
+
+def generer_csv(path: Path, rows: int) -> None:
+    """Écrit un historique synthétique de `rows` entrées."""
+    rng = random.Random(42)
+    start = to_timestamp(datetime(2000, 1, 1, 8, 30))
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("Date de saisie,Heure début,Heure début pause,Heure fin pause,Heure départ calculée\r\n")
+        for i in range(rows):
+            debut = rng.randint(7 * 60, 9 * 60)
+            pause = rng.randint(11 * 60 + 30, 13 * 60)
+            fin = pause + rng.randint(30, 75)
+            depart = debut + 430 + (fin - pause)
+            f.write(
+                f"{format_datetime(start + i * 3600)},"
+                f"{format_time(debut)},{format_time(pause)},"
+                f"{format_time(fin)},{format_time(depart)}\r\n"
+            )
+
+
+def mesurer(label: str, fn) -> None:
+    """Affiche la durée et le pic mémoire d'un appel (mesurés séparément)."""
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {elapsed * 1000:9.1f} ms   pic {peak / 2**20:8.1f} Mo")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "horaires.csv"
+        generer_csv(path, args.rows)
+        handler = CSVHandler(path)
+        print(f"{args.rows} entrées")
+
+        mesurer("read() -> liste de dict", handler.read)
+        mesurer("list(iter_records())", lambda: list(handler.iter_records()))
+        mesurer(
+            "moyennes sur read()",
+            lambda: StatisticsCalculator.calculate_averages(handler.read()),
+        )
+        mesurer(
+            "moyennes sur iter_records() (flux)",
+            lambda: StatisticsCalculator.calculate_averages(handler.iter_records()),
+        )
+
+
+if __name__ == "__main__":
+    main()
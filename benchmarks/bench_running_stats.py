@@ -0,0 +1,50 @@
+"""
+Benchmark des statistiques cumulées: moyennes recalculées sur tout le CSV
+contre mise à jour incrémentale du fichier annexe après un ajout.
+
+Usage (depuis la racine du dépôt):
+    python -m benchmarks.bench_running_stats
+    python -m benchmarks.bench_running_stats --rows 1000000
+"""
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from calcule_Heure.colcul import StatisticsCalculator
+from calcule_Heure.csv_handler import CSVHandler
+from benchmarks.bench_frame import chrono
+from benchmarks.bench_records import generer_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "horaires.csv"
+        generer_csv(path, args.rows)
+        print(f"{args.rows} entrées")
+
+        chrono(
+            "construction du fichier annexe",
+            lambda: StatisticsCalculator.calculate_file_averages(path),
+        )
+        chrono(
+            "écriture d'une entrée (+ annexe)",
+            lambda: CSVHandler(path, rotation=False).write("08:00", "12:00", "12:45", "15:55", datetime(2100, 1, 1)),
+        )
+        cumul = chrono(
+            "moyennes cumulées (incrémental)",
+            lambda: StatisticsCalculator.calculate_file_averages(path),
+        )
+        complet = chrono(
+            "moyennes sur relecture complète",
+            lambda: StatisticsCalculator.calculate_averages(CSVHandler(path).load_frame()),
+        )
+        assert cumul == complet
+
+
+if __name__ == "__main__":
+    main()
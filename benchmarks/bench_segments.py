@@ -0,0 +1,66 @@
+"""
+Benchmark de la rotation en segments mensuels compressés: place disque et
+coût des agrégats (moyennes sans fichier annexe, nombre d'entrées) sur un
+historique plat contre le même historique archivé.
+
+Usage (depuis la racine du dépôt):
+    python -m benchmarks.bench_segments
+    python -m benchmarks.bench_segments --years 20
+"""
+import argparse
+import shutil
+import tempfile
+from pathlib import Path
+
+from calcule_Heure.colcul import calculer_moyennes
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.running_stats import StatsSidecar
+from calcule_Heure.segments import SegmentArchive
+from calcule_Heure.timecodec import from_timestamp
+from benchmarks.bench_frame import chrono
+from benchmarks.bench_records import generer_csv
+
+
+def taille_mo(path: Path) -> float:
+    """Taille d'un fichier ou d'un répertoire en Mo."""
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.iterdir()) / 2**20
+    return path.stat().st_size / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=float, default=10)
+    args = parser.parse_args()
+    rows = int(args.years * 365 * 24)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plat = Path(tmp) / "plat.csv"
+        archive = Path(tmp) / "archive.csv"
+        generer_csv(plat, rows)
+        shutil.copy(plat, archive)
+        print(f"{rows} entrées ({args.years:g} ans, une par heure)")
+
+        dernier = max(r.horodatage for r in CSVHandler(plat, rotation=False).iter_records())
+        chrono(
+            "rotation initiale",
+            lambda: CSVHandler(archive).rotate_segments(now=from_timestamp(dernier)),
+        )
+        segments = SegmentArchive(archive)
+        print(f"    plat     {taille_mo(plat):8.1f} Mo")
+        print(
+            f"    archivé  {taille_mo(archive):8.1f} Mo courant + "
+            f"{taille_mo(segments.directory):.1f} Mo en {len(segments.segments())} segments"
+        )
+
+        moyennes = {}
+        for label, path in (("plat", plat), ("archivé", archive)):
+            moyennes[label] = chrono(f"moyennes ({label}, sans annexe)", lambda: calculer_moyennes(path))
+            StatsSidecar(path).path.unlink()
+            chrono(f"nombre d'entrées ({label})", lambda: CSVHandler(path).get_row_count())
+        # Annexe du fichier courant + résumés des segments == relecture du fichier plat
+        assert moyennes["plat"] == moyennes["archivé"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Micro-benchmarks du module timecodec contre datetime.strptime/strftime.
+
+Usage (depuis la racine du dépôt):
+    python -m benchmarks.bench_timecodec
+    python -m benchmarks.bench_timecodec --values 200000
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+
+from calcule_Heure.constants import DATETIME_FORMAT, TIME_FORMAT
+from calcule_Heure.timecodec import (
+    format_datetime,
+    format_time,
+    parse_datetime,
+    parse_time,
+    to_timestamp,
+)
+
+
+def chrono(fn, values) -> float:
+    """Durée (s) d'une application de fn à toutes les valeurs."""
+    t0 = time.perf_counter()
+    for value in values:
+        fn(value)
+    return time.perf_counter() - t0
+
+
+def comparer(label: str, reference, reference_values, rapide, rapide_values) -> None:
+    """Affiche les durées des deux variantes et le facteur de gain."""
+    t_ref = chrono(reference, reference_values)
+    t_fast = chrono(rapide, rapide_values)
+    print(
+        f"{label:<28} datetime {t_ref * 1000:8.0f} ms   "
+        f"timecodec {t_fast * 1000:7.0f} ms   x{t_ref / t_fast:5.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--values", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    minutes = [rng.randrange(24 * 60) for _ in range(args.values)]
+    start = to_timestamp(datetime(2015, 1, 1))
+    timestamps = [start + rng.randrange(10 * 365 * 86400) for _ in range(args.values)]
+    times = [format_time(m) for m in minutes]
+    datetimes = [format_datetime(ts) for ts in timestamps]
+    time_objects = [datetime.strptime(t, TIME_FORMAT) for t in times]
+    datetime_objects = [datetime.strptime(d, DATETIME_FORMAT) for d in datetimes]
+    print(f"{args.values} valeurs")
+
+    comparer(
+        "HH:MM -> minutes",
+        lambda t: datetime.strptime(t, TIME_FORMAT), times,
+        parse_time, times,
+    )
+    comparer(
+        "date de saisie -> secondes",
+        lambda d: datetime.strptime(d, DATETIME_FORMAT), datetimes,
+        parse_datetime, datetimes,
+    )
+    comparer(
+        "minutes -> HH:MM",
+        lambda t: t.strftime(TIME_FORMAT), time_objects,
+        format_time, minutes,
+    )
+    comparer(
+        "secondes -> date de saisie",
+        lambda d: d.strftime(DATETIME_FORMAT), datetime_objects,
+        format_datetime, timestamps,
+    )
+
+if __name__ == "__main__":
+    main()
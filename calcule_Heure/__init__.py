@@ -25,25 +25,35 @@ Utilisation:
     # Calculer les moyennes
     horaires = csv_handler.CSVHandler().read()
     moyennes = colcul.calculer_moyennes(horaires)
+
+Les sous-modules sont importés au premier accès (calcule_Heure.colcul...):
+importer le package ne charge ni numpy ni matplotlib.
 """
+import importlib
+from typing import Any, List
 
 __version__ = "2.0.0"
 __author__ = "maxg56"
 
-from calcule_Heure import (
-    config,
-    csv_handler,
-    add_data,
-    colcul,
-    constants,
-    exceptions
-)
-
 __all__ = [
     "config",
     "csv_handler",
     "add_data",
     "colcul",
+    "graphique",
     "constants",
     "exceptions"
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Importe un sous-module de __all__ au premier accès."""
+    if name in __all__:
+        module = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -3,13 +3,14 @@ Module pour l'ajout de données d'horaires.
 Gère la saisie et le calcul des horaires de travail.
 """
 import logging
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from calcule_Heure.config import ConfigurationManager
 from calcule_Heure.csv_handler import CSVHandler
-from calcule_Heure.constants import CSV_FILE, TIME_FORMAT, MSG_INVALID_TIME_FORMAT
+from calcule_Heure.constants import CSV_FILE, MSG_INVALID_TIME_FORMAT
 from calcule_Heure.exceptions import ValidationError, TimeFormatError
+from calcule_Heure.timecodec import format_time, parse_time
 
 logger = logging.getLogger(__name__)
 
@@ -17,10 +18,22 @@ logger = logging.getLogger(__name__)
 class ScheduleManager:
     """Gestionnaire de saisie et calcul des horaires."""
 
-    def __init__(self):
-        """Initialise le gestionnaire d'horaires."""
-        self.csv_handler = CSVHandler(CSV_FILE)
+    def __init__(self, group_commit: bool = False):
+        """
+        Initialise le gestionnaire d'horaires.
+
+        L'archivage des mois terminés suit la clé rotation_segments de la
+        configuration, lue à la création du gestionnaire.
+
+        Args:
+            group_commit: Regrouper les écritures concurrentes (voir CSVHandler)
+        """
         self.config = ConfigurationManager()
+        self.csv_handler = CSVHandler(
+            CSV_FILE,
+            group_commit=group_commit,
+            rotation=self.config.get_segment_rotation()
+        )
 
     @staticmethod
     def _validate_time(time_str: str) -> bool:
@@ -33,13 +46,29 @@ class ScheduleManager:
         Returns:
             True si le format est valide
 
+        Raises:
+            TimeFormatError: Si le format est invalide
+        """
+        ScheduleManager._parse_time(time_str)
+        return True
+
+    @staticmethod
+    def _parse_time(time_str: str) -> int:
+        """
+        Valide une heure et la convertit en minutes depuis minuit.
+
+        Args:
+            time_str: Heure au format HH:MM
+
+        Returns:
+            Minutes depuis minuit
+
         Raises:
             TimeFormatError: Si le format est invalide
         """
         try:
-            datetime.strptime(time_str, TIME_FORMAT)
-            return True
-        except ValueError:
+            return parse_time(time_str)
+        except TimeFormatError:
             raise TimeFormatError(MSG_INVALID_TIME_FORMAT)
 
     def _prompt_time(self, prompt_text: str) -> str:
@@ -60,6 +89,36 @@ class ScheduleManager:
             except TimeFormatError:
                 print(MSG_INVALID_TIME_FORMAT)
 
+    def _work_minutes(self) -> int:
+        """Durée de travail configurée, en minutes."""
+        return int(self.config.get_work_duration().total_seconds()) // 60
+
+    def _end_time(
+        self,
+        start_time: str,
+        break_start: str,
+        break_end: str,
+        work_minutes: int
+    ) -> Tuple[str, int]:
+        """
+        Calcule l'heure de départ pour une durée de travail donnée.
+
+        Returns:
+            Tuple (heure de départ HH:MM ramenée sur 24 h, durée de pause en minutes)
+
+        Raises:
+            TimeFormatError: Si une heure est mal formée
+            ValidationError: Si la pause se termine avant de commencer
+        """
+        # Valider et convertir les heures en minutes depuis minuit
+        start = self._parse_time(start_time)
+        break_minutes = self._parse_time(break_end) - self._parse_time(break_start)
+
+        if break_minutes < 0:
+            raise ValidationError("L'heure de fin de pause doit être après l'heure de début")
+
+        return format_time(start + work_minutes + break_minutes), break_minutes
+
     def calculate_end_time(
         self,
         start_time: str,
@@ -81,31 +140,14 @@ class ScheduleManager:
             ValidationError: Si les heures sont invalides
         """
         try:
-            # Valider les formats
-            self._validate_time(start_time)
-            self._validate_time(break_start)
-            self._validate_time(break_end)
-
-            # Parser les heures
-            start_dt = datetime.strptime(start_time, TIME_FORMAT)
-            break_start_dt = datetime.strptime(break_start, TIME_FORMAT)
-            break_end_dt = datetime.strptime(break_end, TIME_FORMAT)
-
-            # Calculer la durée de pause
-            break_duration = break_end_dt - break_start_dt
-
-            if break_duration.total_seconds() < 0:
-                raise ValidationError("L'heure de fin de pause doit être après l'heure de début")
-
             # Obtenir la durée de travail configurée
             work_duration = self.config.get_work_duration()
-
-            # Calculer l'heure de départ
-            end_dt = start_dt + work_duration + break_duration
-
-            result = end_dt.strftime(TIME_FORMAT)
+            result, break_minutes = self._end_time(
+                start_time, break_start, break_end,
+                int(work_duration.total_seconds()) // 60
+            )
             logger.info(
-                f"Calcul: {start_time} + {work_duration} + {break_duration} = {result}"
+                f"Calcul: {start_time} + {work_duration} + {timedelta(minutes=break_minutes)} = {result}"
             )
 
             return result
@@ -117,6 +159,48 @@ class ScheduleManager:
             logger.error(f"Erreur de calcul: {e}")
             raise ValidationError(f"Erreur lors du calcul: {e}")
 
+    def add_schedules(self, rows: Iterable[Sequence[Any]]) -> Dict[str, Any]:
+        """
+        Ajoute plusieurs horaires en une seule écriture.
+
+        La durée de travail est lue une fois pour tout le lot. Les lignes
+        invalides sont ignorées et signalées; les autres sont enregistrées,
+        heures normalisées sur deux chiffres ("8:5" devient "08:05").
+
+        Args:
+            rows: Tuples (heure_debut, debut_pause, fin_pause) au format HH:MM,
+                suivis éventuellement de la date de saisie (datetime)
+
+        Returns:
+            Dict avec "inserted" (nombre d'entrées écrites), "departs" (heures
+            de départ calculées, dans l'ordre des lignes valides) et "errors"
+            (liste de {"index", "detail"})
+
+        Raises:
+            CSVError: Si l'écriture échoue
+        """
+        work_minutes = self._work_minutes()
+        valid: List[Tuple[Any, ...]] = []
+        errors: List[Dict[str, Any]] = []
+
+        for index, row in enumerate(rows):
+            try:
+                start_time, break_start, break_end, *rest = row
+                times = [format_time(self._parse_time(value)) for value in (start_time, break_start, break_end)]
+                end_time, _ = self._end_time(*times, work_minutes)
+            except (ValueError, ValidationError) as e:
+                errors.append({"index": index, "detail": str(e)})
+                continue
+            valid.append((*times, end_time, *rest[:1]))
+
+        inserted = self.csv_handler.write_many(valid) if valid else 0
+        logger.info(f"Import groupé: {inserted} horaire(s) enregistré(s), {len(errors)} rejeté(s)")
+        return {
+            "inserted": inserted,
+            "departs": [row[3] for row in valid],
+            "errors": errors,
+        }
+
     def add_schedule(
         self,
         start_time: Optional[str] = None,
@@ -158,6 +242,25 @@ class ScheduleManager:
         return end_time
 
 
+_manager: Optional[ScheduleManager] = None
+
+
+def _get_manager() -> ScheduleManager:
+    """
+    Gestionnaire partagé par les appels successifs de ajouter_donnees().
+
+    Plusieurs sessions Streamlit l'utilisent depuis des threads différents:
+    leurs écritures sont regroupées et synchronisées ensemble. Sans fenêtre
+    d'attente (GROUP_COMMIT_WINDOW_SECONDS = 0), une saisie isolée est
+    écrite aussitôt; seules les saisies arrivées pendant un fsync en cours
+    sont regroupées.
+    """
+    global _manager
+    if _manager is None:
+        _manager = ScheduleManager(group_commit=True)
+    return _manager
+
+
 # Fonction de compatibilité pour l'ancien code
 def ajouter_donnees(
     heure_debut: Optional[str] = None,
@@ -175,5 +278,4 @@ def ajouter_donnees(
     Returns:
         Heure de départ calculée (HH:MM)
     """
-    manager = ScheduleManager()
-    return manager.add_schedule(heure_debut, heure_pause_debut, heure_pause_fin)
+    return _get_manager().add_schedule(heure_debut, heure_pause_debut, heure_pause_fin)
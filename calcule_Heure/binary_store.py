@@ -0,0 +1,258 @@
+"""
+Stockage binaire des horaires en enregistrements de taille fixe.
+
+Le fichier commence par un en-tête de 16 octets (signature, version, taille
+d'un enregistrement), suivi d'un enregistrement de 24 octets par entrée:
+horodatage (int64, secondes depuis 1970) puis arrivée, début de pause, fin
+de pause et départ (int32, minutes depuis minuit), en petit-boutiste. Ces
+colonnes sont celles de ScheduleFrame: le fichier est projeté en mémoire
+(np.memmap) et utilisé tel quel par les statistiques et les graphiques,
+sans décodage.
+
+horaires.csv reste le format d'échange: convertir_csv_en_binaire() et
+convertir_binaire_en_csv() passent de l'un à l'autre.
+"""
+import csv
+import logging
+import os
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, List, Sequence
+
+import numpy as np
+
+from calcule_Heure.constants import BINARY_FILE, CSV_FILE, CSV_HEADERS
+from calcule_Heure.csv_handler import CSVHandler, ScheduleRecord
+from calcule_Heure.exceptions import CSVError, StorageError
+from calcule_Heure.frame import COLUMNS, ScheduleFrame
+from calcule_Heure.locking import exclusive_lock
+from calcule_Heure.segments import SegmentArchive
+from calcule_Heure.storage import ScheduleStore
+from calcule_Heure.timecodec import parse_time, to_timestamp
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+RECORD_DTYPE = np.dtype([
+    ("horodatage", "<i8"),
+    ("debut", "<i4"),
+    ("debut_pause", "<i4"),
+    ("fin_pause", "<i4"),
+    ("depart", "<i4"),
+])
+_MAGIC = b"HORAIRES"
+_HEADER = struct.Struct("<8sII")
+HEADER_SIZE = _HEADER.size
+
+
+class BinaryStore(ScheduleStore):
+    """Horaires stockés en enregistrements binaires projetés en mémoire."""
+
+    def __init__(self, file_path: Path = BINARY_FILE):
+        """
+        Initialise le stockage binaire.
+
+        Args:
+            file_path: Chemin vers le fichier binaire
+        """
+        self.file_path = file_path
+
+    def exists(self) -> bool:
+        """Vérifie si le fichier binaire existe."""
+        return self.file_path.exists()
+
+    @staticmethod
+    def _check_header(f: BinaryIO) -> None:
+        """Vérifie l'en-tête d'un fichier non vide."""
+        f.seek(0)
+        magic, version, itemsize = _HEADER.unpack(f.read(HEADER_SIZE).ljust(HEADER_SIZE, b"\0"))
+        if magic != _MAGIC or version != FORMAT_VERSION or itemsize != RECORD_DTYPE.itemsize:
+            raise StorageError(f"Fichier binaire d'horaires non reconnu: {f.name}")
+
+    def load_frame(self) -> ScheduleFrame:
+        """
+        Projette le fichier en mémoire dans un ScheduleFrame.
+
+        Les colonnes du frame sont des vues sur le fichier: rien n'est copié
+        ni décodé. Un enregistrement incomplet en fin de fichier est ignoré.
+
+        Returns:
+            ScheduleFrame (vide si le fichier n'existe pas)
+
+        Raises:
+            StorageError: Si le fichier est illisible ou n'est pas un fichier d'horaires
+        """
+        if not self.file_path.exists():
+            logger.warning(f"Fichier binaire non trouvé: {self.file_path}")
+            return ScheduleFrame.empty()
+
+        try:
+            with open(self.file_path, 'rb') as f:
+                self._check_header(f)
+            count = (self.file_path.stat().st_size - HEADER_SIZE) // RECORD_DTYPE.itemsize
+            if count <= 0:
+                return ScheduleFrame.empty()
+            table = np.memmap(
+                self.file_path, dtype=RECORD_DTYPE, mode='r',
+                offset=HEADER_SIZE, shape=(count,)
+            )
+        except (IOError, ValueError) as e:
+            logger.error(f"Erreur de lecture du fichier binaire: {e}")
+            raise StorageError(f"Impossible de lire le fichier binaire: {e}")
+
+        logger.info(f"{count} entrées projetées depuis {self.file_path}")
+        return ScheduleFrame(*(table[name] for name in COLUMNS))
+
+    def iter_records(self) -> Iterator[ScheduleRecord]:
+        """Parcourt les entrées sous forme de ScheduleRecord."""
+        return iter(self.load_frame().records())
+
+    def read_range(self, start: datetime, end: datetime) -> List[ScheduleRecord]:
+        """
+        Entrées dont la date de saisie est dans [start, end[.
+
+        Le filtrage est vectorisé sur la colonne projetée en mémoire.
+
+        Args:
+            start: Début de période (inclus)
+            end: Fin de période (exclue)
+
+        Returns:
+            Entrées de la période, dans l'ordre du fichier
+        """
+        frame = self.load_frame()
+        low, high = to_timestamp(start), to_timestamp(end)
+        mask = (frame.horodatage >= low) & (frame.horodatage < high)
+        return list(ScheduleFrame(*(getattr(frame, name)[mask] for name in COLUMNS)).records())
+
+    @staticmethod
+    def _encode(rows: Iterable[Sequence[Any]]) -> np.ndarray:
+        """Convertit des tuples write_many() en enregistrements binaires."""
+        now = to_timestamp(datetime.now())
+        encoded = []
+        for start_time, break_start, break_end, end_time, *rest in rows:
+            timestamp = rest[0] if rest else None
+            encoded.append((
+                now if timestamp is None else to_timestamp(timestamp),
+                parse_time(start_time),
+                parse_time(break_start),
+                parse_time(break_end),
+                parse_time(end_time),
+            ))
+        return np.array(encoded, dtype=RECORD_DTYPE)
+
+    def write_many(self, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Ajoute plusieurs entrées en fin de fichier, sous verrou exclusif.
+
+        Args:
+            rows: Tuples (heure_debut, debut_pause, fin_pause, heure_depart)
+                au format HH:MM, suivis éventuellement de la date de saisie
+                (datetime; par défaut: maintenant)
+
+        Returns:
+            Nombre d'entrées écrites
+
+        Raises:
+            TimeFormatError: Si une heure est invalide
+            StorageError: Si l'écriture échoue
+        """
+        table = self._encode(rows)
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.file_path, 'a+b') as f:
+                with exclusive_lock(f):
+                    size = f.seek(0, os.SEEK_END)
+                    if size == 0:
+                        f.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, RECORD_DTYPE.itemsize))
+                    else:
+                        self._check_header(f)
+                        # Enregistrement incomplet (écriture interrompue): le retirer
+                        extra = (size - HEADER_SIZE) % RECORD_DTYPE.itemsize
+                        if extra:
+                            f.truncate(size - extra)
+                    f.write(table.tobytes())
+        except IOError as e:
+            logger.error(f"Erreur d'écriture du fichier binaire: {e}")
+            raise StorageError(f"Impossible d'écrire dans le fichier binaire: {e}")
+
+        logger.info(f"{len(table)} entrée(s) ajoutée(s) à {self.file_path}")
+        return len(table)
+
+
+def convertir_csv_en_binaire(csv_path: Path = CSV_FILE, binary_path: Path = BINARY_FILE) -> int:
+    """
+    Convertit un CSV d'horaires en fichier binaire (remplacé s'il existe).
+
+    Les mois archivés en segments sont repris; les lignes invalides non.
+
+    Args:
+        csv_path: CSV source
+        binary_path: Fichier binaire à écrire
+
+    Returns:
+        Nombre d'entrées converties
+
+    Raises:
+        CSVError: Si le CSV est absent ou illisible
+        StorageError: Si l'écriture échoue
+    """
+    if not csv_path.exists():
+        raise CSVError(f"Fichier CSV non trouvé: {csv_path}")
+    frame = CSVHandler(csv_path).load_frame().valid()
+    table = np.empty(len(frame), dtype=RECORD_DTYPE)
+    for name in COLUMNS:
+        table[name] = getattr(frame, name)
+
+    tmp_path = binary_path.with_name(f"{binary_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, RECORD_DTYPE.itemsize))
+            f.write(table.tobytes())
+        os.replace(tmp_path, binary_path)
+    except IOError as e:
+        tmp_path.unlink(missing_ok=True)
+        raise StorageError(f"Impossible d'écrire le fichier binaire: {e}")
+    logger.info(f"{len(table)} entrées converties de {csv_path} vers {binary_path}")
+    return len(table)
+
+
+def convertir_binaire_en_csv(binary_path: Path = BINARY_FILE, csv_path: Path = CSV_FILE) -> int:
+    """
+    Convertit un fichier binaire d'horaires en CSV (remplacé s'il existe).
+
+    Args:
+        binary_path: Fichier binaire source
+        csv_path: CSV à écrire, au format de CSVHandler
+
+    Returns:
+        Nombre d'entrées converties
+
+    Raises:
+        StorageError: Si le fichier binaire est absent ou illisible, si le CSV
+            a des segments archivés, ou si l'écriture échoue
+    """
+    if not binary_path.exists():
+        raise StorageError(f"Fichier binaire non trouvé: {binary_path}")
+    if SegmentArchive(csv_path).segments():
+        # Le nouveau fichier courant doublerait les lignes déjà archivées
+        raise StorageError(f"{csv_path} a des mois archivés en segments: choisissez un autre fichier CSV")
+    frame = BinaryStore(binary_path).load_frame()
+    try:
+        lignes = frame._format_bytes()
+    except ValueError as e:
+        raise StorageError(f"Conversion impossible: {e}")
+
+    tmp_path = csv_path.with_name(f"{csv_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow(CSV_HEADERS)
+        with open(tmp_path, 'ab') as f:
+            f.write(lignes)
+        os.replace(tmp_path, csv_path)
+    except IOError as e:
+        tmp_path.unlink(missing_ok=True)
+        raise StorageError(f"Impossible d'écrire le fichier CSV: {e}")
+    logger.info(f"{len(frame)} entrées converties de {binary_path} vers {csv_path}")
+    return len(frame)
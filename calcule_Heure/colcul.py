@@ -3,11 +3,17 @@ Module de calcul des moyennes pour l'application de gestion des horaires.
 Calcule les statistiques sur les horaires de travail.
 """
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple, Union
 
-from calcule_Heure.constants import TIME_FORMAT
-from calcule_Heure.exceptions import ValidationError
+from calcule_Heure.constants import BINARY_SUFFIX, CSV_FILE
+from calcule_Heure.csv_handler import ScheduleRecord
+from calcule_Heure.running_stats import StatsSidecar
+from calcule_Heure.segments import SegmentArchive
+from calcule_Heure.timecodec import format_duration
+
+if TYPE_CHECKING:
+    from calcule_Heure.frame import ScheduleFrame
 
 logger = logging.getLogger(__name__)
 
@@ -16,117 +22,118 @@ class StatisticsCalculator:
     """Calculateur de statistiques sur les horaires."""
 
     @staticmethod
-    def _parse_time(time_str: str) -> datetime:
-        """
-        Parse une chaîne de temps.
-
-        Args:
-            time_str: Temps au format HH:MM
-
-        Returns:
-            Objet datetime
-
-        Raises:
-            ValidationError: Si le format est invalide
-        """
-        try:
-            return datetime.strptime(time_str, TIME_FORMAT)
-        except ValueError as e:
-            raise ValidationError(f"Format de temps invalide '{time_str}': {e}")
-
-    @staticmethod
-    def _timedelta_to_str(td: timedelta) -> str:
+    def _minutes_to_str(minutes: float) -> str:
         """
-        Convertit un timedelta en chaîne HH:MM.
+        Convertit une durée en minutes (éventuellement fractionnaire) en chaîne HH:MM.
 
         Args:
-            td: timedelta à convertir
+            minutes: Durée en minutes
 
         Returns:
             Chaîne au format HH:MM
         """
-        total_seconds = int(td.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        return f"{hours:02d}:{minutes:02d}"
+        return format_duration(minutes)
 
     @classmethod
     def calculate_averages(
         cls,
-        schedules: List[Dict[str, str]]
+        schedules: Union["ScheduleFrame", Iterable[Union[ScheduleRecord, Dict[str, str]]]]
     ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """
         Calcule les moyennes des heures d'arrivée, de départ et de pause.
 
+        Les moyennes sont des réductions vectorisées sur un ScheduleFrame;
+        les autres entrées y sont converties au préalable.
+
         Args:
-            schedules: Liste de dictionnaires contenant les horaires
+            schedules: ScheduleFrame (ScheduleFrame.from_csv()), entrées
+                décodées (CSVHandler.iter_records()) ou, pour l'ancien code,
+                dictionnaires lus depuis le CSV
 
         Returns:
             Tuple (heure_depart_moy, duree_pause_moy, heure_arrivee_moy)
             ou (None, None, None) si aucune donnée valide
 
         """
-        if not schedules:
+        # Import local: numpy n'est chargé que pour les calculs vectorisés
+        from calcule_Heure.frame import ScheduleFrame
+
+        frame = schedules if isinstance(schedules, ScheduleFrame) else ScheduleFrame.from_records(schedules)
+
+        if len(frame) == 0:
             logger.warning("Aucun horaire à analyser")
             return None, None, None
 
-        total_start = timedelta()
-        total_end = timedelta()
-        total_break = timedelta()
-        valid_count = 0
+        moyennes = frame.moyennes()
+        if moyennes is None:
+            logger.warning("Aucune entrée valide trouvée")
+            return None, None, None
 
-        for schedule in schedules:
-            try:
-                # Parser les heures
-                start_time = cls._parse_time(schedule["Heure début"])
-                end_time = cls._parse_time(schedule["Heure départ calculée"])
-                break_start = cls._parse_time(schedule["Heure début pause"])
-                break_end = cls._parse_time(schedule["Heure fin pause"])
+        # Convertir en chaînes
+        avg_end_str, avg_break_str, avg_start_str = (cls._minutes_to_str(m) for m in moyennes)
 
-                # Accumuler les durées
-                total_start += timedelta(hours=start_time.hour, minutes=start_time.minute)
-                total_end += timedelta(hours=end_time.hour, minutes=end_time.minute)
-                total_break += (break_end - break_start)
+        logger.info(
+            f"Moyennes calculées sur {frame.nombre_valides} entrées: "
+            f"arrivée={avg_start_str}, départ={avg_end_str}, pause={avg_break_str}"
+        )
 
-                valid_count += 1
+        return avg_end_str, avg_break_str, avg_start_str
 
-            except (KeyError, ValidationError) as e:
-                logger.warning(f"Entrée invalide ignorée: {e}")
-                continue
+    @classmethod
+    def calculate_file_averages(
+        cls,
+        file_path: Path = CSV_FILE
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Calcule les moyennes d'un fichier CSV à partir de ses statistiques cumulées.
 
-        if valid_count == 0:
-            logger.warning("Aucune entrée valide trouvée")
-            return None, None, None
+        Seules les lignes ajoutées depuis le dernier calcul sont lues
+        (voir running_stats.StatsSidecar); les mois archivés comptent par
+        leurs résumés, sans décompression (voir segments). Un fichier binaire (BINARY_SUFFIX)
+        est projeté en mémoire et réduit directement.
 
-        # Calculer les moyennes
-        avg_start = total_start / valid_count
-        avg_end = total_end / valid_count
-        avg_break = total_break / valid_count
+        Args:
+            file_path: Chemin vers le fichier CSV ou binaire
 
-        # Convertir en chaînes
-        avg_start_str = cls._timedelta_to_str(avg_start)
-        avg_end_str = cls._timedelta_to_str(avg_end)
-        avg_break_str = cls._timedelta_to_str(avg_break)
+        Returns:
+            Tuple (heure_depart_moy, duree_pause_moy, heure_arrivee_moy)
+            ou (None, None, None) si aucune donnée valide
+        """
+        if file_path.suffix == BINARY_SUFFIX:
+            from calcule_Heure.binary_store import BinaryStore
+
+            return cls.calculate_averages(BinaryStore(file_path).load_frame())
 
+        stats = StatsSidecar(file_path).update()
+        stats.merge(SegmentArchive(file_path).stats())
+        moyennes = stats.moyennes()
+        if moyennes is None:
+            logger.warning("Aucune entrée valide trouvée")
+            return None, None, None
+
+        avg_end_str, avg_break_str, avg_start_str = (cls._minutes_to_str(m) for m in moyennes)
         logger.info(
-            f"Moyennes calculées sur {valid_count} entrées: "
+            f"Moyennes cumulées sur {stats.nombre} entrées: "
             f"arrivée={avg_start_str}, départ={avg_end_str}, pause={avg_break_str}"
         )
-
         return avg_end_str, avg_break_str, avg_start_str
 
 
 # Fonction de compatibilité pour l'ancien code
 def calculer_moyennes(
-    horaires: List[Dict[str, str]]
+    horaires: Union[str, Path, "ScheduleFrame", Iterable[Union[ScheduleRecord, Dict[str, str]]]]
 ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """
     Fonction de compatibilité - utilise StatisticsCalculator.calculate_averages()
 
     Args:
-        horaires: Liste de dictionnaires contenant les horaires
+        horaires: Chemin du fichier CSV (statistiques cumulées, mise à jour
+            incrémentale) ou binaire, ScheduleFrame, entrées décodées ou dictionnaires
+            contenant les horaires
 
     Returns:
         Tuple (heure_depart_moy, duree_pause_moy, heure_arrivee_moy)
     """
+    if isinstance(horaires, (str, Path)):
+        return StatisticsCalculator.calculate_file_averages(Path(horaires))
     return StatisticsCalculator.calculate_averages(horaires)
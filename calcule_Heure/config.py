@@ -6,13 +6,14 @@ import json
 import logging
 from datetime import timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 from calcule_Heure.constants import (
     CONFIG_FILE,
     DEFAULT_WORK_HOURS,
     DEFAULT_WORK_MINUTES,
     DEFAULT_BREAK_THRESHOLD_MINUTES,
+    DEFAULT_SEGMENT_ROTATION,
     TIME_FORMAT,
     DATETIME_FORMAT,
     MIN_WORK_HOURS,
@@ -22,6 +23,7 @@ from calcule_Heure.constants import (
     MIN_BREAK_MINUTES,
     MAX_BREAK_MINUTES
 )
+from calcule_Heure.data_cache import DataCache
 from calcule_Heure.exceptions import ConfigurationError, ValidationError
 
 # Configuration du logger
@@ -35,21 +37,64 @@ class ConfigurationManager:
         "duree_travail_heures": DEFAULT_WORK_HOURS,
         "duree_travail_minutes": DEFAULT_WORK_MINUTES,
         "seuil_pause_minutes": DEFAULT_BREAK_THRESHOLD_MINUTES,
+        "rotation_segments": DEFAULT_SEGMENT_ROTATION,
         "format_heure": TIME_FORMAT,
         "format_date": DATETIME_FORMAT
     }
 
+    # Cache partagé par le processus: (clé stat du fichier, configuration)
+    _cache: Optional[Tuple[Tuple[Any, ...], Dict[str, Any]]] = None
+
+    @staticmethod
+    def _cache_key() -> Tuple[Any, ...]:
+        """
+        Identifie l'état du fichier de configuration sur disque.
+
+        Returns:
+            Tuple (chemin, mtime, taille, inode), ou (chemin,) si absent
+        """
+        try:
+            stat = CONFIG_FILE.stat()
+        except FileNotFoundError:
+            return (str(CONFIG_FILE),)
+        return (str(CONFIG_FILE), stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Oublie la configuration en cache (relue au prochain appel de load())."""
+        cls._cache = None
+
     @classmethod
     def load(cls) -> Dict[str, Any]:
         """
         Charge la configuration depuis le fichier JSON.
 
+        La configuration est mise en cache pour le processus et n'est relue
+        que si la date de modification ou la taille du fichier change.
+
         Returns:
-            Dict contenant la configuration
+            Dict contenant la configuration (copie modifiable)
 
         Raises:
             ConfigurationError: Si la configuration ne peut pas être chargée
         """
+        key = cls._cache_key()
+        cached = cls._cache
+        if cached is not None and cached[0] == key:
+            return cached[1].copy()
+
+        config = cls._read()
+        cls._cache = (key, config)
+        return config.copy()
+
+    @classmethod
+    def _read(cls) -> Dict[str, Any]:
+        """
+        Lit et valide le fichier JSON, sans passer par le cache.
+
+        Returns:
+            Dict contenant la configuration
+        """
         if not CONFIG_FILE.exists():
             logger.info(f"Fichier de configuration non trouvé, utilisation des valeurs par défaut")
             return cls.DEFAULT_CONFIG.copy()
@@ -75,7 +120,9 @@ class ConfigurationManager:
     @classmethod
     def save(cls, config: Dict[str, Any]) -> None:
         """
-        Sauvegarde la configuration dans le fichier JSON.
+        Sauvegarde la configuration dans le fichier JSON et vide les caches
+        de la configuration et des données dérivées (update() et reset()
+        passent par cette méthode).
 
         Args:
             config: Dictionnaire de configuration à sauvegarder
@@ -97,6 +144,9 @@ class ConfigurationManager:
         except ValidationError as e:
             logger.error(f"Erreur de validation: {e}")
             raise
+        finally:
+            cls.clear_cache()
+            DataCache.invalidate()
 
     @staticmethod
     def _validate_config(config: Dict[str, Any]) -> None:
@@ -130,6 +180,10 @@ class ConfigurationManager:
                 f"Le seuil de pause doit être entre {MIN_BREAK_MINUTES} et {MAX_BREAK_MINUTES} minutes"
             )
 
+        # Validation de l'archivage des mois terminés
+        if not isinstance(config.get("rotation_segments", DEFAULT_SEGMENT_ROTATION), bool):
+            raise ValidationError("rotation_segments doit valoir true ou false")
+
     @classmethod
     def get_work_duration(cls) -> timedelta:
         """
@@ -155,6 +209,17 @@ class ConfigurationManager:
         config = cls.load()
         return config["seuil_pause_minutes"]
 
+    @classmethod
+    def get_segment_rotation(cls) -> bool:
+        """
+        Indique si les mois terminés sont archivés après chaque saisie.
+
+        Returns:
+            True si l'archivage automatique est activé
+        """
+        config = cls.load()
+        return config["rotation_segments"]
+
     @classmethod
     def get_time_format(cls) -> str:
         """
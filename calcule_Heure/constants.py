@@ -9,6 +9,29 @@ PROJECT_ROOT = Path(__file__).parent
 DATA_DIR = PROJECT_ROOT
 CONFIG_FILE = DATA_DIR / "config.json"
 CSV_FILE = DATA_DIR / "horaires.csv"
+# Stockage binaire optionnel (voir binary_store.py)
+BINARY_SUFFIX = ".bin"
+BINARY_FILE = DATA_DIR / f"horaires{BINARY_SUFFIX}"
+# Fichier annexe des statistiques cumulées, à côté du CSV (horaires.csv.stats.json)
+STATS_SIDECAR_SUFFIX = ".stats.json"
+
+# Index creux des dates de saisie (horaires.csv.index.json): une ligne indexée sur DATE_INDEX_STRIDE
+DATE_INDEX_SUFFIX = ".index.json"
+DATE_INDEX_STRIDE = 64
+
+# Segments mensuels compressés des mois terminés (horaires.csv.segments/)
+SEGMENTS_SUFFIX = ".segments"
+
+# Attente du meneur avant d'écrire un groupe (un seul fsync). À 0, un écrivain
+# seul écrit aussitôt; les lots arrivés pendant l'écriture et le fsync du
+# meneur forment le groupe suivant.
+GROUP_COMMIT_WINDOW_SECONDS = 0.0
+
+# Cache des graphiques rendus en PNG/SVG (voir graphique.rendre_graphiques)
+RENDER_CACHE_DIR = DATA_DIR / ".cache" / "graphiques"
+RENDER_CACHE_MAX_FILES = 60
+# Nombre maximal de points (ou barres) tracés par graphique (voir graphique.reduire_points)
+GRAPH_MAX_POINTS = 1000
 
 # Formats de date et heure
 TIME_FORMAT = "%H:%M"
@@ -19,6 +42,8 @@ DATE_FORMAT = "%Y-%m-%d"
 DEFAULT_WORK_HOURS = 7
 DEFAULT_WORK_MINUTES = 10
 DEFAULT_BREAK_THRESHOLD_MINUTES = 45
+# Archivage des mois terminés après chaque saisie (voir CSVHandler.rotate_segments)
+DEFAULT_SEGMENT_ROTATION = False
 
 # Headers CSV
 CSV_HEADERS = [
@@ -3,39 +3,191 @@ Gestionnaire de fichiers CSV pour l'application de gestion des horaires.
 Centralise toutes les opérations de lecture/écriture CSV.
 """
 import csv
+import io
 import logging
+import mmap
+import os
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import IO, TYPE_CHECKING, List, Dict, Any, Iterable, Iterator, NamedTuple, Optional, Sequence, TextIO
 from datetime import datetime
 
-from calcule_Heure.constants import CSV_FILE, CSV_HEADERS, DATETIME_FORMAT
-from calcule_Heure.exceptions import CSVError
+from calcule_Heure.constants import CSV_FILE, CSV_HEADERS, GROUP_COMMIT_WINDOW_SECONDS
+from calcule_Heure.csv_utils import header_positions, line_timestamp, write_atomic
+from calcule_Heure.data_cache import DataCache
+from calcule_Heure.exceptions import CSVError, ValidationError
+from calcule_Heure.locking import GroupCommit, exclusive_lock
+from calcule_Heure.storage import ScheduleStore
+from calcule_Heure.timecodec import (
+    format_datetime,
+    from_timestamp,
+    parse_datetime,
+    parse_time,
+    to_timestamp,
+)
+
+if TYPE_CHECKING:
+    from calcule_Heure.frame import ScheduleFrame
+    from calcule_Heure.segments import SegmentArchive
 
 logger = logging.getLogger(__name__)
 
+# Un regroupement par fichier, partagé par tous les CSVHandler du processus
+_group_commits: Dict[Path, GroupCommit] = {}
+_group_commits_lock = threading.Lock()
+
+
+def _group_commit_for(file_path: Path) -> GroupCommit:
+    """Regroupement des écritures associé à un fichier."""
+    key = file_path.resolve()
+    with _group_commits_lock:
+        if key not in _group_commits:
+            _group_commits[key] = GroupCommit(GROUP_COMMIT_WINDOW_SECONDS)
+        return _group_commits[key]
+
+
+def _is_current(f: IO[Any], file_path: Path) -> bool:
+    """Vérifie qu'un fichier ouvert est toujours celui présent à `file_path`."""
+    try:
+        current = os.stat(file_path)
+    except FileNotFoundError:
+        return False
+    opened = os.fstat(f.fileno())
+    return (opened.st_dev, opened.st_ino) == (current.st_dev, current.st_ino)
+
+
+def _encode_rows(rows: Iterable[Sequence[str]]) -> bytes:
+    """Formate des lignes comme csv.writer et les encode en UTF-8."""
+    buffer = io.StringIO(newline='')
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+
+def _write_all(f: IO[bytes], data: bytes) -> None:
+    """Écrit tous les octets dans un fichier non tamponné (write peut être partiel)."""
+    view = memoryview(data)
+    while view:
+        view = view[f.write(view):]
+
+
+class ScheduleRecord(NamedTuple):
+    """
+    Entrée du CSV déjà décodée.
+
+    L'horodatage est exprimé en secondes depuis le 1er janvier 1970 (heure
+    locale, sans fuseau) et les heures en minutes depuis minuit.
+    """
+
+    horodatage: int
+    debut: int
+    debut_pause: int
+    fin_pause: int
+    depart: int
+
+    @property
+    def date_saisie(self) -> datetime:
+        """Date et heure de saisie sous forme de datetime."""
+        return from_timestamp(self.horodatage)
+
+    @property
+    def duree_pause(self) -> int:
+        """Durée de la pause en minutes (peut être négative si incohérente)."""
+        return self.fin_pause - self.debut_pause
+
 
-class CSVHandler:
+def _build_record(values: Sequence[str]) -> ScheduleRecord:
+    """
+    Construit un ScheduleRecord à partir des cinq colonnes du CSV, dans l'ordre.
+
+    Raises:
+        ValueError: Si le nombre de colonnes est incorrect
+        TimeFormatError: Si une date ou une heure est mal formée
+    """
+    date_saisie, debut, debut_pause, fin_pause, depart = values
+    return ScheduleRecord(
+        parse_datetime(date_saisie),
+        parse_time(debut),
+        parse_time(debut_pause),
+        parse_time(fin_pause),
+        parse_time(depart),
+    )
+
+
+def parse_record(row: Dict[str, str]) -> ScheduleRecord:
+    """
+    Convertit une ligne lue par DictReader en ScheduleRecord.
+
+    Args:
+        row: Dictionnaire indexé par les en-têtes CSV
+
+    Returns:
+        Entrée décodée
+
+    Raises:
+        ValidationError: Si une colonne est absente ou mal formée
+    """
+    try:
+        return _build_record([row[header] for header in CSV_HEADERS])
+    except (KeyError, TypeError, ValueError, ValidationError) as e:
+        raise ValidationError(f"Entrée invalide {row!r}: {e}")
+
+
+class CSVHandler(ScheduleStore):
     """Gestionnaire pour les opérations CSV."""
 
-    def __init__(self, file_path: Path = CSV_FILE):
+    def __init__(self, file_path: Path = CSV_FILE, group_commit: bool = False, rotation: bool = False):
         """
         Initialise le gestionnaire CSV.
 
         Args:
             file_path: Chemin vers le fichier CSV
+            group_commit: Regrouper les écritures concurrentes du processus et
+                les rendre durables par un seul fsync par groupe
+                (voir locking.GroupCommit)
+            rotation: Archiver les mois terminés en segments compressés lors
+                des écritures (voir rotate_segments). Désactivé par défaut:
+                horaires.csv reste alors un fichier complet, lisible tel quel
+                par les autres outils (import du backend, conversions).
+                Activé pour les saisies par la clé rotation_segments de
+                config.json; "python main.py rotate" archive à la demande
         """
         self.file_path = file_path
+        self.group_commit = group_commit
+        self.rotation = rotation
+
+    def _archive(self) -> "SegmentArchive":
+        """Segments compressés des mois terminés."""
+        # Import local: segments dépend de ce module
+        from calcule_Heure.segments import SegmentArchive
+
+        return SegmentArchive(self.file_path)
 
     def read(self) -> List[Dict[str, str]]:
         """
         Lit les horaires depuis le fichier CSV.
 
+        Les lignes des segments archivés (décompressés pour l'occasion)
+        précèdent celles du fichier courant.
+
         Returns:
             Liste de dictionnaires contenant les horaires
 
         Raises:
             CSVError: Si la lecture échoue
         """
+        archive = self._archive()
+        data = []
+        try:
+            for entry in archive.segments():
+                text = archive.read_bytes(entry).decode('utf-8-sig')
+                data.extend(csv.DictReader(io.StringIO(text, newline='')))
+        except csv.Error as e:
+            logger.error(f"Erreur de format CSV: {e}")
+            raise CSVError(f"Format CSV invalide: {e}")
+        return data + self._read_file()
+
+    def _read_file(self) -> List[Dict[str, str]]:
+        """Lit les horaires du seul fichier CSV courant (voir read)."""
         if not self.file_path.exists():
             logger.warning(f"Fichier CSV non trouvé: {self.file_path}")
             return []
@@ -53,6 +205,149 @@ class CSVHandler:
             logger.error(f"Erreur de format CSV: {e}")
             raise CSVError(f"Format CSV invalide: {e}")
 
+    def iter_records(self) -> Iterator[ScheduleRecord]:
+        """
+        Parcourt le fichier CSV ligne à ligne en décodant chaque entrée.
+
+        Contrairement à read(), aucune liste n'est construite: les entrées
+        sont produites au fil de la lecture, heures déjà converties en
+        minutes. Les segments archivés sont parcourus en premier. Les lignes
+        invalides sont ignorées avec un avertissement.
+
+        Yields:
+            ScheduleRecord pour chaque ligne valide
+
+        Raises:
+            CSVError: Si la lecture échoue ou si une colonne attendue manque
+        """
+        archive = self._archive()
+        for entry in archive.segments():
+            text = archive.read_bytes(entry).decode('utf-8-sig')
+            yield from self._decode_records(io.StringIO(text, newline=''), entry["fichier"])
+
+        if not self.file_path.exists():
+            logger.warning(f"Fichier CSV non trouvé: {self.file_path}")
+            return
+
+        try:
+            with open(self.file_path, mode='r', encoding='utf-8', newline='') as f:
+                yield from self._decode_records(f, self.file_path.name)
+        except IOError as e:
+            logger.error(f"Erreur de lecture CSV: {e}")
+            raise CSVError(f"Impossible de lire le fichier CSV: {e}")
+
+    @staticmethod
+    def _decode_records(f: TextIO, source: str) -> Iterator[ScheduleRecord]:
+        """Décode les lignes d'un CSV d'horaires ouvert en mode texte."""
+        try:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            try:
+                positions = [header.index(name) for name in CSV_HEADERS]
+            except ValueError as e:
+                raise CSVError(f"En-tête CSV incomplet: {e}")
+
+            for line_number, row in enumerate(reader, start=2):
+                try:
+                    yield _build_record([row[i] for i in positions])
+                except (IndexError, ValueError, ValidationError) as e:
+                    logger.warning(f"Ligne {line_number} de {source} invalide ignorée: {e}")
+        except csv.Error as e:
+            logger.error(f"Erreur de format CSV: {e}")
+            raise CSVError(f"Format CSV invalide: {e}")
+
+    def load_frame(self) -> "ScheduleFrame":
+        """
+        Charge segments archivés et fichier courant en colonnes NumPy
+        (voir ScheduleFrame.from_csv).
+
+        Returns:
+            ScheduleFrame, lignes invalides masquées
+
+        Raises:
+            CSVError: Si la lecture échoue
+        """
+        # Import local: frame dépend de ce module
+        from calcule_Heure.frame import ScheduleFrame
+
+        archive = self._archive()
+        if not archive.segments():
+            return ScheduleFrame.from_csv(self.file_path)
+        return ScheduleFrame.concatenate([archive.load_frame(), ScheduleFrame.from_csv(self.file_path)])
+
+    def read_range(self, start: datetime, end: datetime) -> List[ScheduleRecord]:
+        """
+        Lit les entrées dont la date de saisie est dans [start, end[.
+
+        L'index des dates (date_index.DateIndex) donne la plage d'octets à
+        lire dans le fichier projeté en mémoire: le coût dépend de la taille
+        de la période, pas de celle du fichier. Si les dates du fichier ne
+        sont pas croissantes, tout le fichier est parcouru. Seuls les
+        segments archivés dont les dates recoupent la période sont
+        décompressés.
+
+        Args:
+            start: Début de période (inclus)
+            end: Fin de période (exclue)
+
+        Returns:
+            Entrées valides de la période, dans l'ordre du fichier
+
+        Raises:
+            CSVError: Si la lecture échoue
+        """
+        # Import local: date_index dépend de ce module
+        from calcule_Heure.date_index import DateIndex
+
+        low, high = to_timestamp(start), to_timestamp(end)
+        archive = self._archive()
+        entries = [
+            entry for entry in archive.segments()
+            if entry["debut"] is not None and entry["debut"] < high and entry["fin"] >= low
+        ]
+        records = []
+        if entries:
+            frame = archive.load_frame(entries).valid()
+            records = [r for r in frame.records() if low <= r.horodatage < high]
+
+        if not self.file_path.exists():
+            logger.warning(f"Fichier CSV non trouvé: {self.file_path}")
+            return records
+
+        span = DateIndex(self.file_path).locate(low, high)
+        if span is None:
+            logger.info("Dates de saisie non triées: lecture complète du fichier")
+            with open(self.file_path, mode='r', encoding='utf-8', newline='') as f:
+                return records + [
+                    r for r in self._decode_records(f, self.file_path.name)
+                    if low <= r.horodatage < high
+                ]
+
+        begin, stop = span
+        if begin == stop:
+            return records
+        try:
+            with open(self.file_path, mode='rb') as f:
+                header = f.readline().decode('utf-8-sig')
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    chunk = mm[begin:stop].decode('utf-8')
+        except (IOError, ValueError) as e:
+            logger.error(f"Erreur de lecture CSV: {e}")
+            raise CSVError(f"Impossible de lire le fichier CSV: {e}")
+
+        positions = [next(csv.reader([header])).index(name) for name in CSV_HEADERS]
+        for row in csv.reader(chunk.splitlines()):
+            try:
+                record = _build_record([row[i] for i in positions])
+            except (IndexError, ValueError, ValidationError):
+                continue
+            if low <= record.horodatage < high:
+                records.append(record)
+        logger.info(f"{len(records)} entrées lues entre {start} et {end}")
+        return records
+
     def write(
         self,
         start_time: str,
@@ -74,37 +369,217 @@ class CSVHandler:
         Raises:
             CSVError: Si l'écriture échoue
         """
-        if timestamp is None:
-            timestamp = datetime.now()
+        self.write_many([(start_time, break_start, break_end, end_time, timestamp)])
+        logger.info(f"Nouvelle entrée ajoutée: {start_time} -> {end_time}")
+
+    def write_many(self, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Ajoute plusieurs entrées au fichier CSV avec une seule ouverture.
+
+        L'ajout se fait sous verrou exclusif. En mode group_commit, l'appel ne
+        revient qu'une fois les lignes synchronisées sur disque avec celles des
+        autres écrivains concurrents.
+
+        Args:
+            rows: Tuples (heure_debut, debut_pause, fin_pause, heure_depart)
+                au format HH:MM, suivis éventuellement de la date de saisie
+                (datetime; par défaut: maintenant)
+
+        Returns:
+            Nombre d'entrées écrites
+
+        Raises:
+            CSVError: Si l'écriture échoue
+        """
+        now = format_datetime(to_timestamp(datetime.now()))
+        lignes = []
+        for start_time, break_start, break_end, end_time, *rest in rows:
+            timestamp = rest[0] if rest else None
+            lignes.append([
+                now if timestamp is None else format_datetime(to_timestamp(timestamp)),
+                start_time,
+                break_start,
+                break_end,
+                end_time
+            ])
+
+        if self.group_commit:
+            _group_commit_for(self.file_path).submit(lignes, self._flush_group)
+        else:
+            self._append(lignes, sync=False)
+            self._after_write()
 
-        file_exists = self.file_path.exists()
+        logger.info(f"{len(lignes)} entrée(s) ajoutée(s) à {self.file_path}")
+        return len(lignes)
+
+    def _flush_group(self, lignes: List[List[str]]) -> None:
+        """Écrit un groupe de lots concurrents avec un seul fsync (mode group_commit)."""
+        self._append(lignes, sync=True)
+        self._after_write()
+
+    def _after_write(self) -> None:
+        """Archive les mois terminés si besoin, met les fichiers annexes à jour et vide le cache des données."""
+        DataCache.invalidate()
+        if self.rotation and self._oldest_month_done():
+            try:
+                self.rotate_segments()
+            except CSVError as e:
+                logger.warning(f"Archivage des mois terminés reporté: {e}")
+        self._update_sidecars()
+
+    def _append(self, lignes: List[List[str]], sync: bool) -> None:
+        """
+        Ajoute des lignes déjà formatées sous verrou exclusif.
+
+        L'en-tête est écrit si le fichier est vide, vérification faite sous le
+        verrou: deux écrivains ne peuvent pas l'écrire tous les deux.
+        L'ajout est tout ou rien: les lignes sont encodées avant la prise du
+        verrou, et une écriture interrompue est retirée du fichier (voir
+        locking.GroupCommit).
+
+        Args:
+            lignes: Lignes CSV à écrire
+            sync: Forcer l'écriture sur disque (fsync) avant de libérer le verrou
+
+        Raises:
+            CSVError: Si une ligne n'est pas encodable ou si l'écriture échoue
+        """
+        header = _encode_rows([CSV_HEADERS])
+        try:
+            payload = _encode_rows(lignes)
+        except UnicodeEncodeError as e:
+            logger.error(f"Entrée non encodable en UTF-8: {e}")
+            raise CSVError(f"Entrée non encodable en UTF-8: {e}")
 
         try:
             # Créer le répertoire parent si nécessaire
             self.file_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(self.file_path, mode='a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
+            while True:
+                with open(self.file_path, mode='ab', buffering=0) as f:
+                    with exclusive_lock(f):
+                        if not _is_current(f, self.file_path):
+                            # Fichier remplacé par une rotation pendant l'attente du verrou
+                            continue
+                        size = f.seek(0, os.SEEK_END)
+                        try:
+                            # Écrire les headers si le fichier est nouveau (ou vide)
+                            _write_all(f, header + payload if size == 0 else payload)
+                            if sync:
+                                os.fsync(f.fileno())
+                        except IOError:
+                            # Retirer les lignes partiellement écrites
+                            f.truncate(size)
+                            raise
+                        if size == 0:
+                            logger.info(f"Fichier CSV créé: {self.file_path}")
+                        return
+
+        except IOError as e:
+            logger.error(f"Erreur d'écriture CSV: {e}")
+            raise CSVError(f"Impossible d'écrire dans le fichier CSV: {e}")
+
+    def _oldest_month_done(self) -> bool:
+        """Vérifie (sur la première ligne) si le fichier courant contient un mois terminé."""
+        # Import local: segments dépend de ce module
+        from calcule_Heure.segments import month_of
 
-                # Écrire les headers si le fichier est nouveau
-                if not file_exists:
-                    writer.writerow(CSV_HEADERS)
-                    logger.info(f"Fichier CSV créé: {self.file_path}")
+        try:
+            with open(self.file_path, mode='rb') as f:
+                positions, _ = header_positions(f)
+                line = f.readline()
+        except (IOError, CSVError):
+            return False
+        if not positions or not line.endswith(b"\n"):
+            return False
+        timestamp = line_timestamp(line, positions[0])
+        current = month_of(to_timestamp(datetime.now()))
+        return timestamp is not None and month_of(timestamp) < current
 
-                # Écrire la nouvelle entrée
-                writer.writerow([
-                    timestamp.strftime(DATETIME_FORMAT),
-                    start_time,
-                    break_start,
-                    break_end,
-                    end_time
-                ])
+    def rotate_segments(self, now: Optional[datetime] = None) -> int:
+        """
+        Déplace les lignes des mois terminés vers leurs segments compressés.
 
-                logger.info(f"Nouvelle entrée ajoutée: {start_time} -> {end_time}")
+        Sous le verrou du fichier courant, les lignes datées d'un mois
+        antérieur à celui de `now` sont ajoutées au segment de leur mois
+        (voir segments.SegmentArchive), puis le fichier courant est remplacé
+        par ses seules lignes restantes. Les segments sont écrits avant le
+        remplacement: une interruption peut dupliquer des lignes, jamais en
+        perdre. Avec CSVHandler(rotation=True), appelée automatiquement
+        après une écriture dès que la première ligne du fichier date d'un
+        mois terminé.
+
+        Args:
+            now: Date de référence (par défaut: maintenant)
+
+        Returns:
+            Nombre de lignes archivées
 
+        Raises:
+            CSVError: Si la lecture ou l'écriture échoue
+        """
+        # Import local: segments dépend de ce module
+        from calcule_Heure.segments import month_of
+
+        if not self.file_path.exists():
+            return 0
+        current = month_of(to_timestamp(now or datetime.now()))
+        try:
+            while True:
+                with open(self.file_path, mode='rb') as f:
+                    with exclusive_lock(f):
+                        if not _is_current(f, self.file_path):
+                            continue
+                        positions, header_size = header_positions(f)
+                        if not positions:
+                            return 0
+                        f.seek(0)
+                        header = f.read(header_size)
+
+                        anciennes: Dict[str, List[bytes]] = {}
+                        gardees = []
+                        for line in f:
+                            timestamp = line_timestamp(line, positions[0]) if line.endswith(b"\n") else None
+                            month = month_of(timestamp) if timestamp is not None else None
+                            if month is not None and month < current:
+                                anciennes.setdefault(month, []).append(line)
+                            else:
+                                gardees.append(line)
+                        if not anciennes:
+                            return 0
+
+                        self._archive().add(header, anciennes)
+                        write_atomic(self.file_path, header + b"".join(gardees))
+
+                        archived = sum(len(lines) for lines in anciennes.values())
+                        logger.info(
+                            f"{archived} ligne(s) de {len(anciennes)} mois terminé(s) archivée(s), "
+                            f"{len(gardees)} conservée(s) dans {self.file_path}"
+                        )
+                        return archived
         except IOError as e:
-            logger.error(f"Erreur d'écriture CSV: {e}")
-            raise CSVError(f"Impossible d'écrire dans le fichier CSV: {e}")
+            logger.error(f"Erreur lors de l'archivage des segments: {e}")
+            raise CSVError(f"Impossible d'archiver les mois terminés: {e}")
+
+    def _update_sidecars(self) -> None:
+        """
+        Reporte les lignes ajoutées dans les fichiers annexes (statistiques, index des dates).
+
+        Un fichier annexe n'est tenu à jour que s'il existe déjà (il est créé
+        au premier calcul de moyennes ou à la première lecture par période).
+        Un échec n'empêche pas l'écriture.
+        """
+        # Import local: running_stats et date_index dépendent de ce module
+        from calcule_Heure.date_index import DateIndex
+        from calcule_Heure.running_stats import StatsSidecar
+
+        for sidecar in (StatsSidecar(self.file_path), DateIndex(self.file_path)):
+            if not sidecar.exists():
+                continue
+            try:
+                sidecar.update()
+            except CSVError as e:
+                logger.warning(f"Fichier annexe {sidecar.path.name} non mis à jour: {e}")
 
     def exists(self) -> bool:
         """
@@ -119,12 +594,14 @@ class CSVHandler:
         """
         Retourne le nombre d'entrées dans le CSV.
 
+        Les segments archivés sont comptés d'après leurs résumés, sans
+        décompression.
+
         Returns:
             Nombre d'entrées
         """
         try:
-            data = self.read()
-            return len(data)
+            return self._archive().row_count() + len(self._read_file())
         except CSVError:
             return 0
 
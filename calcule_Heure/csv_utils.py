@@ -0,0 +1,93 @@
+"""
+Outils bas niveau sur les fichiers CSV d'horaires, partagés par les fichiers
+annexes (running_stats, date_index), l'archive des segments et CSVHandler.
+
+Ce module ne dépend que des constantes, des exceptions et de timecodec: il
+peut être importé par csv_handler sans import circulaire.
+"""
+import csv
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, List, Optional, Tuple
+
+from calcule_Heure.constants import CSV_HEADERS
+from calcule_Heure.exceptions import CSVError, TimeFormatError
+from calcule_Heure.timecodec import parse_datetime
+
+# Taille des blocs lus pour hacher un fichier
+CHUNK_BYTES = 1 << 20
+
+
+def fingerprint(f: BinaryIO, end: int, start: int = 0, h: Optional[Any] = None) -> Any:
+    """
+    Hache les octets [start, end[ d'un fichier.
+
+    L'empreinte d'un préfixe [0, offset[ se prolonge sans relecture: avec
+    `h` (empreinte de [0, start[), seuls les octets ajoutés sont lus.
+
+    Returns:
+        Objet de hachage SHA-256 (hexdigest() pour l'empreinte)
+    """
+    h = h if h is not None else hashlib.sha256()
+    f.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = f.read(min(CHUNK_BYTES, remaining))
+        if not chunk:
+            break
+        h.update(chunk)
+        remaining -= len(chunk)
+    return h
+
+
+def header_positions(f: BinaryIO) -> Tuple[List[int], int]:
+    """
+    Lit l'en-tête du CSV.
+
+    Returns:
+        Positions des colonnes attendues et taille de l'en-tête en octets
+        (([], 0) si l'en-tête n'est pas encore complet)
+
+    Raises:
+        CSVError: Si une colonne attendue manque
+    """
+    f.seek(0)
+    line = f.readline()
+    if not line.endswith(b"\n"):
+        return [], 0
+    header = next(csv.reader([line.decode("utf-8-sig")]), [])
+    try:
+        return [header.index(name) for name in CSV_HEADERS], len(line)
+    except ValueError as e:
+        raise CSVError(f"En-tête CSV incomplet: {e}")
+
+
+def line_timestamp(line: bytes, position: int) -> Optional[int]:
+    """Date de saisie (secondes depuis 1970) d'une ligne, ou None si invalide."""
+    if position == 0 and line[19:20] == b",":
+        # Ligne canonique: la date occupe les 19 premiers octets
+        text = line[:19].decode("ascii", "replace")
+    else:
+        row = next(csv.reader([line.decode("utf-8", "replace")]), None)
+        if not row or position >= len(row):
+            return None
+        text = row[position]
+    try:
+        return parse_datetime(text)
+    except TimeFormatError:
+        return None
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Écrit un fichier de façon durable (fichier temporaire, fsync, renommage)."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except IOError:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,168 @@
+"""
+Cache des données dérivées de horaires.csv pour les réexécutions de l'interface.
+
+Streamlit réexécute tout app.py à chaque interaction. Les horaires chargés,
+les moyennes, le tableau et les graphiques sont donc conservés pour le
+processus, avec pour clé l'état des fichiers sur disque (date de
+modification, taille, inode du CSV courant, du manifeste des segments et,
+si demandé, de config.json). Tant que ces fichiers ne changent pas, une
+réexécution ne coûte que quelques appels à stat(): ni lecture ni décodage.
+
+Les écritures (CSVHandler, donc ajouter_donnees) et les sauvegardes de
+configuration (mettre_a_jour_config, reinitialiser_config) vident en plus
+le cache explicitement, ce qui couvre les modifications trop rapprochées
+pour changer la date de modification.
+"""
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+from calcule_Heure.constants import CONFIG_FILE, CSV_FILE, SEGMENTS_SUFFIX
+
+if TYPE_CHECKING:
+    from calcule_Heure.frame import ScheduleFrame
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def file_state(path: Path) -> Tuple[Any, ...]:
+    """
+    Identifie l'état d'un fichier sur disque.
+
+    Returns:
+        Tuple (chemin, mtime, taille, inode), ou (chemin,) si absent
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return (str(path),)
+    return (str(path), stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def fichiers_donnees(csv_path: Path = CSV_FILE) -> List[Path]:
+    """Fichiers dont dépend le contenu d'un CSV d'horaires (CSV courant et manifeste des segments)."""
+    return [csv_path, csv_path.with_name(csv_path.name + SEGMENTS_SUFFIX) / "manifest.json"]
+
+
+class DataCache:
+    """Valeurs calculées une fois par état des fichiers, partagées par le processus."""
+
+    _lock = threading.Lock()
+    _generation = 0
+    # nom -> (clé: génération et état des fichiers, valeur)
+    _entries: Dict[Hashable, Tuple[Tuple[Any, ...], Any]] = {}
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Oublie toutes les valeurs en cache (recalculées au prochain accès)."""
+        with cls._lock:
+            cls._generation += 1
+            cls._entries.clear()
+
+    @classmethod
+    def get(cls, name: Hashable, paths: Sequence[Path], loader: Callable[[], T]) -> T:
+        """
+        Retourne la valeur en cache, ou la calcule si les fichiers ont changé.
+
+        Args:
+            name: Identifiant de la valeur (une seule version conservée par nom)
+            paths: Fichiers dont dépend la valeur
+            loader: Fonction calculant la valeur
+
+        Returns:
+            Valeur en cache ou fraîchement calculée
+        """
+        with cls._lock:
+            key = (cls._generation, tuple(file_state(path) for path in paths))
+            entry = cls._entries.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        value = loader()
+        with cls._lock:
+            # Une invalidation pendant le calcul rend la valeur déjà périmée
+            if key[0] == cls._generation:
+                cls._entries[name] = (key, value)
+        logger.debug(f"Cache recalculé: {name}")
+        return value
+
+
+def _periode(jours: Optional[int]) -> Tuple[Any, ...]:
+    """Partie de la clé propre à une période glissante (change chaque jour)."""
+    return (None,) if jours is None else (jours, date.today().isoformat())
+
+
+def memoriser(
+    name: str,
+    loader: Callable[[], T],
+    csv_path: Path = CSV_FILE,
+    jours: Optional[int] = None,
+    config: bool = False
+) -> T:
+    """
+    Met en cache une valeur dérivée des horaires (tableau, graphiques...).
+
+    Args:
+        name: Nom de la valeur
+        loader: Fonction calculant la valeur
+        csv_path: CSV d'horaires dont dépend la valeur
+        jours: Période glissante concernée (None: tout l'historique)
+        config: La valeur dépend aussi de config.json
+
+    Returns:
+        Valeur en cache ou fraîchement calculée
+    """
+    paths = fichiers_donnees(csv_path) + ([CONFIG_FILE] if config else [])
+    return DataCache.get((name, str(csv_path), *_periode(jours)), paths, loader)
+
+
+def charger_horaires(csv_path: Path = CSV_FILE, jours: Optional[int] = None) -> "ScheduleFrame":
+    """
+    Horaires en colonnes (segments compris), éventuellement limités aux derniers jours.
+
+    Args:
+        csv_path: CSV d'horaires
+        jours: Nombre de jours à conserver (None: tout l'historique)
+
+    Returns:
+        ScheduleFrame en cache
+    """
+    # Imports locaux: csv_handler vide ce cache lors des écritures
+    from calcule_Heure.csv_handler import CSVHandler
+    from calcule_Heure.frame import ScheduleFrame
+
+    def loader() -> ScheduleFrame:
+        handler = CSVHandler(csv_path)
+        if jours is None:
+            return handler.load_frame()
+        fin = datetime.now() + timedelta(seconds=1)
+        return ScheduleFrame.from_records(handler.read_range(fin - timedelta(days=jours), fin))
+
+    return memoriser("horaires", loader, csv_path, jours)
+
+
+def charger_moyennes(
+    csv_path: Path = CSV_FILE,
+    jours: Optional[int] = None
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Moyennes (départ, pause, arrivée) de l'historique ou des derniers jours.
+
+    Args:
+        csv_path: CSV d'horaires
+        jours: Nombre de jours pris en compte (None: tout l'historique)
+
+    Returns:
+        Tuple (heure_depart_moy, duree_pause_moy, heure_arrivee_moy) en cache
+    """
+    from calcule_Heure.colcul import calculer_moyennes
+
+    if jours is None:
+        return memoriser("moyennes", lambda: calculer_moyennes(csv_path), csv_path)
+    return memoriser(
+        "moyennes", lambda: calculer_moyennes(charger_horaires(csv_path, jours)), csv_path, jours
+    )
@@ -0,0 +1,181 @@
+"""
+Index creux (date de saisie -> position en octets) de horaires.csv.
+
+Les lignes sont ajoutées dans l'ordre des dates de saisie: il suffit donc de
+retenir la date et la position d'une ligne sur DATE_INDEX_STRIDE pour savoir
+où commencer et où arrêter la lecture d'une période. L'index est conservé
+dans un fichier annexe (horaires.csv.index.json) et complété, comme les
+statistiques cumulées, en ne lisant que les lignes ajoutées depuis la
+dernière mise à jour.
+
+Si les dates ne sont pas croissantes (import de saisies anciennes après des
+récentes), l'index le signale et les lectures par période parcourent tout
+le fichier.
+"""
+import bisect
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from calcule_Heure.constants import CSV_FILE, DATE_INDEX_STRIDE, DATE_INDEX_SUFFIX
+from calcule_Heure.csv_utils import fingerprint, header_positions, line_timestamp
+from calcule_Heure.exceptions import CSVError
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+
+
+class DateIndex:
+    """Fichier annexe d'index des dates de saisie associé à un CSV d'horaires."""
+
+    def __init__(self, csv_path: Path = CSV_FILE):
+        """
+        Initialise l'index.
+
+        Args:
+            csv_path: Chemin vers le fichier CSV indexé
+        """
+        self.csv_path = csv_path
+        self.path = csv_path.with_name(csv_path.name + DATE_INDEX_SUFFIX)
+
+    def exists(self) -> bool:
+        """Vérifie si le fichier d'index existe."""
+        return self.path.exists()
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        """Lit l'état enregistré, ou None s'il est absent, illisible ou d'un autre pas."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (IOError, ValueError) as e:
+            logger.warning(f"Index des dates illisible, reconstruction: {e}")
+            return None
+        if state.get("version") != INDEX_VERSION or state.get("pas") != DATE_INDEX_STRIDE:
+            return None
+        return state
+
+    def _save(self, state: Dict[str, Any]) -> None:
+        """Écrit l'état de façon atomique (fichier temporaire puis renommage)."""
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+        except IOError as e:
+            logger.warning(f"Impossible d'enregistrer l'index des dates: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _consume(f: BinaryIO, state: Dict[str, Any], position: int) -> None:
+        """Indexe les lignes complètes situées après state["offset"]."""
+        offset = state["offset"]
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                # Ligne en cours d'écriture: elle sera indexée à la prochaine mise à jour
+                break
+            timestamp = line_timestamp(line, position)
+            if timestamp is not None:
+                if state["dernier"] is not None and timestamp < state["dernier"]:
+                    state["trie"] = False
+                state["dernier"] = timestamp
+                if state["depuis_entree"] % DATE_INDEX_STRIDE == 0:
+                    state["entrees"].append([timestamp, offset])
+                    state["depuis_entree"] = 0
+                state["depuis_entree"] += 1
+            offset += len(line)
+        state["offset"] = offset
+
+    def update(self) -> Dict[str, Any]:
+        """
+        Met l'index à jour et retourne son état.
+
+        Seules les lignes ajoutées depuis la dernière mise à jour sont
+        décodées; l'index est reconstruit si la partie déjà indexée du CSV a
+        été tronquée ou modifiée (empreinte complète, voir csv_utils).
+
+        Returns:
+            État de l'index: "entrees" ([date, position] d'une ligne sur
+            DATE_INDEX_STRIDE), "entete" (taille de l'en-tête), "offset"
+            (fin de la dernière ligne indexée) et "trie"
+
+        Raises:
+            CSVError: Si le CSV ne peut pas être lu
+        """
+        try:
+            stat = self.csv_path.stat()
+            state = self._load()
+            if (
+                state is not None
+                and state["taille"] == stat.st_size
+                and state["mtime_ns"] == stat.st_mtime_ns
+            ):
+                return state
+
+            with open(self.csv_path, 'rb') as f:
+                positions, header_size = header_positions(f)
+                empreinte = None
+                if state is not None and positions and header_size <= state["offset"] <= stat.st_size:
+                    empreinte = fingerprint(f, state["offset"])
+                if empreinte is None or empreinte.hexdigest() != state["empreinte"]:
+                    state = {
+                        "version": INDEX_VERSION,
+                        "pas": DATE_INDEX_STRIDE,
+                        "entete": header_size,
+                        "offset": header_size,
+                        "entrees": [],
+                        "depuis_entree": 0,
+                        "dernier": None,
+                        "trie": True,
+                    }
+                    empreinte = fingerprint(f, header_size)
+                if positions:
+                    debut = state["offset"]
+                    self._consume(f, state, positions[0])
+                    empreinte = fingerprint(f, state["offset"], debut, empreinte)
+
+                state.update(
+                    taille=stat.st_size,
+                    mtime_ns=stat.st_mtime_ns,
+                    empreinte=empreinte.hexdigest(),
+                )
+                self._save(state)
+                return state
+        except IOError as e:
+            logger.error(f"Erreur de lecture CSV: {e}")
+            raise CSVError(f"Impossible de lire le fichier CSV: {e}")
+
+    def locate(self, start: int, end: int) -> Optional[Tuple[int, int]]:
+        """
+        Plage d'octets contenant toutes les lignes datées dans [start, end[.
+
+        La plage peut déborder d'au plus DATE_INDEX_STRIDE lignes de chaque
+        côté: les lignes lues doivent encore être filtrées par date.
+
+        Args:
+            start: Début de période (secondes depuis 1970, inclus)
+            end: Fin de période (secondes depuis 1970, exclue)
+
+        Returns:
+            (début, fin) en octets, ou None si les dates ne sont pas triées
+
+        Raises:
+            CSVError: Si le CSV ne peut pas être lu
+        """
+        state = self.update()
+        if not state["trie"]:
+            return None
+        entries: List[List[int]] = state["entrees"]
+        keys = [timestamp for timestamp, _ in entries]
+        # Dernier bloc commençant avant `start`: il peut contenir des lignes de la période
+        first = bisect.bisect_left(keys, start) - 1
+        # Premier bloc commençant à `end` ou après: aucune de ses lignes n'est dans la période
+        last = bisect.bisect_left(keys, end)
+        low = entries[first][1] if first >= 0 else state["entete"]
+        high = entries[last][1] if last < len(entries) else state["offset"]
+        return low, max(low, high)
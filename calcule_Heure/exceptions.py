@@ -26,3 +26,8 @@ class CSVError(HorairesException):
 class TimeFormatError(ValidationError):
     """Exception levée lors d'erreurs de format de temps."""
     pass
+
+
+class StorageError(HorairesException):
+    """Exception levée lors d'erreurs de lecture/écriture du stockage binaire."""
+    pass
@@ -0,0 +1,380 @@
+"""
+Représentation en colonnes NumPy des horaires.
+
+Un ScheduleFrame regroupe les entrées du CSV sous forme de tableaux d'entiers
+(horodatage en secondes depuis 1970, heures en minutes depuis minuit) afin que
+les statistiques se calculent par réductions vectorisées. Les lignes invalides
+restent dans les tableaux mais sont exclues par un masque booléen.
+"""
+import csv
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from calcule_Heure.constants import CSV_FILE, CSV_HEADERS
+from calcule_Heure.csv_handler import ScheduleRecord, _build_record, parse_record
+from calcule_Heure.exceptions import CSVError, ValidationError
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("horodatage", "debut", "debut_pause", "fin_pause", "depart")
+
+# Ligne canonique écrite par CSVHandler.write:
+# "YYYY-MM-DD HH:MM:SS,HH:MM,HH:MM,HH:MM,HH:MM"
+_CANONICAL_LENGTH = 43
+_TIME_OFFSETS = (20, 26, 32, 38)
+_SEPARATORS = {
+    4: b"-", 7: b"-", 10: b" ", 13: b":", 16: b":",
+    19: b",", 22: b":", 25: b",", 28: b":", 31: b",", 34: b":", 37: b",", 40: b":",
+}
+_DIGIT_OFFSETS = tuple(
+    i for i in range(_CANONICAL_LENGTH) if i not in _SEPARATORS
+)
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def _days_from_civil(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """Nombre de jours depuis le 1970-01-01 (calendrier grégorien proleptique)."""
+    year = year - (month <= 2)
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _civil_from_days(days: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Année, mois et jour d'un nombre de jours depuis le 1970-01-01 (inverse de _days_from_civil)."""
+    z = days + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + np.where(mp < 10, 3, -9)
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
+
+
+class ScheduleFrame:
+    """Horaires stockés en colonnes d'entiers NumPy avec masque de validité."""
+
+    __slots__ = COLUMNS + ("valide",)
+
+    def __init__(
+        self,
+        horodatage: np.ndarray,
+        debut: np.ndarray,
+        debut_pause: np.ndarray,
+        fin_pause: np.ndarray,
+        depart: np.ndarray,
+        valide: Optional[np.ndarray] = None
+    ):
+        """
+        Initialise le frame à partir de colonnes de même longueur.
+
+        Args:
+            horodatage: Secondes depuis 1970 (heure locale, sans fuseau)
+            debut: Heure d'arrivée en minutes depuis minuit
+            debut_pause: Début de pause en minutes depuis minuit
+            fin_pause: Fin de pause en minutes depuis minuit
+            depart: Heure de départ en minutes depuis minuit
+            valide: Masque des lignes valides (toutes par défaut)
+        """
+        self.horodatage = np.asarray(horodatage, dtype=np.int64)
+        self.debut = np.asarray(debut, dtype=np.int32)
+        self.debut_pause = np.asarray(debut_pause, dtype=np.int32)
+        self.fin_pause = np.asarray(fin_pause, dtype=np.int32)
+        self.depart = np.asarray(depart, dtype=np.int32)
+        if valide is None:
+            valide = np.ones(len(self.horodatage), dtype=bool)
+        self.valide = np.asarray(valide, dtype=bool)
+
+    def __len__(self) -> int:
+        """Nombre de lignes, valides ou non."""
+        return len(self.horodatage)
+
+    @property
+    def nombre_valides(self) -> int:
+        """Nombre de lignes valides."""
+        return int(np.count_nonzero(self.valide))
+
+    @property
+    def duree_pause(self) -> np.ndarray:
+        """Durée des pauses en minutes (peut être négative si incohérente)."""
+        return self.fin_pause - self.debut_pause
+
+    @classmethod
+    def empty(cls) -> "ScheduleFrame":
+        """Frame sans aucune ligne."""
+        return cls(*(np.empty(0, dtype=np.int64) for _ in COLUMNS))
+
+    @classmethod
+    def concatenate(cls, frames: List["ScheduleFrame"]) -> "ScheduleFrame":
+        """
+        Met bout à bout plusieurs frames (lignes invalides comprises).
+
+        Args:
+            frames: Frames dans l'ordre souhaité
+
+        Returns:
+            Nouveau ScheduleFrame (ou le frame unique tel quel)
+        """
+        if not frames:
+            return cls.empty()
+        if len(frames) == 1:
+            return frames[0]
+        return cls(
+            *(np.concatenate([getattr(frame, name) for frame in frames]) for name in COLUMNS),
+            valide=np.concatenate([frame.valide for frame in frames]),
+        )
+
+    def valid(self) -> "ScheduleFrame":
+        """
+        Retourne un frame compact ne contenant que les lignes valides.
+
+        Returns:
+            Nouveau ScheduleFrame (ou self si toutes les lignes sont valides)
+        """
+        if self.valide.all():
+            return self
+        mask = self.valide
+        return ScheduleFrame(*(getattr(self, name)[mask] for name in COLUMNS))
+
+    def records(self) -> Iterable[ScheduleRecord]:
+        """Itère sur les lignes valides sous forme de ScheduleRecord."""
+        frame = self.valid()
+        columns = [getattr(frame, name).tolist() for name in COLUMNS]
+        return (ScheduleRecord(*values) for values in zip(*columns))
+
+    def moyennes(self) -> Optional[Tuple[float, float, float]]:
+        """
+        Moyennes (départ, pause, arrivée) en minutes sur les lignes valides.
+
+        Returns:
+            Tuple de moyennes, ou None si aucune ligne valide
+        """
+        count = self.nombre_valides
+        if count == 0:
+            return None
+        mask = self.valide
+        # Sommes en entiers Python: la division reste identique au calcul ligne à ligne
+        total_depart = int(self.depart.sum(where=mask, dtype=np.int64))
+        total_pause = int(self.duree_pause.sum(where=mask, dtype=np.int64))
+        total_arrivee = int(self.debut.sum(where=mask, dtype=np.int64))
+        return total_depart / count, total_pause / count, total_arrivee / count
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Union[ScheduleRecord, Dict[str, str]]]
+    ) -> "ScheduleFrame":
+        """
+        Construit un frame depuis des ScheduleRecord ou des lignes DictReader.
+
+        Les dictionnaires invalides sont ignorés avec un avertissement.
+
+        Args:
+            records: Entrées décodées ou dictionnaires lus depuis le CSV
+
+        Returns:
+            ScheduleFrame contenant les entrées valides
+        """
+        def decoded():
+            for record in records:
+                if isinstance(record, dict):
+                    try:
+                        record = parse_record(record)
+                    except ValidationError as e:
+                        logger.warning(f"Entrée invalide ignorée: {e}")
+                        continue
+                yield tuple(record)
+
+        table = np.fromiter(decoded(), dtype=[(name, np.int64) for name in COLUMNS])
+        return cls(*(table[name] for name in COLUMNS))
+
+    @classmethod
+    def from_csv(cls, file_path: Path = CSV_FILE) -> "ScheduleFrame":
+        """
+        Charge le fichier CSV en une passe.
+
+        Les lignes au format canonique sont décodées par arithmétique vectorisée
+        sur les octets du fichier; les autres (heures sur un chiffre, en-tête
+        réordonné...) passent par le décodeur de csv_handler. Les lignes
+        invalides sont conservées et masquées.
+
+        Args:
+            file_path: Chemin vers le fichier CSV
+
+        Returns:
+            ScheduleFrame (vide si le fichier n'existe pas)
+
+        Raises:
+            CSVError: Si la lecture échoue
+        """
+        if not file_path.exists():
+            logger.warning(f"Fichier CSV non trouvé: {file_path}")
+            return cls.empty()
+
+        try:
+            raw = file_path.read_bytes()
+        except IOError as e:
+            logger.error(f"Erreur de lecture CSV: {e}")
+            raise CSVError(f"Impossible de lire le fichier CSV: {e}")
+
+        frame = cls._parse_bytes(raw)
+        logger.info(
+            f"{len(frame)} entrées chargées depuis {file_path} "
+            f"({len(frame) - frame.nombre_valides} invalides)"
+        )
+        return frame
+
+    @classmethod
+    def _parse_bytes(cls, raw: bytes) -> "ScheduleFrame":
+        """Décode le contenu brut d'un CSV d'horaires."""
+        data = np.frombuffer(raw, dtype=np.uint8)
+        ends = np.flatnonzero(data == ord("\n"))
+        if len(data) and (not len(ends) or ends[-1] != len(data) - 1):
+            ends = np.append(ends, len(data))
+        if not len(ends):
+            return cls.empty()
+        starts = np.concatenate(([0], ends[:-1] + 1)).astype(np.int64)
+        # Retirer le \r final des lignes écrites par csv.writer
+        has_cr = (ends > starts) & (data[np.maximum(ends - 1, 0)] == ord("\r"))
+        lengths = ends - starts - has_cr
+
+        header = raw[starts[0]:starts[0] + lengths[0]].decode("utf-8-sig")
+        if next(csv.reader([header]), []) != CSV_HEADERS:
+            # En-tête non standard: décodage générique ligne à ligne
+            return cls._parse_generic(raw)
+
+        starts, lengths = starts[1:], lengths[1:]
+        keep = lengths > 0
+        starts, lengths = starts[keep], lengths[keep]
+        n = len(starts)
+
+        canonical = lengths == _CANONICAL_LENGTH
+        safe_starts = np.where(canonical, starts, 0)
+        if len(data) < _CANONICAL_LENGTH:
+            canonical[:] = False
+        else:
+            safe_starts = np.minimum(safe_starts, len(data) - _CANONICAL_LENGTH)
+
+        for offset, char in _SEPARATORS.items():
+            canonical &= data[safe_starts + offset] == char[0]
+
+        digits = {}
+        for offset in _DIGIT_OFFSETS:
+            digit = data[safe_starts + offset].astype(np.int64) - ord("0")
+            canonical &= (digit >= 0) & (digit <= 9)
+            digits[offset] = digit
+
+        def number(first: int, width: int) -> np.ndarray:
+            value = np.zeros(n, dtype=np.int64)
+            for offset in range(first, first + width):
+                value = value * 10 + digits[offset]
+            return value
+
+        year, month, day = number(0, 4), number(5, 2), number(8, 2)
+        hour, minute, second = number(11, 2), number(14, 2), number(17, 2)
+        leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+        month_ok = (month >= 1) & (month <= 12)
+        max_day = _DAYS_IN_MONTH[np.where(month_ok, month, 1)] + ((month == 2) & leap)
+        valide = (
+            canonical & month_ok & (day >= 1) & (day <= max_day)
+            & (hour < 24) & (minute < 60) & (second < 60)
+        )
+        horodatage = (
+            _days_from_civil(year, month, day) * 86400
+            + hour * 3600 + minute * 60 + second
+        )
+
+        times = []
+        for offset in _TIME_OFFSETS:
+            h, m = number(offset, 2), number(offset + 3, 2)
+            valide &= (h < 24) & (m < 60)
+            times.append(h * 60 + m)
+
+        horodatage[~valide] = 0
+        for column in times:
+            column[~valide] = 0
+
+        # Lignes non canoniques: décodage Python limité à ces seules lignes
+        for i in np.flatnonzero(~canonical):
+            line = raw[starts[i]:starts[i] + lengths[i]].decode("utf-8")
+            try:
+                record = _build_record(next(csv.reader([line])))
+            except (ValueError, ValidationError, csv.Error):
+                continue
+            horodatage[i] = record.horodatage
+            for column, value in zip(times, record[1:]):
+                column[i] = value
+            valide[i] = True
+
+        return cls(horodatage, *times, valide=valide)
+
+    def _format_bytes(self) -> bytes:
+        """
+        Lignes CSV canoniques des lignes valides (sans en-tête, fins de ligne CRLF).
+
+        Inverse vectorisé de _parse_bytes: produit les mêmes octets que
+        csv.writer avec format_datetime et format_time.
+
+        Raises:
+            ValueError: Si une date sort des années 1 à 9999
+        """
+        frame = self.valid()
+        days, seconds = np.divmod(frame.horodatage, 86400)
+        year, month, day = _civil_from_days(days)
+        if len(year) and (year.min() < 1 or year.max() > 9999):
+            raise ValueError("Date de saisie hors des années 1 à 9999")
+
+        out = np.empty((len(frame), _CANONICAL_LENGTH + 2), dtype=np.uint8)
+        for offset, char in _SEPARATORS.items():
+            out[:, offset] = char[0]
+        out[:, _CANONICAL_LENGTH:] = (ord("\r"), ord("\n"))
+
+        def put(first: int, width: int, value: np.ndarray) -> None:
+            for offset in reversed(range(first, first + width)):
+                out[:, offset] = value % 10 + ord("0")
+                value = value // 10
+
+        put(0, 4, year)
+        put(5, 2, month)
+        put(8, 2, day)
+        put(11, 2, seconds // 3600)
+        put(14, 2, seconds // 60 % 60)
+        put(17, 2, seconds % 60)
+        for offset, name in zip(_TIME_OFFSETS, COLUMNS[1:]):
+            # Ramené sur 24 h, comme format_time
+            minutes = getattr(frame, name) % (24 * 60)
+            put(offset, 2, minutes // 60)
+            put(offset + 3, 2, minutes % 60)
+        return out.tobytes()
+
+    @classmethod
+    def _parse_generic(cls, raw: bytes) -> "ScheduleFrame":
+        """Décodage ligne à ligne via csv.reader (en-tête quelconque)."""
+        reader = csv.reader(raw.decode("utf-8-sig").splitlines())
+        header = next(reader, None) or []
+        try:
+            positions = [header.index(name) for name in CSV_HEADERS]
+        except ValueError as e:
+            raise CSVError(f"En-tête CSV incomplet: {e}")
+
+        rows, valide = [], []
+        for row in reader:
+            if not row:
+                continue
+            try:
+                rows.append(tuple(_build_record([row[i] for i in positions])))
+                valide.append(True)
+            except (IndexError, ValueError, ValidationError):
+                rows.append((0,) * len(COLUMNS))
+                valide.append(False)
+
+        table = np.array(rows, dtype=np.int64).reshape(-1, len(COLUMNS))
+        return cls(*table.T, valide=np.array(valide, dtype=bool))
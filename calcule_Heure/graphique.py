@@ -1,86 +1,461 @@
-from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import matplotlib.colors as mcolors
-import numpy as np
+"""
+Graphiques d'évolution des horaires (arrivée, départ, pauses).
+
+- generer_graphiques(): figures pyplot, pour plt.show() en ligne de commande.
+- rendre_graphiques(): images PNG/SVG rendues sans interface (Agg) et mises
+  en cache sur disque, avec pour clé une empreinte des données affichées et
+  du seuil de pause. Les graphiques manquants sont rendus en parallèle dans
+  un pool de processus; un affichage répété ne coûte que le calcul de
+  l'empreinte et la vérification de trois fichiers.
+- specs_vega_lite(): spécifications Vega-Lite des mêmes graphiques, données
+  en colonnes; le rendu est fait par le navigateur (st.vega_lite_chart) et
+  le serveur ne construit qu'un petit document JSON.
+
+Au-delà de GRAPH_MAX_POINTS entrées, chaque série est réduite à ses extrêmes
+par intervalle (reduire_points()): le temps de tracé reste borné quand
+l'historique s'allonge, sans masquer les valeurs aberrantes.
+
+matplotlib et numpy ne sont importés qu'au premier graphique: importer ce
+module (main.py, app.py) ne charge pas la pile de tracé.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional
+
 from calcule_Heure.config import get_seuil_pause
+from calcule_Heure.constants import GRAPH_MAX_POINTS, RENDER_CACHE_DIR, RENDER_CACHE_MAX_FILES
+from calcule_Heure.timecodec import parse_time
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PAR_JOUR = 24 * 60
+# Noms des graphiques, dans l'ordre de generer_graphiques()
+GRAPHIQUES = ("arrivee", "depart", "pauses")
+FORMATS = ("png", "svg")
+# À incrémenter quand le tracé change, pour ne plus servir les anciens rendus
+RENDER_VERSION = 2
+VEGA_LITE_SCHEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+
+
+class Series(NamedTuple):
+    """Données tracées, indépendantes de matplotlib (transmises aux processus de rendu)."""
+
+    dates: "np.ndarray"
+    heures_arrivee: "np.ndarray"
+    heures_depart: "np.ndarray"
+    durees_pause: "np.ndarray"
+    arrivee_moy: float
+    depart_moy: float
+    seuil_pause: int
+
+
+def preparer_series(horaires, depart_moy, arrivee_moy) -> Optional[Series]:
+    """
+    Extrait les séries tracées des lignes valides.
+
+    Args:
+        horaires: ScheduleFrame ou liste d'horaires
+        depart_moy: Heure moyenne de départ (HH:MM)
+        arrivee_moy: Heure moyenne d'arrivée (HH:MM)
+
+    Returns:
+        Series, ou None si aucune ligne n'est valide
+    """
+    from calcule_Heure.frame import ScheduleFrame
+
+    if not isinstance(horaires, ScheduleFrame):
+        horaires = ScheduleFrame.from_records(horaires)
+    frame = horaires.valid()
+    if not len(frame):
+        return None
+    return Series(
+        dates=frame.horodatage.astype('datetime64[s]'),
+        heures_arrivee=frame.debut / 60,
+        heures_depart=frame.depart / 60,
+        # Une pause « négative » est ramenée sur 24 h comme le faisait timedelta.seconds
+        durees_pause=frame.duree_pause % MINUTES_PAR_JOUR,
+        # Conversion des heures moyennes
+        arrivee_moy=parse_time(arrivee_moy) / 60,
+        depart_moy=parse_time(depart_moy) / 60,
+        # Utilise le seuil de pause configuré
+        seuil_pause=get_seuil_pause(),
+    )
+
+
+def reduire_points(x: "np.ndarray", y: "np.ndarray", max_points: int = GRAPH_MAX_POINTS):
+    """
+    Réduit une série à au plus `max_points` points en gardant ses extrêmes.
+
+    La série est découpée en intervalles consécutifs de même effectif; de
+    chacun sont gardés le point le plus bas et le plus haut, dans l'ordre
+    d'origine, ainsi que le premier et le dernier point de la série. Une
+    valeur aberrante est toujours l'extrême de son intervalle: elle reste
+    tracée.
+
+    Args:
+        x: Abscisses (dates), dans l'ordre de tracé
+        y: Valeurs
+        max_points: Nombre maximal de points conservés (au moins 4)
+
+    Returns:
+        Tuple (x, y) réduit (les tableaux d'origine s'ils sont assez courts)
+    """
+    import numpy as np
+
+    n = len(y)
+    if n <= max_points:
+        return x, y
+    intervalles = max(1, (max_points - 2) // 2)
+    intervalle = np.arange(n) * intervalles // n
+    # Tri par intervalle puis par valeur: chaque intervalle devient une
+    # tranche contiguë, son minimum en tête et son maximum en fin
+    ordre = np.lexsort((y, intervalle))
+    fins = np.searchsorted(intervalle, np.arange(1, intervalles + 1))
+    debuts = np.concatenate(([0], fins[:-1]))
+    garder = np.unique(np.concatenate(([0, n - 1], ordre[debuts], ordre[fins - 1])))
+    return x[garder], y[garder]
+
+
+def _tracer(index: int, ax, series: Series) -> None:
+    """Trace le graphique `index` (ordre de GRAPHIQUES) sur un axe."""
+    import matplotlib
+    import numpy as np
+
+    if index == 0:
+        # Graphique 1 : Heure d'arrivée
+        ax.plot(
+            *reduire_points(series.dates, series.heures_arrivee),
+            marker='o', linestyle='-', label="Heure d'arrivée"
+        )
+        ax.set_title("Évolution des heures d'arrivée")
+        ax.set_xlabel("Date de saisie")
+        ax.set_ylabel("Heure d'arrivée (heures décimales)")
+        ax.axhline(series.arrivee_moy, color='red', linestyle='--', linewidth=2, label='Moyenne')
+        ax.grid(True)
+    elif index == 1:
+        # Graphique 2 : Heure de départ
+        ax.plot(
+            *reduire_points(series.dates, series.heures_depart),
+            marker='o', linestyle='-', color='green', label='Heure de départ'
+        )
+        ax.set_title("Évolution des heures de départ")
+        ax.set_xlabel("Date de saisie")
+        ax.set_ylabel("Heure de départ (heures décimales)")
+        ax.axhline(series.depart_moy, color='red', linestyle='--', linewidth=2, label='Moyenne')
+        ax.grid(True)
+    else:
+        # Graphique 3 : Durée des pauses
+        dates, durees_pause = reduire_points(series.dates, series.durees_pause)
+        seuil_pause = series.seuil_pause
+        # Normalisation centrée sur le seuil (0.5), puis une couleur RGBA par
+        # barre, en un seul appel sur tout le tableau
+        norm = np.interp(durees_pause, [durees_pause.min(), seuil_pause, durees_pause.max()], [0, 0.5, 1])
+        couleurs = matplotlib.colormaps["RdYlGn"](norm)
+
+        ax.bar(dates, durees_pause, color=couleurs, label='Durée de la pause (min)')
+        ax.set_title("Durée des pauses au fil du temps")
+        ax.set_xlabel("Date de saisie")
+        ax.set_ylabel("Durée de la pause (minutes)")
+        ax.grid(True, axis='y')
+        ax.axhline(seuil_pause, color='red', linestyle='--', linewidth=2, label=f'Seuil {seuil_pause} min')
+    ax.legend()
+
 
 def generer_graphiques(horaires, depart_moy, arrivee_moy):
     """Génère les graphiques d'évolution des horaires."""
-    dates, heures_depart, heures_arrivee, durees_pause = [], [], [], []
-
-    for ligne in horaires:
-        try:
-            date = datetime.strptime(ligne["Date de saisie"], "%Y-%m-%d %H:%M:%S")
-            debut = datetime.strptime(ligne["Heure début"], "%H:%M")
-            depart = datetime.strptime(ligne["Heure départ calculée"], "%H:%M")
-            pause_debut = datetime.strptime(ligne["Heure début pause"], "%H:%M")
-            pause_fin = datetime.strptime(ligne["Heure fin pause"], "%H:%M")
-        except ValueError:
-            continue
-
-        dates.append(date)
-        heures_arrivee.append(debut.hour + debut.minute / 60)
-        heures_depart.append(depart.hour + depart.minute / 60)
-        durees_pause.append((pause_fin - pause_debut).seconds / 60)
-
-    if not dates:
+    import matplotlib.pyplot as plt
+
+    series = preparer_series(horaires, depart_moy, arrivee_moy)
+    if series is None:
         print("Aucune donnée valide pour générer les graphiques.")
         return None, None, None
 
-    # Conversion des heures moyennes
-    h, m = map(int, arrivee_moy.split(":"))
-    arrivee_moy_decimal = h + m / 60
-    h, m = map(int, depart_moy.split(":"))
-    depart_moy_decimal = h + m / 60
-
-    # Graphique 1 : Heure d'arrivée
-    fig1, ax1 = plt.subplots(figsize=(10, 5))
-    ax1.plot(dates, heures_arrivee, marker='o', linestyle='-', label="Heure d'arrivée")
-    ax1.set_title("Évolution des heures d'arrivée")
-    ax1.set_xlabel("Date de saisie")
-    ax1.set_ylabel("Heure d'arrivée (heures décimales)")
-    ax1.axhline(arrivee_moy_decimal, color='red', linestyle='--', linewidth=2, label='Moyenne')
-    ax1.grid(True)
-    ax1.legend()
-    plt.tight_layout()
-
-    # Graphique 2 : Heure de départ
-    fig2, ax2 = plt.subplots(figsize=(10, 5))
-    ax2.plot(dates, heures_depart, marker='o', linestyle='-', color='green', label='Heure de départ')
-    ax2.set_title("Évolution des heures de départ")
-    ax2.set_xlabel("Date de saisie")
-    ax2.set_ylabel("Heure de départ (heures décimales)")
-    ax2.axhline(depart_moy_decimal, color='red', linestyle='--', linewidth=2, label='Moyenne')
-    ax2.grid(True)
-    ax2.legend()
-    plt.tight_layout()
-
-    # Graphique 3 : Durée des pauses
-    class MidpointNormalize(mcolors.Normalize):
-        def __init__(self, vmin=None, vmax=None, midpoint=None, clip=False):
-            self.midpoint = midpoint
-            super().__init__(vmin, vmax, clip)
-
-        def __call__(self, value, clip=None):
-            result, is_scalar = self.process_value(value)
-            vmin, vmax, midpoint = self.vmin, self.vmax, self.midpoint
-            result = np.interp(result, [vmin, midpoint, vmax], [0, 0.5, 1])
-            return np.ma.masked_array(result)
-
-    # Utilise le seuil de pause configuré
-    seuil_pause = get_seuil_pause()
-    norm = MidpointNormalize(vmin=min(durees_pause), vmax=max(durees_pause), midpoint=seuil_pause)
-    cmap = plt.cm.RdYlGn
-    couleurs = [cmap(norm(val)) for val in durees_pause]
-
-    fig3, ax3 = plt.subplots(figsize=(10, 5))
-    ax3.bar(dates, durees_pause, color=couleurs, label='Durée de la pause (min)')
-    ax3.set_title("Durée des pauses au fil du temps")
-    ax3.set_xlabel("Date de saisie")
-    ax3.set_ylabel("Durée de la pause (minutes)")
-    ax3.grid(True, axis='y')
-    ax3.axhline(seuil_pause, color='red', linestyle='--', linewidth=2, label=f'Seuil {seuil_pause} min')
-    ax3.legend()
-    plt.tight_layout()
-
-    return fig1, fig2, fig3
+    figures = []
+    for index in range(len(GRAPHIQUES)):
+        fig, ax = plt.subplots(figsize=(10, 5))
+        _tracer(index, ax, series)
+        plt.tight_layout()
+        figures.append(fig)
+    return tuple(figures)
+
+
+def empreinte(series: Series, format: str) -> str:
+    """
+    Clé de cache d'un rendu: données tracées, moyennes, seuil de pause et format.
+
+    Returns:
+        Empreinte SHA-256 en hexadécimal
+    """
+    import numpy as np
+
+    h = hashlib.sha256()
+    h.update(f"{RENDER_VERSION}|{format}|{series.seuil_pause}|{series.arrivee_moy!r}|{series.depart_moy!r}".encode())
+    for colonne in (series.dates, series.heures_arrivee, series.heures_depart, series.durees_pause):
+        h.update(np.ascontiguousarray(colonne).tobytes())
+    return h.hexdigest()
+
+
+def _rendre(index: int, series: Series, chemin: Path, format: str) -> Path:
+    """
+    Rend un graphique dans un fichier, sans pyplot ni interface graphique.
+
+    Exécuté dans un processus du pool: la figure est une matplotlib.figure.Figure
+    autonome, enregistrée par le moteur Agg (PNG) ou SVG, puis publiée par
+    renommage pour qu'un lecteur ne voie jamais un fichier incomplet.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 5))
+    _tracer(index, fig.subplots(), series)
+    fig.tight_layout()
+    tmp_path = chemin.with_name(f"{chemin.name}.{os.getpid()}.tmp")
+    try:
+        fig.savefig(tmp_path, format=format)
+        os.replace(tmp_path, chemin)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return chemin
+
+
+_pool_lock = threading.Lock()
+_pool: Optional["ProcessPoolExecutor"] = None
+
+
+def _get_pool() -> "ProcessPoolExecutor":
+    """Pool de rendu du processus, créé au premier rendu et réutilisé ensuite."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # "spawn": les processus de rendu ne copient pas l'état (threads,
+            # figures pyplot) du serveur Streamlit
+            _pool = ProcessPoolExecutor(
+                max_workers=len(GRAPHIQUES), mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _reset_pool() -> None:
+    """Abandonne un pool devenu inutilisable (recréé au prochain rendu)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _purger(dossier: Path) -> None:
+    """Supprime les rendus les plus anciens au-delà de RENDER_CACHE_MAX_FILES."""
+    try:
+        fichiers = sorted(
+            (chemin for chemin in dossier.iterdir() if chemin.suffix[1:] in FORMATS),
+            key=lambda chemin: chemin.stat().st_mtime_ns,
+            reverse=True,
+        )
+        for chemin in fichiers[RENDER_CACHE_MAX_FILES:]:
+            chemin.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Impossible de purger le cache des graphiques: {e}")
+
+
+def rendre_graphiques(
+    horaires,
+    depart_moy,
+    arrivee_moy,
+    format: str = "png",
+    dossier: Path = RENDER_CACHE_DIR
+) -> Optional[List[Path]]:
+    """
+    Rend les graphiques en images, ou les retrouve dans le cache.
+
+    Args:
+        horaires: ScheduleFrame ou liste d'horaires
+        depart_moy: Heure moyenne de départ (HH:MM)
+        arrivee_moy: Heure moyenne d'arrivée (HH:MM)
+        format: "png" ou "svg"
+        dossier: Répertoire du cache des rendus
+
+    Returns:
+        Chemins des images (ordre de GRAPHIQUES), ou None si aucune ligne n'est valide
+
+    Raises:
+        ValueError: Si le format n'est pas pris en charge
+    """
+    from concurrent.futures.process import BrokenProcessPool
+
+    if format not in FORMATS:
+        raise ValueError(f"Format de graphique non pris en charge: {format}")
+    series = preparer_series(horaires, depart_moy, arrivee_moy)
+    if series is None:
+        return None
+
+    cle = empreinte(series, format)
+    chemins = [dossier / f"{cle}-{nom}.{format}" for nom in GRAPHIQUES]
+    manquants = [index for index, chemin in enumerate(chemins) if not chemin.exists()]
+    if not manquants:
+        logger.debug(f"Graphiques servis depuis le cache: {cle}")
+        return chemins
+
+    dossier.mkdir(parents=True, exist_ok=True)
+    try:
+        pool = _get_pool()
+        futures = [pool.submit(_rendre, index, series, chemins[index], format) for index in manquants]
+        for future in futures:
+            future.result()
+    except (BrokenProcessPool, OSError) as e:
+        # Pas de processus disponibles (environnement restreint): rendu sur place
+        logger.warning(f"Rendu parallèle impossible, rendu séquentiel: {e}")
+        _reset_pool()
+        for index in manquants:
+            _rendre(index, series, chemins[index], format)
+    logger.info(f"{len(manquants)} graphique(s) rendu(s) dans {dossier}")
+    _purger(dossier)
+    return chemins
+
+
+def exporter_graphiques(
+    horaires,
+    depart_moy,
+    arrivee_moy,
+    destination: Path,
+    format: str = "png"
+) -> Optional[List[Path]]:
+    """
+    Exporte les graphiques dans un répertoire (arrivee, depart et pauses.<format>).
+
+    Args:
+        horaires: ScheduleFrame ou liste d'horaires
+        depart_moy: Heure moyenne de départ (HH:MM)
+        arrivee_moy: Heure moyenne d'arrivée (HH:MM)
+        destination: Répertoire de destination (créé si besoin)
+        format: "png" ou "svg"
+
+    Returns:
+        Chemins des fichiers écrits, ou None si aucune ligne n'est valide
+
+    Raises:
+        ValueError: Si le format n'est pas pris en charge
+    """
+    rendus = rendre_graphiques(horaires, depart_moy, arrivee_moy, format)
+    if rendus is None:
+        return None
+    destination.mkdir(parents=True, exist_ok=True)
+    fichiers = []
+    for nom, rendu in zip(GRAPHIQUES, rendus):
+        fichiers.append(Path(shutil.copyfile(rendu, destination / f"{nom}.{format}")))
+    return fichiers
+
+
+def _spec(
+    titre: str,
+    dates: "np.ndarray",
+    minutes: "np.ndarray",
+    y: Dict[str, Any],
+    marque: Dict[str, Any],
+    reference: float,
+    reference_titre: str
+) -> Dict[str, Any]:
+    """
+    Spécification Vega-Lite d'une série, avec une ligne de référence rouge.
+
+    Les données sont transmises en colonnes d'entiers (secondes depuis 1970,
+    minutes), remises en lignes par la transformation "flatten" du
+    navigateur, qui calcule aussi les dates et les heures décimales.
+    """
+    import numpy as np
+
+    return {
+        "$schema": VEGA_LITE_SCHEMA,
+        "title": titre,
+        "width": "container",
+        "data": {"values": [{
+            "t": dates.astype('datetime64[s]').astype(np.int64).tolist(),
+            "minutes": np.rint(minutes).astype(np.int64).tolist(),
+        }]},
+        "transform": [
+            {"flatten": ["t", "minutes"]},
+            {"calculate": "datum.t * 1000", "as": "date"},
+            {"calculate": "datum.minutes / 60", "as": "heures"},
+        ],
+        "layer": [
+            {
+                "mark": marque,
+                "encoding": {
+                    # Dates de saisie locales « naïves »: affichées en UTC pour ne pas être décalées
+                    "x": {"field": "date", "type": "temporal", "title": "Date de saisie", "scale": {"type": "utc"}},
+                    **y,
+                },
+            },
+            {
+                "mark": {"type": "rule", "color": "red", "strokeDash": [6, 4], "size": 2},
+                "encoding": {"y": {"datum": reference}, "tooltip": {"value": reference_titre}},
+            },
+        ],
+    }
+
+
+def specs_vega_lite(horaires, depart_moy, arrivee_moy) -> Optional[List[Dict[str, Any]]]:
+    """
+    Spécifications Vega-Lite des graphiques, rendus par le navigateur.
+
+    Mêmes séries (réduites à GRAPH_MAX_POINTS points), moyennes et seuil de
+    pause que generer_graphiques(); les pauses sont colorées par une
+    échelle divergente rouge-jaune-vert centrée sur le seuil.
+
+    Args:
+        horaires: ScheduleFrame ou liste d'horaires
+        depart_moy: Heure moyenne de départ (HH:MM)
+        arrivee_moy: Heure moyenne d'arrivée (HH:MM)
+
+    Returns:
+        Spécifications (ordre de GRAPHIQUES, pour st.vega_lite_chart), ou
+        None si aucune ligne n'est valide
+    """
+    series = preparer_series(horaires, depart_moy, arrivee_moy)
+    if series is None:
+        return None
+    seuil_pause = series.seuil_pause
+    dates_pause, durees_pause = reduire_points(series.dates, series.durees_pause)
+
+    return [
+        _spec(
+            "Évolution des heures d'arrivée",
+            *reduire_points(series.dates, series.heures_arrivee * 60),
+            {"y": {"field": "heures", "type": "quantitative", "title": "Heure d'arrivée (heures décimales)",
+                   "scale": {"zero": False}}},
+            {"type": "line", "point": True, "tooltip": True},
+            series.arrivee_moy, "Moyenne",
+        ),
+        _spec(
+            "Évolution des heures de départ",
+            *reduire_points(series.dates, series.heures_depart * 60),
+            {"y": {"field": "heures", "type": "quantitative", "title": "Heure de départ (heures décimales)",
+                   "scale": {"zero": False}}},
+            {"type": "line", "point": True, "color": "green", "tooltip": True},
+            series.depart_moy, "Moyenne",
+        ),
+        _spec(
+            "Durée des pauses au fil du temps",
+            dates_pause, durees_pause,
+            {
+                "y": {"field": "minutes", "type": "quantitative", "title": "Durée de la pause (minutes)"},
+                "color": {
+                    "field": "minutes", "type": "quantitative", "legend": None,
+                    "scale": {"scheme": "redyellowgreen", "domainMid": seuil_pause},
+                },
+            },
+            {"type": "bar", "tooltip": True},
+            seuil_pause, f"Seuil {seuil_pause} min",
+        ),
+    ]
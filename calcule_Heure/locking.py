@@ -0,0 +1,167 @@
+"""
+Verrouillage et validation groupée des écritures dans les fichiers de données.
+
+- exclusive_lock(): verrou consultatif (fcntl.flock) autour d'une écriture,
+  pour que les processus concurrents n'entrelacent pas leurs lignes.
+- GroupCommit: les écritures d'un même fichier arrivant pendant qu'un
+  groupe est en cours d'écriture sont écrites ensemble puis synchronisées
+  par un seul fsync.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: pas de verrou consultatif disponible
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def exclusive_lock(f: IO[Any]) -> Iterator[None]:
+    """
+    Pose un verrou exclusif consultatif sur un fichier ouvert.
+
+    Le verrou est bloquant et libéré à la sortie du bloc. Sans fcntl
+    (Windows), le bloc s'exécute sans verrou.
+
+    Args:
+        f: Fichier ouvert
+    """
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class _Ticket:
+    """Lot d'un écrivain en attente de validation."""
+
+    __slots__ = ("items", "done", "error")
+
+    def __init__(self, items: List[Any]):
+        self.items = items
+        self.done = False
+        self.error = None
+
+
+class GroupCommit:
+    """
+    Validation groupée des écritures concurrentes (threads) d'un même fichier.
+
+    Le premier écrivain devient meneur: il attend `window` secondes (aucune
+    attente si 0), puis transmet tous les lots en attente ensemble à la
+    fonction d'écriture (qui fait un seul fsync). Les lots arrivés pendant
+    cette écriture forment le groupe suivant. Chaque écrivain ne reprend la
+    main qu'une fois son lot écrit et synchronisé, ou avec l'erreur
+    rencontrée pour son propre lot.
+
+    La fonction d'écriture doit être tout ou rien: si un groupe échoue,
+    chaque lot est réécrit seul, pour que l'erreur n'atteigne que
+    l'écrivain dont le lot la provoque.
+    """
+
+    def __init__(self, window: float):
+        """
+        Initialise le regroupement.
+
+        Args:
+            window: Durée (secondes) pendant laquelle le meneur attend d'autres
+                lots avant d'écrire (0: écriture immédiate)
+        """
+        self.window = window
+        self._cond = threading.Condition()
+        self._pending: List[_Ticket] = []
+        self._leader_active = False
+
+    def submit(self, items: List[Any], flush: Callable[[List[Any]], None]) -> None:
+        """
+        Soumet un lot et attend qu'il soit écrit.
+
+        Args:
+            items: Éléments à écrire
+            flush: Fonction écrivant durablement une liste d'éléments,
+                entièrement ou pas du tout
+
+        Raises:
+            Exception: L'erreur levée par `flush` pour ce lot
+        """
+        ticket = _Ticket(items)
+        with self._cond:
+            self._pending.append(ticket)
+            if self._leader_active:
+                while not ticket.done:
+                    self._cond.wait()
+                self._raise_if_failed(ticket)
+                return
+            self._leader_active = True
+
+        try:
+            if self.window > 0:
+                time.sleep(self.window)
+            self._drain(flush)
+        except BaseException:
+            # Interruption du meneur: libérer les écrivains encore en attente
+            with self._cond:
+                self._leader_active = False
+                for orphan in self._pending:
+                    orphan.error = RuntimeError("Validation groupée interrompue")
+                    orphan.done = True
+                self._pending = []
+                self._cond.notify_all()
+            raise
+        self._raise_if_failed(ticket)
+
+    def _drain(self, flush: Callable[[List[Any]], None]) -> None:
+        """Écrit les lots en attente jusqu'à ce que la file soit vide, puis cède le rôle de meneur."""
+        while True:
+            with self._cond:
+                batch, self._pending = self._pending, []
+                if not batch:
+                    self._leader_active = False
+                    return
+            errors = self._flush(batch, flush)
+            logger.debug(f"Validation groupée de {len(batch)} lot(s)")
+            with self._cond:
+                for ticket, error in zip(batch, errors):
+                    ticket.error = error
+                    ticket.done = True
+                self._cond.notify_all()
+
+    @staticmethod
+    def _flush(batch: List[_Ticket], flush: Callable[[List[Any]], None]) -> List[Optional[Exception]]:
+        """
+        Écrit un groupe de lots; en cas d'échec, réécrit chaque lot seul.
+
+        Returns:
+            Erreur de chaque lot (None s'il a été écrit)
+        """
+        try:
+            flush([item for ticket in batch for item in ticket.items])
+            return [None] * len(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                return [e]
+            logger.warning(f"Échec de la validation groupée, lots réécrits séparément: {e}")
+
+        errors: List[Optional[Exception]] = []
+        for ticket in batch:
+            try:
+                flush(ticket.items)
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
+
+    @staticmethod
+    def _raise_if_failed(ticket: _Ticket) -> None:
+        if ticket.error is not None:
+            raise ticket.error
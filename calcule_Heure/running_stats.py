@@ -0,0 +1,269 @@
+"""
+Statistiques cumulées de horaires.csv, tenues à jour dans un fichier annexe.
+
+Le fichier annexe (horaires.csv.stats.json) conserve le nombre d'entrées,
+les sommes et les extrêmes des heures d'arrivée, de départ et des pauses,
+ainsi que la position (en octets) de la dernière ligne prise en compte.
+Une mise à jour ne décode donc que les lignes ajoutées depuis. La partie
+déjà comptée est vérifiée par son empreinte SHA-256 complète: si le CSV a
+été tronqué ou modifié par ailleurs, même à taille égale, les statistiques
+sont reconstruites à partir du fichier complet.
+"""
+import csv
+import json
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Optional, Tuple
+
+from calcule_Heure.constants import CSV_FILE, STATS_SIDECAR_SUFFIX
+from calcule_Heure.csv_handler import ScheduleRecord, _build_record
+from calcule_Heure.csv_utils import fingerprint, header_positions
+from calcule_Heure.exceptions import CSVError, ValidationError
+
+if TYPE_CHECKING:
+    from calcule_Heure.frame import ScheduleFrame
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_VERSION = 2
+MESURES = ("debut", "depart", "pause")
+
+
+class RunningStats:
+    """Nombre, sommes et extrêmes des horaires valides."""
+
+    __slots__ = ("nombre", "sommes", "minimums", "maximums")
+
+    def __init__(
+        self,
+        nombre: int = 0,
+        sommes: Optional[Dict[str, int]] = None,
+        minimums: Optional[Dict[str, Optional[int]]] = None,
+        maximums: Optional[Dict[str, Optional[int]]] = None
+    ):
+        self.nombre = nombre
+        self.sommes = sommes or {name: 0 for name in MESURES}
+        self.minimums = minimums or {name: None for name in MESURES}
+        self.maximums = maximums or {name: None for name in MESURES}
+
+    @staticmethod
+    def _mesures(record: ScheduleRecord) -> Tuple[int, int, int]:
+        return record.debut, record.depart, record.fin_pause - record.debut_pause
+
+    def add(self, record: ScheduleRecord) -> None:
+        """
+        Ajoute une entrée aux statistiques.
+
+        Args:
+            record: Entrée décodée
+        """
+        self.nombre += 1
+        for name, value in zip(MESURES, self._mesures(record)):
+            self.sommes[name] += value
+            low, high = self.minimums[name], self.maximums[name]
+            self.minimums[name] = value if low is None else min(low, value)
+            self.maximums[name] = value if high is None else max(high, value)
+
+    def merge(self, other: "RunningStats") -> None:
+        """
+        Ajoute les statistiques d'un autre ensemble d'entrées.
+
+        Args:
+            other: Statistiques à cumuler
+        """
+        self.nombre += other.nombre
+        for name in MESURES:
+            self.sommes[name] += other.sommes[name]
+            lows = [v for v in (self.minimums[name], other.minimums[name]) if v is not None]
+            highs = [v for v in (self.maximums[name], other.maximums[name]) if v is not None]
+            self.minimums[name] = min(lows) if lows else None
+            self.maximums[name] = max(highs) if highs else None
+
+    @classmethod
+    def from_frame(cls, frame: "ScheduleFrame") -> "RunningStats":
+        """
+        Calcule les statistiques d'un ScheduleFrame par réductions vectorisées.
+
+        Args:
+            frame: ScheduleFrame (seules les lignes valides sont comptées)
+
+        Returns:
+            Statistiques correspondantes
+        """
+        frame = frame.valid()
+        stats = cls(nombre=len(frame))
+        if not len(frame):
+            return stats
+        for name, column in zip(MESURES, (frame.debut, frame.depart, frame.duree_pause)):
+            stats.sommes[name] = int(column.sum(dtype="int64"))
+            stats.minimums[name] = int(column.min())
+            stats.maximums[name] = int(column.max())
+        return stats
+
+    def moyennes(self) -> Optional[Tuple[float, float, float]]:
+        """
+        Moyennes (départ, pause, arrivée) en minutes.
+
+        Returns:
+            Tuple de moyennes, ou None si aucune entrée
+        """
+        if self.nombre == 0:
+            return None
+        return (
+            self.sommes["depart"] / self.nombre,
+            self.sommes["pause"] / self.nombre,
+            self.sommes["debut"] / self.nombre,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Représentation sérialisable en JSON."""
+        return {
+            "nombre": self.nombre,
+            "sommes": self.sommes,
+            "minimums": self.minimums,
+            "maximums": self.maximums,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunningStats":
+        """Reconstruit les statistiques depuis to_dict()."""
+        return cls(
+            nombre=data["nombre"],
+            sommes=dict(data["sommes"]),
+            minimums=dict(data["minimums"]),
+            maximums=dict(data["maximums"]),
+        )
+
+
+class StatsSidecar:
+    """Fichier annexe de statistiques cumulées associé à un CSV d'horaires."""
+
+    def __init__(self, csv_path: Path = CSV_FILE):
+        """
+        Initialise le fichier annexe.
+
+        Args:
+            csv_path: Chemin vers le fichier CSV suivi
+        """
+        self.csv_path = csv_path
+        self.path = csv_path.with_name(csv_path.name + STATS_SIDECAR_SUFFIX)
+
+    def exists(self) -> bool:
+        """Vérifie si le fichier annexe existe."""
+        return self.path.exists()
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        """Lit l'état enregistré, ou None s'il est absent ou illisible."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (IOError, ValueError) as e:
+            logger.warning(f"Fichier de statistiques illisible, reconstruction: {e}")
+            return None
+        if state.get("version") != SIDECAR_VERSION:
+            return None
+        return state
+
+    def _save(self, state: Dict[str, Any]) -> None:
+        """Écrit l'état de façon atomique (fichier temporaire puis renommage)."""
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except IOError as e:
+            logger.warning(f"Impossible d'enregistrer les statistiques: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def _consume(self, f: BinaryIO, stats: RunningStats, positions: List[int], offset: int) -> int:
+        """
+        Ajoute aux statistiques les lignes complètes situées après `offset`.
+
+        Returns:
+            Nouvelle position (fin de la dernière ligne complète lue)
+        """
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                # Ligne en cours d'écriture: elle sera lue à la prochaine mise à jour
+                break
+            offset += len(line)
+            try:
+                row = next(csv.reader([line.decode("utf-8")]), None)
+                if row:
+                    stats.add(_build_record([row[i] for i in positions]))
+            except (IndexError, ValueError, ValidationError, csv.Error) as e:
+                logger.warning(f"Ligne invalide ignorée: {e}")
+        return offset
+
+    def _rebuild(self, f: BinaryIO) -> Tuple[RunningStats, int]:
+        """Recalcule les statistiques sur l'ensemble des lignes complètes du fichier."""
+        # Import local: numpy n'est chargé que pour une reconstruction complète,
+        # pas pour les mises à jour incrémentales qui suivent chaque saisie
+        from calcule_Heure.frame import ScheduleFrame
+
+        f.seek(0)
+        raw = f.read()
+        end = raw.rfind(b"\n") + 1
+        stats = RunningStats.from_frame(ScheduleFrame._parse_bytes(raw[:end]))
+        logger.info(f"Statistiques reconstruites sur {stats.nombre} entrées")
+        return stats, end
+
+    def update(self) -> RunningStats:
+        """
+        Met les statistiques à jour et retourne leur état courant.
+
+        Seules les lignes ajoutées depuis la dernière mise à jour sont
+        décodées. La partie déjà comptée du CSV est relue et hachée en
+        entier: si elle a été tronquée ou modifiée, même sans changer de
+        taille, les statistiques sont reconstruites.
+
+        Returns:
+            Statistiques des entrées valides du CSV
+
+        Raises:
+            CSVError: Si le CSV ne peut pas être lu
+        """
+        if not self.csv_path.exists():
+            return RunningStats()
+
+        try:
+            stat = self.csv_path.stat()
+            state = self._load()
+            if (
+                state is not None
+                and state["taille"] == stat.st_size
+                and state["mtime_ns"] == stat.st_mtime_ns
+            ):
+                return RunningStats.from_dict(state["stats"])
+
+            with open(self.csv_path, 'rb') as f:
+                positions, header_size = header_positions(f)
+                offset = state["offset"] if state is not None else 0
+                empreinte = None
+                if state is not None and positions and header_size <= offset <= stat.st_size:
+                    empreinte = fingerprint(f, offset)
+                if empreinte is None or empreinte.hexdigest() != state["empreinte"]:
+                    stats, offset = self._rebuild(f)
+                    empreinte = fingerprint(f, offset)
+                else:
+                    # Ajout pur: décoder les nouvelles lignes et prolonger l'empreinte
+                    stats = RunningStats.from_dict(state["stats"])
+                    debut, offset = offset, self._consume(f, stats, positions, offset)
+                    empreinte = fingerprint(f, offset, debut, empreinte)
+
+                self._save({
+                    "version": SIDECAR_VERSION,
+                    "offset": offset,
+                    "taille": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "empreinte": empreinte.hexdigest(),
+                    "stats": stats.to_dict(),
+                })
+                return stats
+        except IOError as e:
+            logger.error(f"Erreur de lecture CSV: {e}")
+            raise CSVError(f"Impossible de lire le fichier CSV: {e}")
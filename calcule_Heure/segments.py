@@ -0,0 +1,184 @@
+"""
+Archive des mois terminés de horaires.csv en segments compressés.
+
+Les lignes des mois précédant le mois courant sont déplacées par
+CSVHandler.rotate_segments() dans un répertoire horaires.csv.segments/:
+un fichier gzip par mois (AAAA-MM.csv.gz, CSV complet avec en-tête) et un
+manifeste (manifest.json) qui conserve pour chaque segment un résumé
+précalculé: nombre de lignes, bornes des dates de saisie et statistiques
+cumulées (nombre, sommes, extrêmes). Les agrégats sur l'historique
+s'obtiennent à partir de ces résumés; un segment n'est décompressé que
+lorsque ses lignes sont réellement lues.
+"""
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from calcule_Heure.constants import CSV_FILE, SEGMENTS_SUFFIX
+from calcule_Heure.csv_utils import write_atomic
+from calcule_Heure.exceptions import CSVError
+from calcule_Heure.running_stats import RunningStats
+from calcule_Heure.timecodec import format_datetime
+
+if TYPE_CHECKING:
+    from calcule_Heure.frame import ScheduleFrame
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def month_of(timestamp: int) -> str:
+    """Mois (AAAA-MM) d'une date de saisie en secondes depuis 1970."""
+    return format_datetime(timestamp)[:7]
+
+
+class SegmentArchive:
+    """Segments mensuels compressés associés à un CSV d'horaires."""
+
+    def __init__(self, csv_path: Path = CSV_FILE):
+        """
+        Initialise l'archive.
+
+        Args:
+            csv_path: Chemin vers le fichier CSV courant
+        """
+        self.csv_path = csv_path
+        self.directory = csv_path.with_name(csv_path.name + SEGMENTS_SUFFIX)
+        self.manifest_path = self.directory / "manifest.json"
+
+    def segments(self) -> List[Dict[str, Any]]:
+        """
+        Résumés des segments, du plus ancien au plus récent.
+
+        Returns:
+            Entrées du manifeste: "mois", "fichier", "lignes", "debut" et
+            "fin" (dates extrêmes des lignes valides, ou None), "stats"
+
+        Raises:
+            CSVError: Si le manifeste est illisible
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return []
+        except (IOError, ValueError) as e:
+            raise CSVError(f"Manifeste des segments illisible: {e}")
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise CSVError(f"Version du manifeste des segments non prise en charge: {self.manifest_path}")
+        return sorted(manifest["segments"], key=lambda entry: entry["mois"])
+
+    def stats(self) -> RunningStats:
+        """Statistiques cumulées de tous les segments, calculées sur les résumés."""
+        stats = RunningStats()
+        for entry in self.segments():
+            stats.merge(RunningStats.from_dict(entry["stats"]))
+        return stats
+
+    def row_count(self) -> int:
+        """Nombre de lignes (valides ou non) de tous les segments, d'après les résumés."""
+        return sum(entry["lignes"] for entry in self.segments())
+
+    def read_bytes(self, entry: Dict[str, Any]) -> bytes:
+        """
+        Contenu décompressé d'un segment (en-tête CSV puis lignes).
+
+        Raises:
+            CSVError: Si le segment est illisible
+        """
+        try:
+            return gzip.decompress((self.directory / entry["fichier"]).read_bytes())
+        except (IOError, EOFError, gzip.BadGzipFile) as e:
+            logger.error(f"Segment illisible {entry['fichier']}: {e}")
+            raise CSVError(f"Impossible de lire le segment {entry['fichier']}: {e}")
+
+    def load_frame(self, entries: Optional[List[Dict[str, Any]]] = None) -> "ScheduleFrame":
+        """
+        Décompresse et décode des segments en un seul ScheduleFrame.
+
+        Args:
+            entries: Segments à lire (tous par défaut)
+
+        Returns:
+            ScheduleFrame, lignes invalides masquées
+        """
+        # Import local: numpy n'est chargé que si des lignes archivées sont lues
+        from calcule_Heure.frame import ScheduleFrame
+
+        if entries is None:
+            entries = self.segments()
+        return ScheduleFrame.concatenate(
+            [ScheduleFrame._parse_bytes(self.read_bytes(entry)) for entry in entries]
+        )
+
+    def add(self, header: bytes, months: Dict[str, List[bytes]]) -> None:
+        """
+        Ajoute des lignes aux segments de leurs mois et met les résumés à jour.
+
+        Si le segment d'un mois existe déjà (saisie ancienne importée après
+        la rotation), les lignes y sont ajoutées sous forme d'un nouveau
+        membre gzip. Le manifeste est réécrit une fois, après les segments.
+        L'appelant doit tenir le verrou du fichier CSV courant.
+
+        Args:
+            header: Ligne d'en-tête du CSV (avec fin de ligne)
+            months: Lignes CSV complètes (avec fins de ligne) par mois (AAAA-MM)
+
+        Raises:
+            IOError: Si l'écriture échoue
+        """
+        entries = {entry["mois"]: entry for entry in self.segments()}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for month, lines in sorted(months.items()):
+            entries[month] = self._add_month(entries.get(month), month, header, lines)
+
+        manifest = {"version": MANIFEST_VERSION, "segments": sorted(entries.values(), key=lambda e: e["mois"])}
+        write_atomic(self.manifest_path, json.dumps(manifest, ensure_ascii=False).encode("utf-8"))
+
+    def _add_month(
+        self,
+        previous: Optional[Dict[str, Any]],
+        month: str,
+        header: bytes,
+        lines: List[bytes]
+    ) -> Dict[str, Any]:
+        """Écrit les lignes d'un mois dans son segment et retourne le résumé à jour."""
+        from calcule_Heure.frame import ScheduleFrame
+
+        body = b"".join(lines)
+        frame = ScheduleFrame._parse_bytes(header + body).valid()
+        summary = {
+            "mois": month,
+            "fichier": f"{month}.csv.gz",
+            "lignes": len(lines),
+            "debut": int(frame.horodatage.min()) if len(frame) else None,
+            "fin": int(frame.horodatage.max()) if len(frame) else None,
+            "stats": RunningStats.from_frame(frame).to_dict(),
+        }
+
+        path = self.directory / summary["fichier"]
+        if previous is None or not path.exists():
+            write_atomic(path, gzip.compress(header + body))
+        else:
+            with open(path, 'ab') as f:
+                f.write(gzip.compress(body))
+                f.flush()
+                os.fsync(f.fileno())
+            stats = RunningStats.from_dict(previous["stats"])
+            stats.merge(RunningStats.from_dict(summary["stats"]))
+            bornes = [
+                b for b in (previous["debut"], previous["fin"], summary["debut"], summary["fin"])
+                if b is not None
+            ]
+            summary.update(
+                lignes=previous["lignes"] + summary["lignes"],
+                debut=min(bornes) if bornes else None,
+                fin=max(bornes) if bornes else None,
+                stats=stats.to_dict(),
+            )
+        logger.info(f"{len(lines)} ligne(s) archivée(s) dans {path}")
+        return summary
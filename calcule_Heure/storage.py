@@ -0,0 +1,84 @@
+"""
+Interface commune des supports de stockage des horaires.
+
+Deux implémentations:
+- csv_handler.CSVHandler: horaires.csv, format d'échange lisible
+- binary_store.BinaryStore: enregistrements binaires de taille fixe,
+  projetés en mémoire directement dans un ScheduleFrame
+
+open_store() choisit l'implémentation d'après l'extension du fichier.
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Optional, Sequence
+
+from calcule_Heure.constants import BINARY_SUFFIX
+
+if TYPE_CHECKING:
+    from calcule_Heure.csv_handler import ScheduleRecord
+    from calcule_Heure.frame import ScheduleFrame
+
+
+class ScheduleStore(ABC):
+    """Support de stockage des horaires (fichier unique, ajouts en fin)."""
+
+    file_path: Path
+
+    @abstractmethod
+    def exists(self) -> bool:
+        """Vérifie si le fichier de données existe."""
+
+    @abstractmethod
+    def iter_records(self) -> Iterator["ScheduleRecord"]:
+        """Parcourt les entrées valides, dans l'ordre du fichier."""
+
+    @abstractmethod
+    def read_range(self, start: datetime, end: datetime) -> List["ScheduleRecord"]:
+        """Entrées valides dont la date de saisie est dans [start, end[."""
+
+    @abstractmethod
+    def load_frame(self) -> "ScheduleFrame":
+        """Charge toutes les entrées en colonnes NumPy."""
+
+    @abstractmethod
+    def write_many(self, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Ajoute plusieurs entrées.
+
+        Args:
+            rows: Tuples (heure_debut, debut_pause, fin_pause, heure_depart)
+                au format HH:MM, suivis éventuellement de la date de saisie
+
+        Returns:
+            Nombre d'entrées écrites
+        """
+
+    def write(
+        self,
+        start_time: str,
+        break_start: str,
+        break_end: str,
+        end_time: str,
+        timestamp: Optional[datetime] = None
+    ) -> None:
+        """Ajoute une entrée (voir write_many)."""
+        self.write_many([(start_time, break_start, break_end, end_time, timestamp)])
+
+
+def open_store(file_path: Path) -> ScheduleStore:
+    """
+    Ouvre le support de stockage correspondant à un fichier.
+
+    Args:
+        file_path: Fichier de données (BINARY_SUFFIX: binaire, sinon CSV)
+
+    Returns:
+        BinaryStore ou CSVHandler
+    """
+    # Imports locaux: les implémentations dépendent de ce module
+    if Path(file_path).suffix == BINARY_SUFFIX:
+        from calcule_Heure.binary_store import BinaryStore
+        return BinaryStore(Path(file_path))
+    from calcule_Heure.csv_handler import CSVHandler
+    return CSVHandler(Path(file_path))
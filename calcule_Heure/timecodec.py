@@ -0,0 +1,161 @@
+"""
+Conversion des heures et dates de l'application vers des entiers, et retour.
+
+Remplace datetime.strptime/strftime pour les deux formats utilisés:
+- TIME_FORMAT ("HH:MM") <-> minutes depuis minuit
+- DATETIME_FORMAT ("YYYY-MM-DD HH:MM:SS") <-> secondes depuis 1970
+  (heure locale, sans fuseau)
+
+Les valeurs sont validées pendant le décodage; toute chaîne mal formée lève
+TimeFormatError.
+"""
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+from calcule_Heure.exceptions import TimeFormatError
+
+MINUTES_PER_DAY = 24 * 60
+SECONDS_PER_DAY = 24 * 3600
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+_ONE_SECOND = timedelta(seconds=1)
+
+# "HH:MM" canonique -> minutes: une recherche dans un dictionnaire suffit
+# pour toutes les heures écrites par l'application.
+_MINUTES_BY_TIME = {
+    f"{h:02d}:{m:02d}": h * 60 + m for h in range(24) for m in range(60)
+}
+_TIME_BY_MINUTES = {minutes: text for text, minutes in _MINUTES_BY_TIME.items()}
+_TWO_DIGITS = {f"{n:02d}": n for n in range(100)}
+
+
+def parse_time(value: str) -> int:
+    """
+    Convertit une heure HH:MM en minutes depuis minuit.
+
+    Comme strptime("%H:%M"), les heures et minutes sur un chiffre sont
+    acceptées ("8:05", "08:5").
+
+    Args:
+        value: Heure au format HH:MM
+
+    Returns:
+        Minutes depuis minuit (0 à 1439)
+
+    Raises:
+        TimeFormatError: Si le format ou les valeurs sont invalides
+    """
+    minutes = _MINUTES_BY_TIME.get(value)
+    if minutes is not None:
+        return minutes
+    try:
+        hours, sep, mins = value.partition(":")
+    except AttributeError:
+        raise TimeFormatError(f"Heure invalide {value!r}")
+    if (
+        sep
+        and 0 < len(hours) <= 2 and hours.isascii() and hours.isdigit()
+        and 0 < len(mins) <= 2 and mins.isascii() and mins.isdigit()
+    ):
+        h, m = int(hours), int(mins)
+        if h < 24 and m < 60:
+            return h * 60 + m
+    raise TimeFormatError(f"Heure invalide {value!r}")
+
+
+def format_time(minutes: int) -> str:
+    """
+    Convertit des minutes depuis minuit en chaîne HH:MM.
+
+    Les valeurs hors de la journée sont ramenées sur 24 h (comme l'addition
+    d'un timedelta à une heure).
+
+    Args:
+        minutes: Minutes depuis minuit
+
+    Returns:
+        Chaîne au format HH:MM
+    """
+    return _TIME_BY_MINUTES[minutes % MINUTES_PER_DAY]
+
+
+def format_duration(minutes: float) -> str:
+    """
+    Formate une durée en minutes (éventuellement fractionnaire) en HH:MM.
+
+    Les heures ne sont pas ramenées sur 24 h; les secondes sont tronquées.
+
+    Args:
+        minutes: Durée en minutes
+
+    Returns:
+        Chaîne au format HH:MM
+    """
+    # Arrondi à la microseconde, comme timedelta(minutes=...)
+    total_seconds = int(round(minutes * 60, 6))
+    return f"{total_seconds // 3600:02d}:{(total_seconds % 3600) // 60:02d}"
+
+
+@lru_cache(maxsize=16384)
+def _format_date(days: int) -> str:
+    """Date YYYY-MM-DD pour un nombre de jours depuis 1970."""
+    return date.fromordinal(days + _EPOCH_ORDINAL).isoformat()
+
+
+def parse_datetime(value: str) -> int:
+    """
+    Convertit une date de saisie YYYY-MM-DD HH:MM:SS en secondes depuis 1970.
+
+    Args:
+        value: Date au format DATETIME_FORMAT
+
+    Returns:
+        Secondes depuis le 1970-01-01 00:00:00
+
+    Raises:
+        TimeFormatError: Si le format ou les valeurs sont invalides
+    """
+    # Forme stricte "YYYY-MM-DD HH:MM:SS"; fromisoformat (en C) valide les plages
+    if (
+        not isinstance(value, str) or len(value) != 19 or not value.isascii()
+        or value[4] != "-" or value[7] != "-" or value[10] != " "
+        or value[13] != ":" or value[16] != ":"
+    ):
+        raise TimeFormatError(f"Date invalide {value!r}")
+    try:
+        return (datetime.fromisoformat(value) - _EPOCH) // _ONE_SECOND
+    except ValueError as e:
+        raise TimeFormatError(f"Date invalide {value!r}: {e}")
+
+
+def format_datetime(timestamp: int) -> str:
+    """
+    Convertit des secondes depuis 1970 en chaîne YYYY-MM-DD HH:MM:SS.
+
+    Args:
+        timestamp: Secondes depuis le 1970-01-01 00:00:00
+
+    Returns:
+        Chaîne au format DATETIME_FORMAT
+    """
+    days, seconds = divmod(timestamp, SECONDS_PER_DAY)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{_format_date(days)} {hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def to_timestamp(value: datetime) -> int:
+    """
+    Convertit un datetime (sans fuseau) en secondes depuis 1970.
+
+    Les microsecondes sont ignorées, comme dans DATETIME_FORMAT.
+    """
+    return (value.toordinal() - _EPOCH_ORDINAL) * SECONDS_PER_DAY + (
+        value.hour * 3600 + value.minute * 60 + value.second
+    )
+
+
+def from_timestamp(timestamp: int) -> datetime:
+    """Convertit des secondes depuis 1970 en datetime (sans fuseau)."""
+    return _EPOCH + timedelta(seconds=timestamp)
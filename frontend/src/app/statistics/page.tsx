@@ -23,7 +23,7 @@ export default function StatisticsPage() {
     try {
       const [stats, charts, configData] = await Promise.all([
         api.getStatistics(),
-        api.getChartsData(),
+        api.getChartsData({ granularity: 'day', max_points: 365 }),
         api.getConfig(),
       ]);
       setStatistics(stats);
@@ -11,6 +11,7 @@ import type {
   UpdateConfigInput,
   Statistics,
   ChartsData,
+  ChartsQuery,
 } from '@/types';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
@@ -144,8 +145,12 @@ export const statisticsApi = {
   /**
    * Get charts data
    */
-  async getChartsData(): Promise<ChartsData> {
-    return request<ChartsData>('/statistics/charts');
+  async getChartsData(query?: ChartsQuery): Promise<ChartsData> {
+    const params = new URLSearchParams();
+    if (query?.granularity) params.set('granularity', query.granularity);
+    if (query?.max_points) params.set('max_points', String(query.max_points));
+    const search = params.toString();
+    return request<ChartsData>(`/statistics/charts${search ? `?${search}` : ''}`);
   },
 };
 
@@ -48,9 +48,23 @@ export interface ChartDataPoint {
   heure_depart?: string;
   duree_pause?: number;
   moyenne?: string;
+  nombre?: number;
+}
+
+export type ChartsGranularity = 'day' | 'week' | 'month';
+
+export interface ChartsQuery {
+  granularity?: ChartsGranularity;
+  max_points?: number;
 }
 
 export interface ChartsData {
+  granularite?: ChartsGranularity;
+  moyennes?: {
+    arrivee: string;
+    depart: string;
+    pause_minutes: number;
+  };
   arrivee: ChartDataPoint[];
   depart: ChartDataPoint[];
   pause: ChartDataPoint[];
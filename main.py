@@ -1,17 +1,30 @@
 """
 Version ligne de commande de l'application de gestion des horaires.
 Pour la version web, utilisez : streamlit run app.py
+
+Usage:
+    python main.py                       # menu interactif
+    python main.py import saisies.csv    # import groupé depuis un fichier
+    cat saisies.csv | python main.py import -
+    python main.py convert calcule_Heure/horaires.csv horaires.bin   # CSV -> binaire
+    python main.py convert horaires.bin export.csv                   # binaire -> CSV
+    python main.py export graphiques/ --format svg   # graphiques en fichiers, sans interface
+    python main.py rotate                # archive les mois terminés en segments compressés
 """
+import argparse
+import csv
 import sys
 import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'calcule_Heure'))
+from pathlib import Path
 
-from graphique import generer_graphiques
-from add_data import ajouter_donnees
-from colcul import calculer_moyennes
-from open_csv import lire_horaires
-from utiles import afficher_resume
-import matplotlib.pyplot as plt
+from calcule_Heure.graphique import FORMATS, exporter_graphiques, generer_graphiques
+from calcule_Heure.add_data import ajouter_donnees, ScheduleManager
+from calcule_Heure.colcul import calculer_moyennes
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.utiles import afficher_resume
+from calcule_Heure.constants import BINARY_SUFFIX
+from calcule_Heure.exceptions import HorairesException, TimeFormatError
+from calcule_Heure.timecodec import from_timestamp, parse_datetime
 
 fichier_csv = 'calcule_Heure/horaires.csv'
 
@@ -30,14 +43,13 @@ def menu():
             print(f"Les données ont été ajoutées dans '{fichier_csv}'.")
 
         elif arge[0] == "2":
-            try:
-                horaires = lire_horaires(fichier_csv)
-            except FileNotFoundError:
+            if not os.path.exists(fichier_csv):
                 print(f"Le fichier '{fichier_csv}' est introuvable.")
                 continue
+            horaires = CSVHandler(Path(fichier_csv)).load_frame()
 
             afficher_resume(horaires)
-            depart_moy, pause_moy, arrivee_moy = calculer_moyennes(horaires)
+            depart_moy, pause_moy, arrivee_moy = calculer_moyennes(Path(fichier_csv))
 
             if depart_moy and pause_moy:
                 print(f"\nHeure moyenne d'arrivée : {arrivee_moy}")
@@ -46,11 +58,152 @@ def menu():
 
             fig1, fig2, fig3 = generer_graphiques(horaires, depart_moy, arrivee_moy)
             if fig1 and fig2 and fig3:
+                # Import local: la pile de tracé n'est chargée que pour cette option
+                import matplotlib.pyplot as plt
                 plt.show()
         else:
             print("Au revoir!")
             break
 
+# ----------------- IMPORT GROUPÉ -----------------
+def lire_saisies(flux):
+    """
+    Lit les saisies à importer, une par ligne CSV.
+
+    Formats acceptés: "début,début pause,fin pause", précédé éventuellement
+    de la date de saisie (YYYY-MM-DD HH:MM:SS) et suivi éventuellement d'une
+    heure de départ, ignorée puisqu'elle est recalculée (un horaires.csv peut
+    donc être réimporté tel quel). Sur 4 colonnes, la première est une date
+    si elle en a la forme (contient "-"), sinon l'heure de début. Une ligne
+    d'en-tête est ignorée.
+
+    Returns:
+        Tuple (saisies, numéros de ligne correspondants, erreurs de lecture)
+    """
+    saisies, numeros, erreurs = [], [], []
+    for numero, row in enumerate(csv.reader(flux), start=1):
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
+            continue
+        if numero == 1 and not cells[0][:1].isdigit():
+            continue  # En-tête
+        try:
+            if len(cells) == 5 or (len(cells) == 4 and "-" in cells[0]):
+                saisies.append((*cells[1:4], from_timestamp(parse_datetime(cells[0]))))
+            elif len(cells) in (3, 4):
+                saisies.append(tuple(cells[:3]))
+            else:
+                raise ValueError(f"{len(cells)} colonnes au lieu de 3 à 5")
+        except (ValueError, TimeFormatError) as e:
+            erreurs.append((numero, str(e)))
+            continue
+        numeros.append(numero)
+    return saisies, numeros, erreurs
+
+
+def importer(source):
+    """Importe en une fois les saisies d'un fichier (ou de l'entrée standard avec '-')."""
+    if source == "-":
+        saisies, numeros, erreurs = lire_saisies(sys.stdin)
+    else:
+        with open(source, newline='', encoding='utf-8') as flux:
+            saisies, numeros, erreurs = lire_saisies(flux)
+
+    resultat = ScheduleManager().add_schedules(saisies)
+    erreurs += [(numeros[e["index"]], e["detail"]) for e in resultat["errors"]]
+
+    print(f"{resultat['inserted']} saisie(s) importée(s) dans '{fichier_csv}'.")
+    for numero, detail in sorted(erreurs):
+        print(f"Ligne {numero} ignorée : {detail}", file=sys.stderr)
+    return 1 if erreurs else 0
+
+
+# ----------------- CONVERSION -----------------
+def convertir(source, destination):
+    """Convertit entre CSV et stockage binaire, selon l'extension de la destination."""
+    from calcule_Heure.binary_store import convertir_binaire_en_csv, convertir_csv_en_binaire
+
+    source, destination = Path(source), Path(destination)
+    try:
+        if destination.suffix == BINARY_SUFFIX:
+            nombre = convertir_csv_en_binaire(source, destination)
+        else:
+            nombre = convertir_binaire_en_csv(source, destination)
+    except HorairesException as e:
+        print(f"Conversion impossible : {e}", file=sys.stderr)
+        return 1
+    print(f"{nombre} entrée(s) converties de '{source}' vers '{destination}'.")
+    return 0
+
+
+# ----------------- ARCHIVAGE -----------------
+def archiver():
+    """Archive les mois terminés du CSV dans leurs segments compressés."""
+    try:
+        nombre = CSVHandler(Path(fichier_csv)).rotate_segments()
+    except HorairesException as e:
+        print(f"Archivage impossible : {e}", file=sys.stderr)
+        return 1
+    print(f"{nombre} entrée(s) archivée(s) depuis '{fichier_csv}'.")
+    return 0
+
+
+# ----------------- EXPORT DES GRAPHIQUES -----------------
+def exporter(destination, format):
+    """Exporte les graphiques dans un répertoire, sans interface graphique."""
+    if not os.path.exists(fichier_csv):
+        print(f"Le fichier '{fichier_csv}' est introuvable.", file=sys.stderr)
+        return 1
+    horaires = CSVHandler(Path(fichier_csv)).load_frame()
+    depart_moy, _, arrivee_moy = calculer_moyennes(Path(fichier_csv))
+    fichiers = exporter_graphiques(horaires, depart_moy, arrivee_moy, Path(destination), format)
+    if fichiers is None:
+        print("Aucune donnée valide pour générer les graphiques.", file=sys.stderr)
+        return 1
+    for fichier in fichiers:
+        print(f"Graphique exporté : {fichier}")
+    return 0
+
+
 # ----------------- MAIN -----------------
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gestion des horaires en ligne de commande")
+    subparsers = parser.add_subparsers(dest="commande")
+    parser_import = subparsers.add_parser(
+        "import", help="Importer des saisies en une fois (départs calculés en lot)"
+    )
+    parser_import.add_argument(
+        "source", nargs="?", default="-",
+        help="Fichier CSV à importer ('-' pour l'entrée standard, par défaut)"
+    )
+    parser_convert = subparsers.add_parser(
+        "convert", help=f"Convertir entre CSV et stockage binaire ({BINARY_SUFFIX})"
+    )
+    parser_convert.add_argument("source", help="Fichier à convertir")
+    parser_convert.add_argument(
+        "destination", help=f"Fichier à écrire (binaire si l'extension est {BINARY_SUFFIX}, sinon CSV)"
+    )
+    parser_export = subparsers.add_parser(
+        "export", help="Exporter les graphiques en fichiers (sans interface graphique)"
+    )
+    parser_export.add_argument("destination", help="Répertoire où écrire arrivee, depart et pauses")
+    parser_export.add_argument("--format", choices=FORMATS, default="png", help="Format des images (png par défaut)")
+    subparsers.add_parser(
+        "rotate", help="Archiver les mois terminés en segments compressés (fichier courant réduit au mois en cours)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.commande == "import":
+        return importer(args.source)
+    if args.commande == "convert":
+        return convertir(args.source, args.destination)
+    if args.commande == "export":
+        return exporter(args.destination, args.format)
+    if args.commande == "rotate":
+        return archiver()
     menu()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""
+Tests du package calcule_Heure (version Streamlit / ligne de commande).
+
+Lancement (depuis la racine du dépôt):
+    python -m pytest tests
+"""
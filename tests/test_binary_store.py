@@ -0,0 +1,104 @@
+"""
+Tests du stockage binaire et des conversions CSV <-> binaire.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from calcule_Heure.binary_store import (
+    HEADER_SIZE,
+    RECORD_DTYPE,
+    BinaryStore,
+    convertir_binaire_en_csv,
+    convertir_csv_en_binaire,
+)
+from calcule_Heure.colcul import calculer_moyennes
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.exceptions import StorageError
+from calcule_Heure.storage import open_store
+
+DEBUT = datetime(2024, 1, 1, 8, 30, 15)
+
+
+def _saisies(jours):
+    return [
+        (f"{7 + i % 3:02d}:{(i * 7) % 60:02d}", "12:00", f"12:{30 + i % 30:02d}", "16:05", DEBUT + timedelta(days=i))
+        for i in range(jours)
+    ]
+
+
+def _csv(tmp_path, saisies):
+    path = tmp_path / "reference.csv"
+    CSVHandler(path).write_many(saisies)
+    return path
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "horaires.csv"
+    CSVHandler(path).write_many(_saisies(40))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("pas une date,08:00,12:00,12:45,15:55\n")
+    return path
+
+
+def test_ecriture_et_lecture(tmp_path):
+    """Les entrées écrites se relisent à l'identique, par toutes les méthodes."""
+    path = tmp_path / "horaires.bin"
+    store = open_store(path)
+    assert isinstance(store, BinaryStore)
+    store.write_many(_saisies(10))
+    store.write_many(_saisies(15)[10:])
+
+    assert path.stat().st_size == HEADER_SIZE + 15 * RECORD_DTYPE.itemsize
+    attendus = list(CSVHandler(_csv(tmp_path, _saisies(15))).iter_records())
+    assert list(store.iter_records()) == attendus
+    periode = store.read_range(DEBUT + timedelta(days=3), DEBUT + timedelta(days=5))
+    assert periode == attendus[3:5]
+
+
+def test_aller_retour_csv_binaire(tmp_path, csv_path):
+    """CSV -> binaire -> CSV conserve toutes les entrées valides."""
+    binaire = tmp_path / "horaires.bin"
+    retour = tmp_path / "retour.csv"
+    assert convertir_csv_en_binaire(csv_path, binaire) == 40
+    assert convertir_binaire_en_csv(binaire, retour) == 40
+
+    assert list(CSVHandler(retour).iter_records()) == list(CSVHandler(csv_path).iter_records())
+    assert list(BinaryStore(binaire).iter_records()) == list(CSVHandler(csv_path).iter_records())
+    assert calculer_moyennes(binaire) == calculer_moyennes(csv_path)
+
+
+def test_enregistrement_incomplet_ignore(tmp_path):
+    """Un enregistrement tronqué est ignoré à la lecture et retiré au prochain ajout."""
+    path = tmp_path / "horaires.bin"
+    store = BinaryStore(path)
+    store.write_many(_saisies(3))
+    with open(path, "ab") as f:
+        f.write(b"\x01" * 7)
+
+    assert len(store.load_frame()) == 3
+    store.write_many(_saisies(4)[3:])
+    assert path.stat().st_size == HEADER_SIZE + 4 * RECORD_DTYPE.itemsize
+    assert len(store.load_frame()) == 4
+
+
+def test_fichier_non_reconnu(tmp_path):
+    path = tmp_path / "horaires.bin"
+    path.write_bytes(b"PASBIN\0\0" + b"\0" * 40)
+    with pytest.raises(StorageError):
+        BinaryStore(path).load_frame()
+    with pytest.raises(StorageError):
+        BinaryStore(path).write_many(_saisies(1))
+
+
+def test_conversion_refusee_si_segments(tmp_path, csv_path):
+    """Le binaire n'écrase pas un CSV dont des mois sont archivés en segments."""
+    binaire = tmp_path / "horaires.bin"
+    convertir_csv_en_binaire(csv_path, binaire)
+    CSVHandler(csv_path).rotate_segments(now=datetime(2024, 3, 1))
+    avant = csv_path.read_bytes()
+
+    with pytest.raises(StorageError):
+        convertir_binaire_en_csv(binaire, csv_path)
+    assert csv_path.read_bytes() == avant
@@ -0,0 +1,59 @@
+"""
+Tests du cache de configuration (ConfigurationManager).
+"""
+import json
+
+import pytest
+
+import calcule_Heure.config as config_module
+from calcule_Heure.config import ConfigurationManager
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    """config.json temporaire, cache vidé avant et après chaque test."""
+    path = tmp_path / "config.json"
+    monkeypatch.setattr(config_module, "CONFIG_FILE", path)
+    ConfigurationManager.clear_cache()
+    yield path
+    ConfigurationManager.clear_cache()
+
+
+def _ecrire(path, **valeurs):
+    path.write_text(json.dumps(valeurs), encoding="utf-8")
+
+
+def test_lecture_unique_tant_que_le_fichier_ne_change_pas(config_path, monkeypatch):
+    _ecrire(config_path, seuil_pause_minutes=30)
+    lectures = []
+    lire = ConfigurationManager._read.__func__
+
+    def compter(cls):
+        lectures.append(1)
+        return lire(cls)
+
+    monkeypatch.setattr(ConfigurationManager, "_read", classmethod(compter))
+    for _ in range(5):
+        assert ConfigurationManager.get_break_threshold() == 30
+    assert len(lectures) == 1
+
+
+def test_modification_externe_visible(config_path):
+    _ecrire(config_path, seuil_pause_minutes=30)
+    assert ConfigurationManager.get_break_threshold() == 30
+    _ecrire(config_path, seuil_pause_minutes=120)
+    assert ConfigurationManager.get_break_threshold() == 120
+
+
+def test_sauvegarde_visible(config_path):
+    assert ConfigurationManager.get_break_threshold() == ConfigurationManager.DEFAULT_CONFIG["seuil_pause_minutes"]
+    ConfigurationManager.update(break_threshold=50)
+    assert ConfigurationManager.get_break_threshold() == 50
+    assert json.loads(config_path.read_text(encoding="utf-8"))["seuil_pause_minutes"] == 50
+
+
+def test_copie_modifiable(config_path):
+    """Modifier la configuration retournée ne modifie pas le cache."""
+    config = ConfigurationManager.load()
+    config["seuil_pause_minutes"] = 1
+    assert ConfigurationManager.load()["seuil_pause_minutes"] != 1
@@ -0,0 +1,74 @@
+"""
+Tests de la lecture en flux des entrées décodées (CSVHandler.iter_records).
+"""
+from datetime import datetime
+
+import pytest
+
+from calcule_Heure.csv_handler import CSVHandler, ScheduleRecord, parse_record
+from calcule_Heure.exceptions import CSVError, ValidationError
+from calcule_Heure.timecodec import to_timestamp
+
+EN_TETE = "Date de saisie,Heure début,Heure début pause,Heure fin pause,Heure départ calculée\n"
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "horaires.csv"
+    path.write_text(
+        EN_TETE
+        + "2024-11-01 08:30:15,08:00,12:00,12:45,15:55\n"
+        + "2024-11-02 08:31:22,8:15,12:15,13:00,16:10\n"
+        + "pas une date,08:00,12:00,12:45,15:55\n"
+        + "2024-11-03 08:29:45,07:45,25:00,12:30,15:40\n"
+        + "2024-11-04 08:32:10,08:30\n"
+        + "\n"
+        + "2024-11-05 08:28:30,07:30,11:45,12:30,15:25\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_entrees_decodees(csv_path):
+    """Les heures sont converties en minutes, les lignes invalides ignorées."""
+    records = list(CSVHandler(csv_path).iter_records())
+    assert records == [
+        ScheduleRecord(to_timestamp(datetime(2024, 11, 1, 8, 30, 15)), 480, 720, 765, 955),
+        ScheduleRecord(to_timestamp(datetime(2024, 11, 2, 8, 31, 22)), 495, 735, 780, 970),
+        ScheduleRecord(to_timestamp(datetime(2024, 11, 5, 8, 28, 30)), 450, 705, 750, 925),
+    ]
+
+
+def test_meme_contenu_que_read(csv_path):
+    """iter_records() décode exactement les lignes valides de read()."""
+    handler = CSVHandler(csv_path)
+    valides = []
+    for ligne in handler.read():
+        try:
+            valides.append(parse_record(ligne))
+        except ValidationError:
+            pass
+    assert list(handler.iter_records()) == valides
+
+
+def test_en_tete_reordonne(tmp_path):
+    path = tmp_path / "horaires.csv"
+    path.write_text(
+        "Heure départ calculée,Heure début,Heure fin pause,Heure début pause,Date de saisie,Note\n"
+        "15:55,08:00,12:45,12:00,2024-11-01 08:30:15,x\n",
+        encoding="utf-8",
+    )
+    assert list(CSVHandler(path).iter_records()) == [
+        ScheduleRecord(to_timestamp(datetime(2024, 11, 1, 8, 30, 15)), 480, 720, 765, 955),
+    ]
+
+
+def test_colonne_manquante(tmp_path):
+    path = tmp_path / "horaires.csv"
+    path.write_text("Date de saisie,Heure début\n2024-11-01 08:30:15,08:00\n", encoding="utf-8")
+    with pytest.raises(CSVError):
+        list(CSVHandler(path).iter_records())
+
+
+def test_fichier_absent(tmp_path):
+    assert list(CSVHandler(tmp_path / "absent.csv").iter_records()) == []
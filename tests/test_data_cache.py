@@ -0,0 +1,93 @@
+"""
+Tests du cache des données dérivées des horaires (data_cache).
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.data_cache import DataCache, charger_horaires, charger_moyennes, memoriser
+
+DEBUT = datetime(2024, 1, 1, 8, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def cache_vide():
+    DataCache.invalidate()
+    yield
+    DataCache.invalidate()
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "horaires.csv"
+    CSVHandler(path).write_many(
+        [("08:00", "12:00", "12:45", "15:55", DEBUT + timedelta(days=i)) for i in range(10)]
+    )
+    return path
+
+
+def test_valeur_reutilisee_tant_que_rien_ne_change(csv_path):
+    appels = []
+
+    def loader():
+        appels.append(1)
+        return len(appels)
+
+    assert memoriser("test", loader, csv_path) == 1
+    assert memoriser("test", loader, csv_path) == 1
+    assert charger_horaires(csv_path) is charger_horaires(csv_path)
+    assert len(appels) == 1
+
+
+def test_ecriture_puis_relecture(csv_path):
+    """Une écriture par CSVHandler rend visibles les nouvelles données."""
+    assert len(charger_horaires(csv_path)) == 10
+    assert charger_moyennes(csv_path)[2] == "08:00"
+
+    CSVHandler(csv_path).write("10:00", "12:00", "12:45", "17:55", DEBUT + timedelta(days=10))
+
+    assert len(charger_horaires(csv_path)) == 11
+    assert charger_moyennes(csv_path)[2] == "08:10"
+
+
+def test_modification_externe(csv_path):
+    """Un fichier modifié hors de CSVHandler invalide aussi la valeur (état du fichier)."""
+    premier = charger_horaires(csv_path)
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write(f"{DEBUT + timedelta(days=20):%Y-%m-%d %H:%M:%S},09:00,12:00,12:45,16:55\n")
+
+    second = charger_horaires(csv_path)
+    assert second is not premier
+    assert len(second) == 11
+
+
+def test_invalidation_pendant_le_calcul(csv_path):
+    """Une valeur calculée pendant une invalidation n'est pas conservée."""
+    def loader():
+        DataCache.invalidate()
+        return "périmée"
+
+    assert memoriser("test", loader, csv_path) == "périmée"
+    assert memoriser("test", lambda: "fraîche", csv_path) == "fraîche"
+
+
+def test_saisie_par_l_interface(csv_path, tmp_path, monkeypatch):
+    """Une saisie par ajouter_donnees (chemin de app.py) vide tout le cache."""
+    import calcule_Heure.add_data as add_data
+    import calcule_Heure.config as config_module
+
+    monkeypatch.setattr(config_module, "CONFIG_FILE", tmp_path / "config.json")
+    monkeypatch.setattr(add_data, "CSV_FILE", csv_path)
+    monkeypatch.setattr(add_data, "_manager", None)
+    appels = []
+    # Valeur liée à un autre fichier: seule l'invalidation explicite la recalcule
+    memoriser("témoin", lambda: appels.append(1), tmp_path / "autre.csv")
+    assert len(charger_horaires(csv_path)) == 10
+
+    assert add_data.ajouter_donnees("10:00", "12:00", "12:45") == "17:55"
+
+    memoriser("témoin", lambda: appels.append(1), tmp_path / "autre.csv")
+    assert len(appels) == 2
+    assert len(charger_horaires(csv_path)) == 11
+    assert charger_moyennes(csv_path)[2] == "08:10"
@@ -0,0 +1,75 @@
+"""
+Tests du chargement en colonnes (ScheduleFrame) et des moyennes vectorisées.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from calcule_Heure.colcul import StatisticsCalculator, calculer_moyennes
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.frame import COLUMNS, ScheduleFrame
+from calcule_Heure.timecodec import format_duration
+
+EN_TETE = "Date de saisie,Heure début,Heure début pause,Heure fin pause,Heure départ calculée\n"
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """Lignes canoniques, non canoniques (heures sur un chiffre) et invalides mélangées."""
+    lignes = []
+    for i in range(200):
+        date = datetime(2024, 1, 1, 8, 0, 0) + timedelta(days=i, seconds=i * 37)
+        debut = f"{7 + i % 3}:{(i * 7) % 60:02d}" if i % 11 == 0 else f"{7 + i % 3:02d}:{(i * 7) % 60:02d}"
+        lignes.append(f"{date:%Y-%m-%d %H:%M:%S},{debut},12:00,12:{30 + i % 30:02d},16:{i % 60:02d}\n")
+        if i % 50 == 0:
+            lignes.append(f"{date:%Y-%m-%d %H:%M:%S},99:00,12:00,12:30,16:00\n")
+    path = tmp_path / "horaires.csv"
+    path.write_text(EN_TETE + "".join(lignes), encoding="utf-8")
+    return path
+
+
+def test_chargement_equivalent_au_decodage_ligne_a_ligne(csv_path):
+    frame = ScheduleFrame.from_csv(csv_path)
+    assert len(frame) == 204
+    assert frame.nombre_valides == 200
+    assert list(frame.records()) == list(CSVHandler(csv_path).iter_records())
+
+
+def test_moyennes_vectorisees(csv_path):
+    """Mêmes moyennes que le calcul ligne à ligne, quelle que soit l'entrée."""
+    records = list(CSVHandler(csv_path).iter_records())
+    attendu = (
+        format_duration(sum(r.depart for r in records) / len(records)),
+        format_duration(sum(r.fin_pause - r.debut_pause for r in records) / len(records)),
+        format_duration(sum(r.debut for r in records) / len(records)),
+    )
+    frame = ScheduleFrame.from_csv(csv_path)
+    assert StatisticsCalculator.calculate_averages(frame) == attendu
+    assert StatisticsCalculator.calculate_averages(records) == attendu
+    assert StatisticsCalculator.calculate_averages(CSVHandler(csv_path).read()) == attendu
+    assert calculer_moyennes(frame) == attendu
+
+
+def test_sans_donnees_valides(tmp_path):
+    path = tmp_path / "horaires.csv"
+    path.write_text(EN_TETE + "pas une date,08:00,12:00,12:45,15:55\n", encoding="utf-8")
+    frame = ScheduleFrame.from_csv(path)
+    assert (len(frame), frame.nombre_valides, frame.moyennes()) == (1, 0, None)
+    assert StatisticsCalculator.calculate_averages(frame) == (None, None, None)
+    assert len(ScheduleFrame.from_csv(tmp_path / "absent.csv")) == 0
+
+
+def test_format_puis_relecture(csv_path):
+    """L'export vectorisé (_format_bytes) se relit à l'identique."""
+    frame = ScheduleFrame.from_csv(csv_path).valid()
+    relu = ScheduleFrame._parse_bytes(EN_TETE.encode("utf-8") + frame._format_bytes())
+    for name in COLUMNS:
+        assert getattr(relu, name).tolist() == getattr(frame, name).tolist()
+
+
+def test_concatenation_et_filtrage(csv_path):
+    frame = ScheduleFrame.from_csv(csv_path)
+    double = ScheduleFrame.concatenate([frame, frame])
+    assert (len(double), double.nombre_valides) == (408, 400)
+    assert double.valid().valide.all()
+    assert double.moyennes() == pytest.approx(frame.moyennes())
@@ -0,0 +1,176 @@
+"""
+Tests des graphiques: cache des rendus, réduction des séries, spécifications Vega-Lite.
+"""
+import json
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import calcule_Heure.graphique as graphique
+from calcule_Heure.colcul import calculer_moyennes
+from calcule_Heure.frame import ScheduleFrame
+from calcule_Heure.graphique import (
+    GRAPHIQUES,
+    VEGA_LITE_SCHEMA,
+    reduire_points,
+    rendre_graphiques,
+    specs_vega_lite,
+)
+from calcule_Heure.timecodec import parse_time, to_timestamp
+
+DEBUT = datetime(2024, 1, 1, 8, 0, 0)
+
+
+def _horaires(jours, decalage=0):
+    return ScheduleFrame.from_records([
+        {
+            "Date de saisie": f"{DEBUT + timedelta(days=i):%Y-%m-%d %H:%M:%S}",
+            "Heure début": f"{7 + (i + decalage) % 3:02d}:{(i * 7) % 60:02d}",
+            "Heure début pause": "12:00",
+            "Heure fin pause": f"12:{30 + i % 30:02d}",
+            "Heure départ calculée": "16:05",
+        }
+        for i in range(jours)
+    ])
+
+
+@pytest.fixture
+def rendu_sur_place(monkeypatch):
+    """Rendu dans le processus des tests (pas de pool de processus), en comptant les rendus."""
+    rendus = []
+    rendre = graphique._rendre
+
+    def compter(index, series, chemin, format):
+        rendus.append(chemin.name)
+        return rendre(index, series, chemin, format)
+
+    def sans_pool():
+        raise OSError("pas de pool dans les tests")
+
+    monkeypatch.setattr(graphique, "_get_pool", sans_pool)
+    monkeypatch.setattr(graphique, "_rendre", compter)
+    return rendus
+
+
+def test_rendu_puis_cache(tmp_path, rendu_sur_place):
+    """Le premier affichage rend les images, les suivants les servent depuis le cache."""
+    horaires = _horaires(30)
+    depart_moy, _, arrivee_moy = calculer_moyennes(horaires)
+
+    chemins = rendre_graphiques(horaires, depart_moy, arrivee_moy, dossier=tmp_path)
+    assert [chemin.name.split("-", 1)[1] for chemin in chemins] == [f"{nom}.png" for nom in GRAPHIQUES]
+    assert all(chemin.read_bytes().startswith(b"\x89PNG") for chemin in chemins)
+    assert len(rendu_sur_place) == 3
+
+    assert rendre_graphiques(horaires, depart_moy, arrivee_moy, dossier=tmp_path) == chemins
+    assert len(rendu_sur_place) == 3
+
+
+def test_cle_du_cache(tmp_path, rendu_sur_place):
+    """Données, moyennes et format font partie de la clé."""
+    horaires = _horaires(30)
+    depart_moy, _, arrivee_moy = calculer_moyennes(horaires)
+    png = rendre_graphiques(horaires, depart_moy, arrivee_moy, dossier=tmp_path)
+
+    svg = rendre_graphiques(horaires, depart_moy, arrivee_moy, format="svg", dossier=tmp_path)
+    autres_donnees = rendre_graphiques(_horaires(30, decalage=1), depart_moy, arrivee_moy, dossier=tmp_path)
+    autre_moyenne = rendre_graphiques(horaires, depart_moy, "09:00", dossier=tmp_path)
+
+    assert svg[0].read_bytes().lstrip().startswith(b"<?xml")
+    assert len({tuple(png), tuple(svg), tuple(autres_donnees), tuple(autre_moyenne)}) == 4
+    assert len(rendu_sur_place) == 12
+
+
+def test_purge_du_cache(tmp_path, monkeypatch):
+    """Au-delà de RENDER_CACHE_MAX_FILES images, les plus anciennes sont supprimées."""
+    monkeypatch.setattr(graphique, "RENDER_CACHE_MAX_FILES", 4)
+    for age in range(6):
+        chemin = tmp_path / f"{age}-arrivee.png"
+        chemin.write_bytes(b"")
+        os.utime(chemin, ns=(0, (10 - age) * 10**9))
+    (tmp_path / "autre.txt").write_text("conservé")
+
+    graphique._purger(tmp_path)
+    assert sorted(chemin.name for chemin in tmp_path.iterdir()) == [
+        "0-arrivee.png", "1-arrivee.png", "2-arrivee.png", "3-arrivee.png", "autre.txt",
+    ]
+
+
+def test_rendu_sans_donnees_ou_format_invalide(tmp_path):
+    assert rendre_graphiques(ScheduleFrame.empty(), "16:05", "08:00", dossier=tmp_path) is None
+    with pytest.raises(ValueError):
+        rendre_graphiques(_horaires(3), "16:05", "08:00", format="gif", dossier=tmp_path)
+
+
+def test_reduction_serie_courte():
+    """Une série assez courte est tracée telle quelle."""
+    x, y = np.arange(10), np.arange(10.0)
+    rx, ry = reduire_points(x, y, max_points=10)
+    assert rx is x and ry is y
+
+
+@pytest.mark.parametrize("n,max_points", [(20000, 1000), (1001, 1000), (12345, 50), (100, 4)])
+def test_reduction_garde_les_extremes(n, max_points):
+    """Au plus max_points points, dans l'ordre, extrêmes et bornes compris."""
+    rng = np.random.default_rng(n)
+    x = np.arange(n)
+    y = rng.normal(480, 20, n)
+    # Valeurs aberrantes isolées (une par intervalle), qu'une décimation régulière perdrait
+    aberrantes = np.linspace(1, n - 2, 5).astype(int) if max_points >= 12 else np.array([1, n - 2])
+    y[aberrantes[::2]] = 1400
+    y[aberrantes[1::2]] = 0
+
+    rx, ry = reduire_points(x, y, max_points=max_points)
+    assert len(rx) <= max_points
+    assert np.all(np.diff(rx) > 0)
+    assert np.array_equal(ry, y[rx])
+    assert rx[0] == 0 and rx[-1] == n - 1
+    assert ry.max() == y.max() and ry.min() == y.min()
+    assert set(aberrantes.tolist()) <= set(rx.tolist())
+
+
+def test_reduction_par_intervalle():
+    """Chaque intervalle garde son minimum et son maximum."""
+    n, max_points = 1000, 102
+    y = np.sin(np.arange(n) / 7.0)
+    rx, ry = reduire_points(np.arange(n), y, max_points=max_points)
+    intervalles = (max_points - 2) // 2
+    for tranche in np.array_split(np.arange(n), intervalles):
+        assert y[tranche].max() in ry
+        assert y[tranche].min() in ry
+
+
+def test_specifications_vega_lite():
+    """Une spécification par graphique, données en colonnes et ligne de référence."""
+    horaires = _horaires(30)
+    depart_moy, _, arrivee_moy = calculer_moyennes(horaires)
+    specs = specs_vega_lite(horaires, depart_moy, arrivee_moy)
+    assert len(specs) == len(GRAPHIQUES)
+    json.dumps(specs)
+
+    arrivee, depart, pauses = specs
+    for spec in specs:
+        assert spec["$schema"] == VEGA_LITE_SCHEMA
+        assert spec["transform"][0] == {"flatten": ["t", "minutes"]}
+        donnees = spec["data"]["values"][0]
+        assert donnees["t"][0] == to_timestamp(DEBUT)
+        assert len(donnees["t"]) == len(donnees["minutes"]) == 30
+        assert spec["layer"][1]["mark"]["type"] == "rule"
+
+    assert arrivee["data"]["values"][0]["minutes"] == horaires.debut.tolist()
+    assert depart["data"]["values"][0]["minutes"] == horaires.depart.tolist()
+    assert pauses["data"]["values"][0]["minutes"] == horaires.duree_pause.tolist()
+    assert arrivee["layer"][1]["encoding"]["y"]["datum"] == parse_time(arrivee_moy) / 60
+    seuil = pauses["layer"][0]["encoding"]["color"]["scale"]["domainMid"]
+    assert pauses["layer"][1]["encoding"]["y"]["datum"] == seuil
+
+
+def test_specifications_reduites():
+    """Les grandes séries sont réduites à GRAPH_MAX_POINTS points."""
+    horaires = _horaires(3000)
+    specs = specs_vega_lite(horaires, "16:05", "08:00")
+    for spec in specs:
+        assert len(spec["data"]["values"][0]["t"]) <= graphique.GRAPH_MAX_POINTS
+    assert specs_vega_lite(ScheduleFrame.empty(), "16:05", "08:00") is None
@@ -0,0 +1,107 @@
+"""
+Tests de l'import groupé (main.py import, lire_saisies, ScheduleManager.add_schedules).
+"""
+import io
+from datetime import datetime
+
+import pytest
+
+import calcule_Heure.add_data as add_data
+import calcule_Heure.config as config_module
+import main
+from calcule_Heure.add_data import ScheduleManager
+from calcule_Heure.config import ConfigurationManager
+from calcule_Heure.csv_handler import CSVHandler
+
+EN_TETE = "Date de saisie,Heure début,Heure début pause,Heure fin pause,Heure départ calculée\n"
+
+
+@pytest.fixture
+def csv_path(tmp_path, monkeypatch):
+    """CSV et configuration (par défaut: 7 h 10) temporaires."""
+    path = tmp_path / "horaires.csv"
+    monkeypatch.setattr(config_module, "CONFIG_FILE", tmp_path / "config.json")
+    monkeypatch.setattr(add_data, "CSV_FILE", path)
+    monkeypatch.setattr(main, "fichier_csv", str(path))
+    ConfigurationManager.clear_cache()
+    yield path
+    ConfigurationManager.clear_cache()
+
+
+def test_formats_acceptes():
+    """3, 4 (avec ou sans date) et 5 colonnes; en-tête et lignes vides ignorés."""
+    saisies, numeros, erreurs = main.lire_saisies(io.StringIO(
+        EN_TETE
+        + "08:00,12:00,12:45\n"
+        + "\n"
+        + "2024-11-01 08:30:15,8:5,12:00,12:45\n"
+        + "08:15,12:15,13:00,16:10\n"
+        + "2024-11-02 08:31:22,08:15,12:15,13:00,16:10\n"
+    ))
+    assert saisies == [
+        ("08:00", "12:00", "12:45"),
+        ("8:5", "12:00", "12:45", datetime(2024, 11, 1, 8, 30, 15)),
+        ("08:15", "12:15", "13:00"),
+        ("08:15", "12:15", "13:00", datetime(2024, 11, 2, 8, 31, 22)),
+    ]
+    assert numeros == [2, 4, 5, 6]
+    assert erreurs == []
+
+
+def test_lignes_rejetees():
+    saisies, numeros, erreurs = main.lire_saisies(io.StringIO(
+        "08:00,12:00\n"
+        "pas-une-date,08:00,12:00,12:45\n"
+        "2024-11-01 08:30:15,08:00,12:00,12:45,15:55,x\n"
+        "08:00,12:00,12:45\n"
+    ))
+    assert saisies == [("08:00", "12:00", "12:45")]
+    assert numeros == [4]
+    assert [numero for numero, _ in erreurs] == [1, 2, 3]
+
+
+def test_heures_normalisees(csv_path):
+    """Les heures sont écrites sur deux chiffres, départ calculé en lot."""
+    resultat = ScheduleManager().add_schedules([
+        ("8:5", "12:0", "12:45", datetime(2024, 11, 1, 8, 30, 15)),
+        ("07:30", "11:45", "12:30", datetime(2024, 11, 2, 8, 0, 0)),
+    ])
+    assert resultat == {"inserted": 2, "departs": ["16:00", "15:25"], "errors": []}
+    assert csv_path.read_text(encoding="utf-8") == (
+        EN_TETE
+        + "2024-11-01 08:30:15,08:05,12:00,12:45,16:00\n"
+        + "2024-11-02 08:00:00,07:30,11:45,12:30,15:25\n"
+    )
+
+
+def test_saisies_invalides_signalees(csv_path):
+    resultat = ScheduleManager().add_schedules([
+        ("08:00", "12:00"),
+        ("25:00", "12:00", "12:45"),
+        ("08:00", "13:00", "12:00"),
+        ("08:00", "12:00", "12:45"),
+    ])
+    assert resultat["inserted"] == 1
+    assert [erreur["index"] for erreur in resultat["errors"]] == [0, 1, 2]
+    assert len(CSVHandler(csv_path).read()) == 1
+
+
+def test_commande_import(csv_path, tmp_path, capsys):
+    """Les lignes valides sont importées, les autres signalées avec leur numéro."""
+    source = tmp_path / "saisies.csv"
+    source.write_text(
+        "2024-11-01 08:30:15,8:5,12:00,12:45\n"
+        "08:00,13:00,12:00\n"
+        "2024-11-02 08:31:22,08:15,12:15,13:00,16:10\n",
+        encoding="utf-8",
+    )
+    assert main.main(["import", str(source)]) == 1
+
+    sortie = capsys.readouterr()
+    assert "2 saisie(s) importée(s)" in sortie.out
+    assert sortie.err.startswith("Ligne 2 ignorée")
+    assert [ligne["Heure début"] for ligne in CSVHandler(csv_path).read()] == ["08:05", "08:15"]
+
+    source.write_text("08:00,12:00,12:45,15:55\n", encoding="utf-8")
+    assert main.main(["import", str(source)]) == 0
+    assert len(CSVHandler(csv_path).read()) == 3
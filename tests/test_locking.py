@@ -0,0 +1,139 @@
+"""
+Tests des écritures concurrentes: verrou exclusif et validation groupée.
+"""
+import csv
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from calcule_Heure.constants import CSV_HEADERS
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.exceptions import CSVError
+from calcule_Heure.locking import GroupCommit
+
+THREADS = 8
+ECRITURES = 25
+DEBUT = datetime(2024, 1, 1, 8, 0, 0)
+
+
+def _date(ecrivain, i):
+    """Date de saisie propre à chaque écriture, pour la retrouver dans le fichier."""
+    return DEBUT + timedelta(minutes=ecrivain * 1000 + i)
+
+
+def _lignes(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def _en_parallele(cible, threads=THREADS):
+    """Lance `threads` appels à cible(numéro), retourne les erreurs par numéro."""
+    erreurs = {}
+
+    def lancer(n):
+        try:
+            cible(n)
+        except Exception as e:
+            erreurs[n] = e
+
+    workers = [threading.Thread(target=lancer, args=(n,)) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return erreurs
+
+
+@pytest.mark.parametrize("group_commit", [False, True])
+def test_ecritures_concurrentes(tmp_path, group_commit):
+    """Chaque ligne est écrite une fois, entière, sous un seul en-tête."""
+    path = tmp_path / "horaires.csv"
+    handler = CSVHandler(path, group_commit=group_commit)
+
+    def ecrivain(n):
+        for i in range(ECRITURES):
+            handler.write("08:00", "12:00", "12:45", "15:55", _date(n, i))
+
+    assert _en_parallele(ecrivain) == {}
+
+    lignes = _lignes(path)
+    assert lignes[0] == CSV_HEADERS
+    assert lignes.count(CSV_HEADERS) == 1
+    assert all(ligne[1:] == ["08:00", "12:00", "12:45", "15:55"] for ligne in lignes[1:])
+    attendues = sorted(f"{_date(n, i):%Y-%m-%d %H:%M:%S}" for n in range(THREADS) for i in range(ECRITURES))
+    assert sorted(ligne[0] for ligne in lignes[1:]) == attendues
+
+
+def test_erreur_limitee_a_son_lot():
+    """Dans un groupe, l'erreur d'un lot n'atteint que son écrivain."""
+    group = GroupCommit(window=0)
+    ecrits = []
+    premier_en_cours = threading.Event()
+    liberer = threading.Event()
+
+    def flush(items):
+        if items == ["premier"]:
+            premier_en_cours.set()
+            liberer.wait(5)
+        if "mauvais" in items:
+            raise ValueError("lot invalide")
+        ecrits.extend(items)
+
+    erreurs = {}
+
+    def soumettre(nom):
+        try:
+            group.submit([nom], flush)
+        except ValueError as e:
+            erreurs[nom] = e
+
+    meneur = threading.Thread(target=soumettre, args=("premier",))
+    meneur.start()
+    assert premier_en_cours.wait(5)
+    # Ces deux lots arrivent pendant l'écriture du premier: ils forment un groupe
+    suivants = [threading.Thread(target=soumettre, args=(nom,)) for nom in ("bon", "mauvais")]
+    for thread in suivants:
+        thread.start()
+    while len(group._pending) < 2:
+        time.sleep(0.001)
+    liberer.set()
+    for thread in [meneur] + suivants:
+        thread.join()
+
+    assert list(erreurs) == ["mauvais"]
+    assert sorted(ecrits) == ["bon", "premier"]
+
+
+def test_entree_invalide_en_validation_groupee(tmp_path):
+    """Une entrée non encodable échoue seule; les autres écrivains ne sont pas touchés."""
+    path = tmp_path / "horaires.csv"
+    handler = CSVHandler(path, group_commit=True)
+
+    def ecrivain(n):
+        debut = "\ud800" if n == 3 else "08:00"
+        handler.write(debut, "12:00", "12:45", "15:55", _date(n, 0))
+
+    erreurs = _en_parallele(ecrivain)
+    assert list(erreurs) == [3]
+    assert isinstance(erreurs[3], CSVError)
+    dates = [ligne[0] for ligne in _lignes(path)[1:]]
+    assert sorted(dates) == sorted(f"{_date(n, 0):%Y-%m-%d %H:%M:%S}" for n in range(THREADS) if n != 3)
+
+
+def test_ecriture_interrompue_retiree(tmp_path, monkeypatch):
+    """Si le fsync échoue, les lignes écrites sont retirées du fichier."""
+    path = tmp_path / "horaires.csv"
+    handler = CSVHandler(path, group_commit=True)
+    handler.write("08:00", "12:00", "12:45", "15:55", DEBUT)
+    avant = path.read_bytes()
+
+    def fsync(fd):
+        raise OSError("disque plein")
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    with pytest.raises(CSVError):
+        handler.write("09:00", "12:00", "12:45", "16:55", DEBUT + timedelta(days=1))
+    assert path.read_bytes() == avant
@@ -0,0 +1,99 @@
+"""
+Tests des lectures par période (CSVHandler.read_range) et de l'index des dates.
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from calcule_Heure.constants import DATE_INDEX_STRIDE
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.date_index import DateIndex
+from calcule_Heure.timecodec import to_timestamp
+
+DEBUT = datetime(2024, 1, 1, 8, 0, 0)
+NOMBRE = 5 * DATE_INDEX_STRIDE + 7
+
+
+def _date(i):
+    return DEBUT + timedelta(hours=i)
+
+
+def _saisies(indices):
+    return [("08:00", "12:00", "12:45", "15:55", _date(i)) for i in indices]
+
+
+def _attendu(path, start, end):
+    """Entrées de la période, par parcours complet du fichier."""
+    low, high = to_timestamp(start), to_timestamp(end)
+    return [r for r in CSVHandler(path).iter_records() if low <= r.horodatage < high]
+
+
+@pytest.fixture
+def csv_trie(tmp_path):
+    """CSV de dates croissantes, une entrée par heure."""
+    path = tmp_path / "horaires.csv"
+    CSVHandler(path).write_many(_saisies(range(NOMBRE)))
+    return path
+
+
+@pytest.fixture
+def csv_non_trie(tmp_path):
+    """Mêmes entrées, dans le désordre."""
+    indices = list(range(NOMBRE))
+    random.Random(7).shuffle(indices)
+    path = tmp_path / "horaires.csv"
+    CSVHandler(path).write_many(_saisies(indices))
+    return path
+
+
+def _periodes():
+    """Bornes sur les lignes indexées (une sur DATE_INDEX_STRIDE), juste avant et juste après."""
+    pas = DATE_INDEX_STRIDE
+    yield _date(0), _date(NOMBRE)
+    yield _date(-10), _date(3)
+    yield _date(pas), _date(2 * pas)
+    yield _date(pas) - timedelta(seconds=1), _date(2 * pas) + timedelta(seconds=1)
+    yield _date(pas) + timedelta(seconds=1), _date(2 * pas) - timedelta(seconds=1)
+    yield _date(pas - 1), _date(pas + 1)
+    yield _date(3 * pas), _date(3 * pas)
+    yield _date(NOMBRE - 2), _date(NOMBRE + 50)
+    yield _date(NOMBRE + 1), _date(NOMBRE + 50)
+
+
+@pytest.mark.parametrize("start,end", list(_periodes()))
+def test_periode_fichier_trie(csv_trie, start, end):
+    """Sur un fichier trié, l'index donne exactement les entrées de la période."""
+    assert DateIndex(csv_trie).locate(0, 1) is not None
+    assert CSVHandler(csv_trie).read_range(start, end) == _attendu(csv_trie, start, end)
+
+
+@pytest.mark.parametrize("start,end", list(_periodes()))
+def test_periode_fichier_non_trie(csv_non_trie, start, end):
+    """Sur un fichier non trié, la lecture parcourt tout le fichier."""
+    assert DateIndex(csv_non_trie).locate(0, 1) is None
+    assert CSVHandler(csv_non_trie).read_range(start, end) == _attendu(csv_non_trie, start, end)
+
+
+def test_index_complete_apres_ajout(csv_trie):
+    """Les entrées ajoutées après la création de l'index sont trouvées."""
+    handler = CSVHandler(csv_trie)
+    handler.read_range(_date(0), _date(1))
+    handler.write_many(_saisies(range(NOMBRE, NOMBRE + DATE_INDEX_STRIDE)))
+
+    start, end = _date(NOMBRE - 3), _date(NOMBRE + DATE_INDEX_STRIDE)
+    assert len(handler.read_range(start, end)) == DATE_INDEX_STRIDE + 3
+
+
+def test_index_reconstruit_apres_modification(csv_trie):
+    """Une modification à taille égale du fichier déjà indexé est détectée."""
+    handler = CSVHandler(csv_trie)
+    handler.read_range(_date(0), _date(1))
+    # Même longueur, au milieu du fichier: l'entrée de 150 h prend la date de celle de 6 h
+    ancienne = f"\n{_date(150):%Y-%m-%d %H:%M:%S},".encode()
+    nouvelle = f"\n{_date(6):%Y-%m-%d %H:%M:%S},".encode()
+    csv_trie.write_bytes(csv_trie.read_bytes().replace(ancienne, nouvelle))
+
+    assert DateIndex(csv_trie).locate(0, 1) is None
+    assert handler.read_range(_date(150), _date(151)) == []
+    assert len(handler.read_range(_date(0), _date(24))) == 25
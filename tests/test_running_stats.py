@@ -0,0 +1,81 @@
+"""
+Tests des statistiques cumulées tenues à jour dans le fichier annexe.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.running_stats import RunningStats, StatsSidecar
+
+EN_TETE = "Date de saisie,Heure début,Heure début pause,Heure fin pause,Heure départ calculée\n"
+
+
+def _ligne(i, debut="08:00"):
+    date = datetime(2024, 1, 1, 7, 30, 0) + timedelta(days=i)
+    return f"{date:%Y-%m-%d %H:%M:%S},{debut},12:00,12:45,15:55\n"
+
+
+def _recalcul(path):
+    """Statistiques recalculées sur le fichier complet, sans fichier annexe."""
+    return RunningStats.from_frame(CSVHandler(path).load_frame()).to_dict()
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """CSV de 500 entrées, toutes arrivées à 08:00, avec statistiques à jour."""
+    path = tmp_path / "horaires.csv"
+    path.write_text(EN_TETE + "".join(_ligne(i) for i in range(500)), encoding="utf-8")
+    StatsSidecar(path).update()
+    return path
+
+
+def test_ajout_incremental(csv_path, monkeypatch):
+    """Des lignes ajoutées en fin de fichier sont comptées sans reconstruction."""
+    CSVHandler(csv_path).write("09:00", "12:00", "13:00", "17:10", datetime(2025, 6, 1, 9, 0, 0))
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write(_ligne(600, "07:30"))
+
+    def interdit(self, f):
+        raise AssertionError("reconstruction inattendue")
+
+    monkeypatch.setattr(StatsSidecar, "_rebuild", interdit)
+    stats = StatsSidecar(csv_path).update()
+    assert stats.nombre == 502
+    assert stats.to_dict() == _recalcul(csv_path)
+
+
+def test_troncature(csv_path):
+    """Un CSV raccourci entraîne une reconstruction."""
+    lignes = csv_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    csv_path.write_text("".join(lignes[:201]), encoding="utf-8")
+
+    stats = StatsSidecar(csv_path).update()
+    assert stats.nombre == 200
+    assert stats.to_dict() == _recalcul(csv_path)
+
+
+def test_modification_au_milieu_meme_taille(csv_path):
+    """Une modification au milieu du fichier, à taille égale, est détectée."""
+    contenu = EN_TETE + "".join(_ligne(i, "10:00" if 120 <= i < 480 else "08:00") for i in range(500))
+    assert len(contenu.encode("utf-8")) == csv_path.stat().st_size
+    csv_path.write_text(contenu, encoding="utf-8")
+
+    stats = StatsSidecar(csv_path).update()
+    assert stats.to_dict() == _recalcul(csv_path)
+    # (140 * 08:00 + 360 * 10:00) / 500 = 09:26,4
+    assert stats.moyennes()[2] == pytest.approx((140 * 480 + 360 * 600) / 500)
+
+
+def test_ligne_partielle_en_fin(csv_path):
+    """Une ligne en cours d'écriture n'est comptée qu'une fois terminée."""
+    ligne = _ligne(500, "09:00")
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write(ligne[:20])
+    assert StatsSidecar(csv_path).update().nombre == 500
+
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write(ligne[20:])
+    stats = StatsSidecar(csv_path).update()
+    assert stats.nombre == 501
+    assert stats.to_dict() == _recalcul(csv_path)
@@ -0,0 +1,160 @@
+"""
+Tests de l'archivage des mois terminés en segments compressés.
+"""
+import gzip
+from datetime import datetime, timedelta
+
+import pytest
+
+import calcule_Heure.csv_handler as csv_handler_module
+from calcule_Heure.colcul import calculer_moyennes
+from calcule_Heure.csv_handler import CSVHandler
+from calcule_Heure.exceptions import CSVError
+from calcule_Heure.frame import ScheduleFrame
+from calcule_Heure.running_stats import RunningStats
+from calcule_Heure.segments import SegmentArchive
+from calcule_Heure.timecodec import to_timestamp
+
+# Référence de la rotation: janvier et février 2024 sont terminés
+MAINTENANT = datetime(2024, 3, 15, 12, 0, 0)
+
+
+def _saisies(debut, jours):
+    """Une saisie par jour à partir de `debut`, heures variées."""
+    return [
+        (f"{7 + i % 3:02d}:{(i * 7) % 60:02d}", "12:00", f"12:{30 + i % 30:02d}", "16:00", debut + timedelta(days=i))
+        for i in range(jours)
+    ]
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """CSV de janvier au 14 mars 2024 (deux mois terminés, un en cours)."""
+    path = tmp_path / "horaires.csv"
+    CSVHandler(path).write_many(_saisies(datetime(2024, 1, 1, 8, 0, 0), 74))
+    return path
+
+
+def test_ecriture_sans_rotation_par_defaut(csv_path):
+    """Une écriture ordinaire laisse l'historique complet dans le CSV."""
+    CSVHandler(csv_path).write("08:00", "12:00", "12:45", "16:00")
+    assert not SegmentArchive(csv_path).directory.exists()
+    assert len(CSVHandler(csv_path)._read_file()) == 75
+
+
+def test_rotation_conserve_historique(csv_path):
+    """Après rotation, toutes les lectures retrouvent l'historique complet."""
+    handler = CSVHandler(csv_path)
+    lignes = handler.read()
+    records = list(handler.iter_records())
+    moyennes = calculer_moyennes(handler.load_frame())
+    periode = handler.read_range(datetime(2024, 1, 20), datetime(2024, 3, 5))
+
+    assert handler.rotate_segments(now=MAINTENANT) == 31 + 29
+
+    archive = SegmentArchive(csv_path)
+    assert [entry["mois"] for entry in archive.segments()] == ["2024-01", "2024-02"]
+    assert len(handler._read_file()) == 14
+    assert handler.read() == lignes
+    assert list(handler.iter_records()) == records
+    assert list(handler.load_frame().records()) == records
+    assert handler.get_row_count() == 74
+    assert handler.read_range(datetime(2024, 1, 20), datetime(2024, 3, 5)) == periode
+    assert calculer_moyennes(csv_path) == moyennes
+
+
+def test_ligne_tardive_ajoutee_au_segment(csv_path):
+    """Une saisie d'un mois déjà archivé est ajoutée à son segment."""
+    handler = CSVHandler(csv_path)
+    handler.rotate_segments(now=MAINTENANT)
+    tardive = datetime(2024, 1, 31, 18, 0, 0)
+    handler.write("09:00", "12:00", "13:00", "17:10", tardive)
+
+    assert handler.rotate_segments(now=MAINTENANT) == 1
+
+    archive = SegmentArchive(csv_path)
+    janvier = archive.segments()[0]
+    assert janvier["lignes"] == 32
+    assert janvier["fin"] == to_timestamp(tardive)
+    # Le segment est complété par un second membre gzip, relu d'un seul tenant
+    contenu = (archive.directory / janvier["fichier"]).read_bytes()
+    assert contenu.count(b"\x1f\x8b\x08") == 2
+    assert gzip.decompress(contenu).count(b"\n") == 33
+    assert to_timestamp(tardive) in archive.load_frame([janvier]).horodatage
+    assert handler.get_row_count() == 75
+
+
+def test_resumes_du_manifeste(csv_path):
+    """Les résumés du manifeste correspondent à un recalcul complet."""
+    handler = CSVHandler(csv_path)
+    handler.rotate_segments(now=MAINTENANT)
+    handler.write("06:45", "11:30", "11:50", "14:15", datetime(2024, 2, 10, 7, 0, 0))
+    handler.rotate_segments(now=MAINTENANT)
+
+    archive = SegmentArchive(csv_path)
+    for entry in archive.segments():
+        frame = archive.load_frame([entry])
+        valides = frame.valid()
+        assert entry["lignes"] == len(frame)
+        assert entry["debut"] == int(valides.horodatage.min())
+        assert entry["fin"] == int(valides.horodatage.max())
+        assert entry["stats"] == RunningStats.from_frame(frame).to_dict()
+
+    # Résumés des segments + fichier courant == recalcul sur tout l'historique
+    cumul = archive.stats()
+    cumul.merge(RunningStats.from_frame(ScheduleFrame.from_csv(csv_path)))
+    assert cumul.to_dict() == RunningStats.from_frame(handler.load_frame()).to_dict()
+    assert calculer_moyennes(csv_path) == calculer_moyennes(handler.load_frame())
+
+
+def test_interruption_avant_remplacement_ne_perd_rien(csv_path, monkeypatch):
+    """Si le CSV courant ne peut être remplacé, les lignes sont dupliquées, jamais perdues."""
+    handler = CSVHandler(csv_path)
+    avant = list(handler.iter_records())
+    ecrire = csv_handler_module.write_atomic
+
+    def echec_sur_csv(path, data):
+        if path == csv_path:
+            raise IOError("disque plein")
+        ecrire(path, data)
+
+    monkeypatch.setattr(csv_handler_module, "write_atomic", echec_sur_csv)
+    with pytest.raises(CSVError):
+        handler.rotate_segments(now=MAINTENANT)
+
+    apres = list(handler.iter_records())
+    assert set(avant) <= set(apres)
+    assert len(apres) == len(avant) + 31 + 29
+
+
+def test_rotation_activee_par_la_configuration(csv_path, tmp_path, monkeypatch):
+    """Avec rotation_segments, les saisies archivent les mois terminés."""
+    import calcule_Heure.add_data as add_data
+    import calcule_Heure.config as config_module
+    from calcule_Heure.config import ConfigurationManager
+
+    monkeypatch.setattr(config_module, "CONFIG_FILE", tmp_path / "config.json")
+    monkeypatch.setattr(add_data, "CSV_FILE", csv_path)
+    ConfigurationManager.clear_cache()
+    try:
+        assert add_data.ScheduleManager().csv_handler.rotation is False
+        ConfigurationManager.save({**ConfigurationManager.DEFAULT_CONFIG, "rotation_segments": True})
+        manager = add_data.ScheduleManager()
+        assert manager.csv_handler.rotation is True
+        manager.add_schedule("08:00", "12:00", "12:45")
+    finally:
+        ConfigurationManager.clear_cache()
+
+    assert SegmentArchive(csv_path).segments()
+    assert len(CSVHandler(csv_path).read()) == 75
+
+
+def test_commande_rotate(csv_path, monkeypatch, capsys):
+    """python main.py rotate archive les mois terminés du CSV."""
+    import main
+
+    monkeypatch.setattr(main, "fichier_csv", str(csv_path))
+    assert main.main(["rotate"]) == 0
+    assert "74 entrée(s) archivée(s)" in capsys.readouterr().out
+    assert [entry["mois"] for entry in SegmentArchive(csv_path).segments()] == ["2024-01", "2024-02", "2024-03"]
+    assert len(CSVHandler(csv_path).read()) == 74
@@ -0,0 +1,84 @@
+"""
+Tests de la conversion des heures et dates (timecodec), comparée à strptime/strftime.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from calcule_Heure.constants import DATETIME_FORMAT, TIME_FORMAT
+from calcule_Heure.exceptions import TimeFormatError
+from calcule_Heure.timecodec import (
+    format_datetime,
+    format_duration,
+    format_time,
+    from_timestamp,
+    parse_datetime,
+    parse_time,
+    to_timestamp,
+)
+
+
+def test_heures_aller_retour():
+    """Toutes les minutes de la journée: HH:MM -> minutes -> HH:MM."""
+    for minutes in range(24 * 60):
+        texte = format_time(minutes)
+        assert texte == (datetime(2024, 1, 1) + timedelta(minutes=minutes)).strftime(TIME_FORMAT)
+        assert parse_time(texte) == minutes
+
+
+@pytest.mark.parametrize("texte", ["8:05", "08:5", "0:0", "23:59"])
+def test_heures_non_canoniques(texte):
+    """Comme strptime, les heures et minutes sur un chiffre sont acceptées."""
+    attendu = datetime.strptime(texte, TIME_FORMAT)
+    assert parse_time(texte) == attendu.hour * 60 + attendu.minute
+
+
+@pytest.mark.parametrize("texte", ["24:00", "12:60", "1200", "", "12:", ":30", "ab:cd", "１２:００", None])
+def test_heures_invalides(texte):
+    with pytest.raises(TimeFormatError):
+        parse_time(texte)
+
+
+def test_heures_ramenees_sur_la_journee():
+    assert format_time(24 * 60 + 5) == "00:05"
+    assert format_time(-1) == "23:59"
+
+
+def test_durees():
+    assert format_duration(45) == "00:45"
+    assert format_duration(25 * 60 + 30.99) == "25:30"
+    assert format_duration(7 * 60 + 10) == "07:10"
+
+
+@pytest.mark.parametrize("valeur", [
+    datetime(1970, 1, 1, 0, 0, 0),
+    datetime(2000, 2, 29, 23, 59, 59),
+    datetime(2024, 11, 1, 8, 30, 15),
+    datetime(2038, 1, 19, 3, 14, 8),
+    datetime(1969, 12, 31, 23, 59, 59),
+])
+def test_dates_aller_retour(valeur):
+    """datetime -> secondes -> texte -> secondes -> datetime."""
+    timestamp = to_timestamp(valeur)
+    texte = format_datetime(timestamp)
+    assert texte == valeur.strftime(DATETIME_FORMAT)
+    assert parse_datetime(texte) == timestamp
+    assert from_timestamp(timestamp) == valeur
+
+
+def test_microsecondes_ignorees():
+    assert to_timestamp(datetime(2024, 1, 1, 8, 0, 0, 999999)) == to_timestamp(datetime(2024, 1, 1, 8, 0, 0))
+
+
+@pytest.mark.parametrize("texte", [
+    "2024-02-30 08:00:00",
+    "2024-01-01T08:00:00",
+    "2024-01-01 8:00:00",
+    "2024-01-01 08:00",
+    "2024-01-01 24:00:00",
+    "2024/01/01 08:00:00",
+    "",
+])
+def test_dates_invalides(texte):
+    with pytest.raises(TimeFormatError):
+        parse_datetime(texte)